@@ -0,0 +1,145 @@
+"""Headless JSON API for backend integrations.
+
+Mounted under /api by main.create_server:
+
+    POST /api/assess         one recording in the ``audio`` form field
+    POST /api/assess/batch   several recordings, each in an ``audio`` form field
+
+Responses carry the raw results only: transcript, grammar mistakes and
+score, and the vocabulary and pronunciation score dicts. Plotly chart
+specs are built only with ``?charts=true`` and the Groq improvement
+suggestion is requested only with ``?feedback=true``:
+
+    curl -F audio=@answer.wav http://127.0.0.1:7860/api/assess
+    curl -F audio=@a.wav -F audio=@b.wav "http://127.0.0.1:7860/api/assess/batch?charts=true"
+"""
+import contextvars
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import API_MAX_UPLOAD_MB, API_MAX_BATCH_FILES, MAX_AUDIO_LENGTH
+from utils.audio_io import AudioTooLongError
+from utils.json_encoding import dumps
+from utils.scheduler import SchedulerFullError, WorkerStartupError
+from utils.lazy_import import lazy_import
+from utils import tracing
+
+flask = lazy_import("flask")
+flask_cors = lazy_import("flask_cors")
+
+# Files of a batch are assessed side by side when there is no worker pool
+_batch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-batch")
+
+
+def _json_response(payload, status=200, headers=None):
+    return flask.Response(dumps(payload), status=status,
+                          headers=headers, mimetype="application/json")
+
+
+def _flag(name):
+    return flask.request.args.get(name, "false").lower() == "true"
+
+
+def _status_code(error):
+    if isinstance(error, AudioTooLongError):
+        return 413
+    if isinstance(error, (SchedulerFullError, WorkerStartupError)):
+        return 503
+    return 500
+
+
+def _error_message(error):
+    if isinstance(error, AudioTooLongError):
+        return f"Recording is too long (max {MAX_AUDIO_LENGTH}s)"
+    return str(error)
+
+
+def _save_upload(upload):
+    """Write an uploaded file to a temporary path (decoders need a real file)"""
+    suffix = os.path.splitext(upload.filename or "")[1]
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    upload.save(path)
+    return path
+
+
+def create_api(app):
+    """Build the Flask app serving ``app`` (a CommunicationAssessmentApp) as JSON"""
+    api = flask.Flask(__name__)
+    api.config["MAX_CONTENT_LENGTH"] = API_MAX_UPLOAD_MB * 1024 * 1024
+    flask_cors.CORS(api)
+
+    def submit(path, include_feedback):
+        """Start one assessment; returns a Future of the raw results"""
+        if app.scheduler is not None:
+            return app.scheduler.submit(path, include_feedback=include_feedback)
+        # The copied context makes the assessment part of this request instead of a second one
+        return _batch_executor.submit(contextvars.copy_context().run, app.assess, path,
+                                      include_feedback=include_feedback)
+
+    def payload(results, charts):
+        if not charts:
+            return results
+        radar, vocabulary = app.render_charts(results)
+        return dict(results, charts={
+            "radar": json.loads(radar.to_json()) if radar is not None else None,
+            "vocabulary": json.loads(vocabulary.to_json()) if vocabulary is not None else None
+        })
+
+    def assess_files(uploads, charts, include_feedback):
+        """Assess uploads together; returns one record per file, in order"""
+        paths = [_save_upload(upload) for upload in uploads]
+        try:
+            # Submit everything first so the files are queued (or run) together
+            futures = []
+            for path in paths:
+                try:
+                    futures.append(submit(path, include_feedback))
+                except Exception as e:
+                    futures.append(e)
+
+            records = []
+            for upload, future in zip(uploads, futures):
+                try:
+                    if isinstance(future, Exception):
+                        raise future
+                    record = {"file": upload.filename, "status": "ok", "result": payload(future.result(), charts)}
+                except Exception as e:
+                    print(f"Error assessing {upload.filename}: {str(e)}")
+                    record = {"file": upload.filename, "status": "error", "code": _status_code(e),
+                              "error": _error_message(e)}
+                records.append(record)
+            return records
+        finally:
+            for path in paths:
+                os.remove(path)
+
+    @api.post("/assess")
+    def assess():
+        upload = flask.request.files.get("audio")
+        if upload is None:
+            return _json_response({"error": "No audio file in the 'audio' form field"}, 400)
+        with tracing.request("api.assess"):
+            record, = assess_files([upload], _flag("charts"), _flag("feedback"))
+        if record["status"] != "ok":
+            headers = {"Retry-After": "5"} if record["code"] == 503 else None
+            return _json_response({"error": record["error"]}, record["code"], headers)
+        return _json_response(record["result"])
+
+    @api.post("/assess/batch")
+    def assess_batch():
+        uploads = flask.request.files.getlist("audio")
+        if not uploads:
+            return _json_response({"error": "No audio files in the 'audio' form fields"}, 400)
+        if len(uploads) > API_MAX_BATCH_FILES:
+            return _json_response({"error": f"At most {API_MAX_BATCH_FILES} files per batch"}, 400)
+        with tracing.request("api.assess_batch"):
+            records = assess_files(uploads, _flag("charts"), _flag("feedback"))
+        return _json_response({"results": records})
+
+    @api.errorhandler(413)
+    def too_large(e):
+        return _json_response({"error": f"Upload exceeds {API_MAX_UPLOAD_MB} MB"}, 413)
+
+    return api
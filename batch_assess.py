@@ -0,0 +1,146 @@
+"""Score a directory or manifest of recordings without the UI.
+
+Files are spread over a pool of worker processes, each holding its own
+models, and one JSON line is written per file as soon as it finishes. The
+output file doubles as the checkpoint: rerunning the same command skips
+files that already have a successful result. Run from the repository root:
+
+    python batch_assess.py recordings/ --output results.jsonl --workers 4
+    python batch_assess.py manifest.txt --output results.jsonl --asr wav2vec2 --feedback none
+
+A manifest lists one audio path per line (relative paths are resolved
+against the manifest's directory; blank lines and # comments are ignored).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from utils.json_encoding import dumps
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".mp3", ".ogg", ".m4a", ".webm"}
+REPORT_INTERVAL = 10  # seconds between progress lines
+
+# Per-worker state, set up once by _init_worker
+_app = None
+_include_feedback = False
+
+
+def collect_files(source):
+    """List the audio files in a directory (recursively) or named by a manifest file"""
+    source = Path(source)
+    if source.is_dir():
+        return sorted(str(path) for path in source.rglob("*") if path.suffix.lower() in AUDIO_EXTENSIONS)
+    files = []
+    for line in source.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            path = Path(line)
+            files.append(str(path if path.is_absolute() else source.parent / path))
+    return files
+
+
+def load_checkpoint(output, retry_errors=False):
+    """Return the files already recorded in an existing output file"""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # line cut short by an interrupted run
+            if record.get("status") == "ok" or not retry_errors:
+                done.add(record["file"])
+    return done
+
+
+def _init_worker(asr_backend, feedback):
+    global _app, _include_feedback
+    from main import CommunicationAssessmentApp
+
+    _app = CommunicationAssessmentApp(asr_backend=asr_backend)
+    _include_feedback = feedback == "groq"
+
+
+def _assess_file(path):
+    """Assess one file in a worker; returns (json line, succeeded, audio seconds)"""
+    start = time.perf_counter()
+    try:
+        result = _app.assess(path, include_feedback=_include_feedback)
+        record = {"file": path, "status": "ok", "processing_seconds": time.perf_counter() - start, "result": result}
+        return dumps(record), True, result["duration_seconds"]
+    except Exception as e:
+        record = {"file": path, "status": "error", "processing_seconds": time.perf_counter() - start, "error": str(e)}
+        return json.dumps(record), False, 0.0
+
+
+def _report(done, failed, audio_seconds, elapsed, total):
+    minutes = elapsed / 60
+    print(f"{done}/{total} files ({failed} failed) in {elapsed:.0f}s: "
+          f"{done / minutes if minutes else 0:.1f} files/min, "
+          f"{audio_seconds / elapsed if elapsed else 0:.2f} audio-s/s", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch communication assessment")
+    parser.add_argument("source", help="Directory of recordings or manifest file")
+    parser.add_argument("--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("--workers", type=int, default=max(os.cpu_count() // 4, 1))
+    parser.add_argument("--threads", type=int, help="Inference threads per worker (default: CPUs / workers)")
+    parser.add_argument("--asr", choices=["wav2vec2", "google"], default="wav2vec2",
+                        help="wav2vec2 transcribes locally; google calls the Google Web Speech API")
+    parser.add_argument("--feedback", choices=["none", "groq"], default="none",
+                        help="Also request improvement suggestions from Groq")
+    parser.add_argument("--retry-errors", action="store_true", help="Reprocess files that failed previously")
+    args = parser.parse_args()
+
+    files = collect_files(args.source)
+    done = load_checkpoint(args.output, args.retry_errors)
+    pending = [path for path in files if path not in done]
+    print(f"{len(files)} files, {len(files) - len(pending)} already done, {len(pending)} to process",
+          file=sys.stderr)
+    if not pending:
+        return
+
+    # Split the cores between workers instead of letting every worker use all of them
+    threads = args.threads or max(os.cpu_count() // args.workers, 1)
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "ONNX_INTRA_OP_THREADS"):
+        os.environ.setdefault(name, str(threads))
+
+    # Make sure a line cut short by an earlier crash does not swallow the next record
+    if os.path.exists(args.output) and os.path.getsize(args.output):
+        with open(args.output, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    else:
+        needs_newline = False
+
+    context = multiprocessing.get_context("spawn")
+    processed = failed = 0
+    audio_seconds = 0.0
+    start = last_report = time.perf_counter()
+    with open(args.output, "a") as out, context.Pool(
+        args.workers, initializer=_init_worker, initargs=(args.asr, args.feedback)
+    ) as pool:
+        if needs_newline:
+            out.write("\n")
+        for line, ok, seconds in pool.imap_unordered(_assess_file, pending):
+            out.write(line + "\n")
+            out.flush()
+            processed += 1
+            failed += not ok
+            audio_seconds += seconds
+            now = time.perf_counter()
+            if now - last_report >= REPORT_INTERVAL:
+                _report(processed, failed, audio_seconds, now - start, len(pending))
+                last_report = now
+
+    _report(processed, failed, audio_seconds, time.perf_counter() - start, len(pending))
+
+
+if __name__ == "__main__":
+    main()
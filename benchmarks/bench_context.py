@@ -0,0 +1,65 @@
+"""Compare the per-token and vectorized context scoring on long transcripts.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_context
+"""
+import argparse
+import time
+import numpy as np
+import spacy
+from model.vocabulary_analyzer import context_scores
+from benchmarks.fixtures import make_transcript
+
+
+def legacy_context_score(doc):
+    """Reference implementation: one Python iteration per token"""
+    context_scores = []
+    for sent in doc.sents:
+        sent_vectors = [w.vector for w in sent if w.has_vector]
+        if sent_vectors:
+            context_vector = np.mean(sent_vectors, axis=0)
+            for token in sent:
+                if token.has_vector:
+                    similarity = np.dot(token.vector, context_vector) / (
+                        np.linalg.norm(token.vector) * np.linalg.norm(context_vector)
+                    )
+                    context_scores.append(similarity)
+    return np.mean(context_scores) if context_scores else 0
+
+
+def best_of(fn, repeats):
+    """Return the best wall-clock time of several runs, and the last result"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 5000, 20000],
+                        help="Transcript lengths in words")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    nlp = spacy.load("en_core_web_md")
+    nlp.max_length = max(nlp.max_length, max(args.lengths) * 10)
+    docs = [nlp(make_transcript(n)) for n in args.lengths]
+
+    print(f"{'words':>8} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8}  match")
+    for n_words, doc in zip(args.lengths, docs):
+        legacy_time, legacy = best_of(lambda: legacy_context_score(doc), args.repeats)
+        vector_time, vectorized = best_of(lambda: context_scores([doc])[0], args.repeats)
+        match = np.isclose(legacy, vectorized, rtol=1e-5, atol=1e-6)
+        print(f"{n_words:>8} {legacy_time * 1000:>10.2f} {vector_time * 1000:>10.2f} "
+              f"{legacy_time / vector_time:>7.1f}x  {match}")
+
+    batch_time, _ = best_of(lambda: context_scores(docs), args.repeats)
+    print(f"All {len(docs)} docs in one call: {batch_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
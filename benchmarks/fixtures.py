@@ -0,0 +1,72 @@
+"""Deterministic audio and text fixtures shared by the benchmark scripts."""
+from pathlib import Path
+import numpy as np
+from config.settings import SAMPLE_RATE
+
+SENTENCES = [
+    "I have been working as a software engineer for about five years now.",
+    "Most of my time is spent designing services that process large amounts of data.",
+    "Recently our team migrated a legacy system to a more scalable architecture.",
+    "It was challenging, but we learned a great deal about careful planning.",
+    "In my free time I enjoy reading novels and hiking in the mountains."
+]
+
+# Sentences with typical learner mistakes, for grammar correction checks
+GRAMMAR_SENTENCES = [
+    "She go to the office every days.",
+    "I has finished my homework yesterday.",
+    "There is many reason why I likes this job.",
+    "He don't know nothing about the project.",
+    "We was discussing about the new plan since two hours.",
+    "The informations you gave me was very useful."
+]
+
+
+def make_transcript(n_words):
+    """Build a transcript of roughly n_words words from the fixed sentences"""
+    words = 0
+    parts = []
+    while words < n_words:
+        sentence = SENTENCES[len(parts) % len(SENTENCES)]
+        parts.append(sentence)
+        words += len(sentence.split())
+    return " ".join(parts)
+
+
+def speechlike_tone(duration, seed=0):
+    """Harmonic tone with syllable-rate amplitude modulation and pauses, plus light noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 20 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    # ~4 syllables per second, with a pause every couple of seconds
+    envelope = np.clip(np.sin(2 * np.pi * 2 * t), 0, None) * (np.sin(2 * np.pi * 0.4 * t) > -0.6)
+    waveform = 0.3 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    return waveform.astype(np.float32)
+
+
+def white_noise(duration, seed=0):
+    """Low-level white noise"""
+    rng = np.random.default_rng(seed)
+    return (0.05 * rng.standard_normal(int(duration * SAMPLE_RATE))).astype(np.float32)
+
+
+def synthetic_audio(duration, kind="tone", seed=0):
+    """Deterministic synthetic audio of the given kind ("tone" or "noise")"""
+    if kind == "noise":
+        return white_noise(duration, seed)
+    return speechlike_tone(duration, seed)
+
+
+def load_fixture_dir(path):
+    """Load (name, waveform) pairs for every WAV file and sentences from sentences.txt"""
+    from utils.audio_io import load_audio
+
+    path = Path(path)
+    audio = [(wav.name, load_audio(wav)) for wav in sorted(path.glob("*.wav"))]
+    sentences_file = path / "sentences.txt"
+    sentences = []
+    if sentences_file.exists():
+        sentences = [line.strip() for line in sentences_file.read_text().splitlines() if line.strip()]
+    return audio, sentences
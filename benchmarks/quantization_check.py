@@ -0,0 +1,132 @@
+"""Compare fp32 and dynamic int8 models on a fixed fixture set.
+
+Each variant is loaded in its own fresh process so RSS numbers are not
+mixed up. Reports pronunciation score drift, grammar correction agreement,
+latency and memory. Run from the repository root:
+
+    python -m benchmarks.quantization_check [--fixtures DIR] [--json out.json]
+
+A fixture directory holds *.wav recordings and an optional sentences.txt;
+without one, deterministic synthetic audio and built-in sentences are used.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+import numpy as np
+from benchmarks.fixtures import GRAMMAR_SENTENCES, synthetic_audio, load_fixture_dir
+
+SCORE_KEYS = ["pronunciation_score", "fluency_score", "confidence_scores", "stress_patterns"]
+
+
+def _rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_variant(quantize, fixtures_dir):
+    """Load both models with or without quantization and score every fixture"""
+    from model.pronunciation_analyzer import PronunciationAnalyzer
+    from model.speech_processor import SpeechProcessor
+
+    if fixtures_dir:
+        audio, sentences = load_fixture_dir(fixtures_dir)
+    else:
+        audio = [(f"tone_{d}s", synthetic_audio(d, "tone", seed=d)) for d in (3, 8, 20)]
+        sentences = []
+    sentences = sentences or GRAMMAR_SENTENCES
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    pronunciation = PronunciationAnalyzer(quantize=quantize)
+    speech = SpeechProcessor(quantize=quantize)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+
+    # One untimed pass so lazy initialization does not count as latency
+    pronunciation.analyze_pronunciation(audio[0][1])
+    # Warm up on a sentence outside the timed set so its correction is not cached
+    speech.analyze_text("This sentence are only used for warm up.")
+
+    scores, audio_seconds = {}, []
+    for name, waveform in audio:
+        start = time.perf_counter()
+        result = pronunciation.analyze_pronunciation(waveform)
+        audio_seconds.append(time.perf_counter() - start)
+        scores[name] = {key: float(result[key]) for key in SCORE_KEYS}
+
+    corrections, text_seconds = {}, []
+    for sentence in sentences:
+        start = time.perf_counter()
+        corrections[sentence] = speech.analyze_text(sentence)[1]
+        text_seconds.append(time.perf_counter() - start)
+
+    return {
+        "quantized": quantize,
+        "load_seconds": load_seconds,
+        "model_rss_mb": rss_loaded - rss_start,
+        "peak_rss_mb": _rss_mb(),
+        "pronunciation_seconds": float(np.sum(audio_seconds)),
+        "grammar_seconds": float(np.sum(text_seconds)),
+        "scores": scores,
+        "corrections": corrections
+    }
+
+
+def compare(fp32, int8):
+    """Summarize score drift, correction agreement, speed and memory"""
+    drift = {
+        key: [abs(fp32["scores"][name][key] - int8["scores"][name][key]) for name in fp32["scores"]]
+        for key in SCORE_KEYS
+    }
+    same = [fp32["corrections"][s] == int8["corrections"][s] for s in fp32["corrections"]]
+    return {
+        "score_drift": {key: {"mean": float(np.mean(v)), "max": float(np.max(v))} for key, v in drift.items()},
+        "grammar_agreement": float(np.mean(same)),
+        "pronunciation_speedup": fp32["pronunciation_seconds"] / int8["pronunciation_seconds"],
+        "grammar_speedup": fp32["grammar_seconds"] / int8["grammar_seconds"],
+        "model_rss_ratio": int8["model_rss_mb"] / fp32["model_rss_mb"] if fp32["model_rss_mb"] else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fp32 vs int8 accuracy and performance check")
+    parser.add_argument("--fixtures", help="Directory with *.wav files and optional sentences.txt")
+    parser.add_argument("--json", help="Write full results to this file")
+    args = parser.parse_args()
+
+    # A fresh process per variant keeps memory measurements independent
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for label, quantize in (("fp32", False), ("int8", True)):
+        with context.Pool(1) as pool:
+            results[label] = pool.apply(run_variant, (quantize, args.fixtures))
+
+    summary = compare(results["fp32"], results["int8"])
+    for label in ("fp32", "int8"):
+        r = results[label]
+        print(f"{label}: load {r['load_seconds']:.1f}s, model RSS {r['model_rss_mb']:.0f} MB, "
+              f"pronunciation {r['pronunciation_seconds']:.2f}s, grammar {r['grammar_seconds']:.2f}s")
+    for key, drift in summary["score_drift"].items():
+        print(f"{key}: mean |diff| {drift['mean']:.4f}, max |diff| {drift['max']:.4f}")
+    print(f"Grammar corrections identical: {summary['grammar_agreement']:.0%}")
+    print(f"Speedup: pronunciation {summary['pronunciation_speedup']:.2f}x, "
+          f"grammar {summary['grammar_speedup']:.2f}x")
+    if summary["model_rss_ratio"] is not None:
+        print(f"int8 model memory: {summary['model_rss_ratio']:.0%} of fp32")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"variants": results, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Per-stage latency benchmarks on deterministic synthetic fixtures.
+
+Each stage is timed on its own over synthetic audio (speech-like tones and
+noise up to MAX_AUDIO_LENGTH) or fixed transcripts of increasing length.
+No benchmarked stage talks to the network: the LLM client is replaced by a
+stand-in that refuses every call. Run from the repository root:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --output current.json
+    python -m benchmarks.suite --baseline baseline.json --current current.json
+
+With --baseline, cases whose median time grew by more than --threshold are
+reported as regressions and the exit status is 1. Benchmarks that failed
+this run, and baseline cases of the selected benchmarks that were not
+measured, fail the comparison too, so compare runs made with the same
+--quick setting.
+"""
+import argparse
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from benchmarks.fixtures import make_transcript, synthetic_audio
+from config.settings import MAX_AUDIO_LENGTH, SEGMENT_SECONDS, GRAMMAR_CACHE_SIZE, CHART_CACHE_SIZE
+
+AUDIO_DURATIONS = [1, 5, 30, 120, MAX_AUDIO_LENGTH]  # seconds
+SEGMENT_DURATIONS = [1, SEGMENT_SECONDS, 2 * SEGMENT_SECONDS]  # one model forward pass each
+TRANSCRIPT_WORDS = [20, 100, 500, 2000]
+AUDIO_KINDS = ["tone", "noise"]
+RADAR_SCORES = [0.82, 0.74, 0.61, 0.9]
+
+# Differences below this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.001
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a function yielding (case, params, fn) tuples under ``name``"""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+class OfflineClient:
+    """Stands in for the LLM client so no benchmark can reach the network"""
+
+    def __getattr__(self, name):
+        raise RuntimeError("Network access is disabled in benchmarks")
+
+
+class Models:
+    """Builds each model once, on first use by a benchmark"""
+
+    @functools.cached_property
+    def pronunciation(self):
+        from model.pronunciation_analyzer import PronunciationAnalyzer
+        return PronunciationAnalyzer()
+
+    @functools.cached_property
+    def speech(self):
+        from model.speech_processor import SpeechProcessor
+        processor = SpeechProcessor()
+        processor.groq_client = OfflineClient()
+        return processor
+
+    @functools.cached_property
+    def vocabulary(self):
+        from model.vocabulary_analyzer import VocabularyAnalyzer
+        return VocabularyAnalyzer()
+
+    @functools.cached_property
+    def app(self):
+        from main import CommunicationAssessmentApp
+        return CommunicationAssessmentApp()
+
+
+def _audio_cases(durations):
+    for kind in AUDIO_KINDS:
+        for duration in durations:
+            yield f"{kind} {duration}s", {"kind": kind, "seconds": duration}, synthetic_audio(duration, kind)
+
+
+@benchmark("pronunciation.process_segment")
+def bench_process_segment(models, args):
+    analyzer = models.pronunciation
+    for case, params, audio in _audio_cases(args.segment_durations):
+        yield case, params, lambda audio=audio: analyzer._process_segment(audio)
+
+
+@benchmark("pronunciation.calculate_fluency")
+def bench_calculate_fluency(models, args):
+    analyzer = models.pronunciation
+    for case, params, audio in _audio_cases(args.durations):
+        yield case, params, lambda audio=audio: analyzer._calculate_fluency(audio)
+
+
+@benchmark("pronunciation.analyze_stress_patterns")
+def bench_analyze_stress_patterns(models, args):
+    analyzer = models.pronunciation
+    for case, params, audio in _audio_cases(args.durations):
+        yield case, params, lambda audio=audio: analyzer._analyze_stress_patterns(audio)
+
+
+@benchmark("vocabulary.analyze_vocabulary")
+def bench_analyze_vocabulary(models, args):
+    analyzer = models.vocabulary
+    for words in args.words:
+        text = make_transcript(words)
+        yield f"{words} words", {"words": words}, lambda text=text: analyzer.analyze_vocabulary(text)
+
+
+@benchmark("vocabulary.analyze_context")
+def bench_analyze_context(models, args):
+    analyzer = models.vocabulary
+    for words in args.words:
+        doc = analyzer.nlp(make_transcript(words))
+        yield f"{words} words", {"words": words}, lambda doc=doc: analyzer._analyze_context(doc)
+
+
+@benchmark("speech.analyze_text")
+def bench_analyze_text(models, args):
+    from utils.result_cache import LRUCache
+
+    processor = models.speech
+
+    def run(text):
+        # Start cold so every run generates corrections instead of hitting the cache
+        processor.correction_cache = LRUCache(GRAMMAR_CACHE_SIZE)
+        return processor.analyze_text(text)
+
+    for words in args.words:
+        text = make_transcript(words)
+        yield f"{words} words", {"words": words}, lambda text=text: run(text)
+
+
+@benchmark("app.create_radar_chart")
+def bench_create_radar_chart(models, args):
+    app = models.app
+    yield "4 scores", {}, lambda: app.create_radar_chart(RADAR_SCORES)
+
+
+@benchmark("report.render_radar")
+def bench_render_radar(models, args):
+    from utils.result_cache import LRUCache
+
+    generator = models.app.report_generator
+
+    def run():
+        # Start cold so every run draws instead of hitting the chart cache
+        generator.chart_cache = LRUCache(CHART_CACHE_SIZE)
+        return generator.render_radar(RADAR_SCORES)
+
+    yield "4 scores", {}, run
+
+
+def time_case(fn, repeats):
+    """Run fn once untimed, then ``repeats`` timed runs; return timing stats in seconds"""
+    fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "runs": repeats
+    }
+
+
+def run_benchmarks(names, args):
+    """Time every case of the selected benchmarks; a benchmark that cannot be set up is skipped"""
+    models = Models()
+    results, skipped = {}, {}
+    for name in names:
+        try:
+            for case, params, fn in BENCHMARKS[name](models, args):
+                stats = time_case(fn, args.repeats)
+                results[f"{name}[{case}]"] = {"benchmark": name, "params": params, **stats}
+                print(f"{name:<40} {case:<14} median {stats['median'] * 1000:10.2f} ms  "
+                      f"min {stats['min'] * 1000:10.2f} ms")
+        except Exception as e:
+            skipped[name] = str(e)
+            print(f"Skipping {name}: {str(e)}")
+    return results, skipped
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(baseline, current, threshold):
+    """Return (case, baseline s, current s, ratio) for cases slower than the baseline by more than threshold"""
+    regressions = []
+    for case, stats in current["results"].items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        ratio = stats["median"] / base["median"] if base["median"] else float("inf")
+        if ratio > 1 + threshold and stats["median"] - base["median"] > MIN_REGRESSION_SECONDS:
+            regressions.append((case, base["median"], stats["median"], ratio))
+    return regressions
+
+
+def unmeasured(baseline, current, selected=None):
+    """Baseline cases of the selected benchmarks (all by default) that have no result this run"""
+    return sorted(
+        case for case, stats in baseline["results"].items()
+        if case not in current["results"] and (selected is None or stats.get("benchmark") in selected)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency benchmarks")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Short inputs only (<= 30 s audio, <= 500 words)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--current", help="Compare this results file instead of running the benchmarks")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    args.durations = AUDIO_DURATIONS
+    args.segment_durations = SEGMENT_DURATIONS
+    args.words = TRANSCRIPT_WORDS
+    if args.quick:
+        args.durations = [d for d in AUDIO_DURATIONS if d <= 30]
+        args.words = [w for w in TRANSCRIPT_WORDS if w <= 500]
+
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        results, skipped = run_benchmarks(args.only or list(BENCHMARKS), args)
+        current = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeats": args.repeats
+            },
+            "results": results,
+            "skipped": skipped
+        }
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if not args.baseline:
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for case, before, after, ratio in regressions:
+        print(f"REGRESSION {case}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+    errors = current.get("skipped", {})
+    for name, error in sorted(errors.items()):
+        print(f"ERROR {name}: {error}")
+    missing = unmeasured(baseline, current, set(args.only) if args.only else None)
+    if missing:
+        print(f"MISSING (not measured this run): {', '.join(missing)}")
+    if regressions or errors or missing:
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,40 @@ load_dotenv()
 # Base project settings
 BASE_DIR = Path(__file__).resolve().parent.parent
 MODEL_DIR = BASE_DIR / "models"
+WORD_INDEX_DIR = MODEL_DIR / "word_index"
+ONNX_MODEL_DIR = MODEL_DIR / "onnx"
 
 # API Keys
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Feedback Settings
+GROQ_MODEL = "llama-3.3-70b-versatile"
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")  # None uses the public Groq endpoint
+GROQ_STREAMING = os.getenv("GROQ_STREAMING", "true").lower() == "true"
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "20"))  # seconds per attempt
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+GROQ_BACKOFF_BASE = 0.5  # seconds, doubled per retry with full jitter
+GROQ_BACKOFF_MAX = 8.0
+GROQ_HEDGE_DELAY = float(os.getenv("GROQ_HEDGE_DELAY", "0")) or None  # seconds; 0 disables hedging
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+GROQ_BREAKER_FAILURES = 5  # consecutive failures before failing fast
+GROQ_BREAKER_RESET = 30  # seconds before a trial request is let through
+
 # Model Settings
 GRAMMAR_MODEL = "prithivida/grammar_error_correcter_v1"
+GRAMMAR_CORRECTION_MODEL = "vennify/t5-base-grammar-correction"
 PRONUNCIATION_MODEL = "facebook/wav2vec2-large-960h"
 ACCENT_MODEL = "facebook/wav2vec2-large-xlsr-53"
+# Dynamic int8 quantization of the Wav2Vec2 and T5 linear layers (CPU only);
+# check accuracy with `python -m benchmarks.quantization_check`
+QUANTIZE_INT8 = os.getenv("QUANTIZE_INT8", "false").lower() == "true"
+
+# Inference Backend Settings
+# "torch" runs the models eagerly; "onnx" runs graphs exported with
+# `python -m model.onnx_backend` through onnxruntime, falling back to torch
+# per model when onnxruntime or the exported graph is missing
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0 = onnxruntime default
 
 # Scoring Parameters
 FLUENCY_WEIGHT = 0.3
@@ -24,4 +50,76 @@ VOCABULARY_WEIGHT = 0.2
 
 # Audio Settings
 SAMPLE_RATE = 16000
-MAX_AUDIO_LENGTH = 300  # seconds 
\ No newline at end of file
+MAX_AUDIO_LENGTH = int(os.getenv("MAX_AUDIO_LENGTH", "300"))  # seconds; longer uploads are rejected before decoding
+AUDIO_BLOCK_SECONDS = 10  # decode and resample in blocks of this length
+
+# Grammar Correction Settings
+GRAMMAR_BATCH_SIZE = int(os.getenv("GRAMMAR_BATCH_SIZE", "8"))
+GRAMMAR_MAX_LENGTH = 128  # generated tokens per sentence
+GRAMMAR_MAX_SENTENCE_WORDS = 40  # longer (often unpunctuated ASR) sentences are chunked
+GRAMMAR_CACHE_SIZE = 4096  # sentences
+
+# Vocabulary Settings
+OOV_CACHE_SIZE = 10000  # words outside the prebuilt lexicon
+
+# Pronunciation Inference Settings
+SEGMENT_SECONDS = 5
+MIN_SEGMENT_SECONDS = 0.5  # a shorter last chunk is merged into the one before it
+SEGMENT_OVERLAP_SECONDS = float(os.getenv("SEGMENT_OVERLAP_SECONDS", "0"))
+PRONUNCIATION_BATCH_SIZE = int(os.getenv("PRONUNCIATION_BATCH_SIZE", "4"))
+# Voice activity detection: only speech segments go through the acoustic model;
+# when disabled, audio over 10 seconds is cut into fixed SEGMENT_SECONDS chunks
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_TOP_DB = 30  # frames this far below the loud (95th percentile) level are silence
+VAD_MIN_PAUSE_SECONDS = 0.25  # shorter gaps stay inside a segment
+VAD_MIN_SPEECH_SECONDS = 0.1  # shorter bursts are dropped as noise
+VAD_PADDING_SECONDS = 0.1  # context kept on both sides of a segment
+VAD_MAX_SEGMENT_SECONDS = 10  # longer speech is cut at its quietest frame
+
+# Speech Recognition Settings
+# "wav2vec2" decodes the pronunciation model's CTC logits locally;
+# "google" sends audio to the Google Web Speech API
+ASR_BACKEND = os.getenv("ASR_BACKEND", "wav2vec2")
+CTC_BEAM_WIDTH = int(os.getenv("CTC_BEAM_WIDTH", "1"))  # 1 = greedy decoding
+
+# Result Cache Settings
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))  # entries kept in memory
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR")  # set to enable the on-disk tier
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Report Settings
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "256"))  # rendered charts kept, keyed by score vector
+
+# Server Settings
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "7860"))
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+API_MAX_UPLOAD_MB = int(os.getenv("API_MAX_UPLOAD_MB", "200"))  # per /api request
+API_MAX_BATCH_FILES = int(os.getenv("API_MAX_BATCH_FILES", "16"))
+
+# Inference Worker Settings
+# With INFERENCE_WORKERS > 0, uploads are assessed in that many model worker
+# processes behind a bounded queue instead of in the server process
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))  # per worker; 0 = CPUs / workers
+SCHEDULER_MAX_QUEUE = int(os.getenv("SCHEDULER_MAX_QUEUE", "32"))  # jobs waiting for a worker
+SCHEDULER_MAX_QUEUE_SECONDS = float(os.getenv("SCHEDULER_MAX_QUEUE_SECONDS", "1800"))  # audio waiting for a worker
+SCHEDULER_ADMISSION_TIMEOUT = float(os.getenv("SCHEDULER_ADMISSION_TIMEOUT", "0"))  # seconds to wait for room; 0 rejects at once
+
+# Observability Settings
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # served at /metrics
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"  # per-request span logs
+TRACE_LOG = os.getenv("TRACE_LOG")  # JSONL file for finished traces; stdout when unset
+
+# Pipeline Settings
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "8"))
+STAGE_TIMEOUTS = {  # seconds
+    "waveform": 30,
+    "transcript": 60,
+    "acoustic": 120,
+    "pronunciation": 120,
+    "grammar": 60,
+    "feedback": 30,
+    "vocabulary": 30
+}
@@ -1,43 +1,233 @@
-import gradio as gr
-from model.speech_processor import SpeechProcessor
-from model.vocabulary_analyzer import VocabularyAnalyzer
+from model.speech_processor import SpeechProcessor, FEEDBACK_UNAVAILABLE, UncheckedText
+from model.vocabulary_analyzer import VocabularyAnalyzer, UnscoredVocabulary
 from model.pronunciation_analyzer import PronunciationAnalyzer
-from utils.report_generator import ReportGenerator
+from model.streaming import StreamingSession
+from utils.report_generator import ReportGenerator, chart_key
+from utils.pipeline import Stage, StagePipeline
+from utils.scheduler import InferenceScheduler, SchedulerFullError
+from api import create_api
+from utils.audio_io import load_audio, AudioTooLongError
+from utils.result_cache import ResultCache, LRUCache, MISS, audio_key, text_key, config_fingerprint
+from utils.lazy import LazyModel
+from utils.lazy_import import lazy_import
+from utils.metrics import metrics
+from utils.tracing import span, request, start_trace, finish_request, run_in_trace
+from config.settings import (
+    PIPELINE_MAX_WORKERS, STAGE_TIMEOUTS, GROQ_STREAMING, ASR_BACKEND, SAMPLE_RATE,
+    WARMUP_ON_START, SERVER_HOST, SERVER_PORT, MAX_AUDIO_LENGTH, INFERENCE_WORKERS,
+    CHART_CACHE_SIZE
+)
+from concurrent.futures import ThreadPoolExecutor, Future
+import threading
+import asyncio
+import functools
+import operator
 import multiprocessing
-import matplotlib.pyplot as plt
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
+import time
 from datetime import datetime
 
+# UI, plotting and numeric libraries are imported on first use
+gr = lazy_import("gradio")
+go = lazy_import("plotly.graph_objects")
+np = lazy_import("numpy")
+
+WARMUP_TEXT = "This is a short sentence used to warm up the models."
+
+
+def _warm_up_pronunciation(analyzer):
+    """Score one second of low-level noise (pure silence would be trimmed away)"""
+    noise = np.random.default_rng(0).normal(0, 0.05, SAMPLE_RATE).astype(np.float32)
+    analyzer.analyze_with_transcript(noise)
+
+
+@functools.lru_cache(maxsize=None)
+def _chart_layouts():
+    """Plotly chart layouts, built once and copied into every figure"""
+    return {
+        "radar": go.Layout(
+            polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+            showlegend=False,
+            title="Communication Skills Assessment"
+        ),
+        "vocabulary": go.Layout(
+            title="Vocabulary Analysis",
+            xaxis=dict(title="Metrics"),
+            yaxis=dict(title="Score"),
+            coloraxis=dict(colorscale='viridis', colorbar=dict(title="color"))
+        )
+    }
+
+
 class CommunicationAssessmentApp:
-    def __init__(self):
-        self.speech_processor = SpeechProcessor()
-        self.vocabulary_analyzer = VocabularyAnalyzer()
-        self.pronunciation_analyzer = PronunciationAnalyzer()
+    def __init__(self, asr_backend=ASR_BACKEND, scheduler=None):
+        self.asr_backend = asr_backend
+        # Uploads go to the worker processes' models when a scheduler is given;
+        # the in-process models then only serve live sessions
+        self.scheduler = scheduler
+        # Models load on first use, or up front via start_warmup()
+        self.models = {
+            "speech_processor": LazyModel(
+                "speech_processor", SpeechProcessor,
+                warmup=lambda processor: processor.analyze_text(WARMUP_TEXT)
+            ),
+            "vocabulary_analyzer": LazyModel(
+                "vocabulary_analyzer", VocabularyAnalyzer,
+                warmup=lambda analyzer: analyzer.analyze_vocabulary(WARMUP_TEXT)
+            ),
+            "pronunciation_analyzer": LazyModel(
+                "pronunciation_analyzer", PronunciationAnalyzer,
+                warmup=_warm_up_pronunciation
+            ),
+        }
         self.report_generator = ReportGenerator()
+        self.chart_cache = LRUCache(CHART_CACHE_SIZE)
+        self.result_cache = ResultCache(fingerprint=config_fingerprint(asr_backend=asr_backend))
+        self.executor = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS)
+        self.pipeline = self._build_pipeline()
+        self.scoring_pipeline = self._build_pipeline(include_feedback=False)
+
+    @property
+    def speech_processor(self):
+        return self.models["speech_processor"].get()
+
+    @property
+    def vocabulary_analyzer(self):
+        return self.models["vocabulary_analyzer"].get()
+
+    @property
+    def pronunciation_analyzer(self):
+        return self.models["pronunciation_analyzer"].get()
+
+    def _model_call(self, model, method):
+        """Return a function calling ``method`` on a model that is only loaded when first called"""
+        handle = self.models[model]
+        return lambda *args: getattr(handle.get(), method)(*args)
+
+    def start_warmup(self):
+        """Load all models in parallel in the background and run a dummy inference on each"""
+        def warm_up():
+            with ThreadPoolExecutor(max_workers=len(self.models)) as pool:
+                list(pool.map(self._warm_up_model, self.models.values()))
+            print("Model warm-up finished" if self.is_ready() else "Model warm-up finished with errors")
+
+        thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_model(self, handle):
+        try:
+            handle.warm_up()
+        except Exception as e:
+            print(f"Error loading {handle.name}: {str(e)}")
+
+    def is_ready(self):
+        """True once every model is loaded and warmed up (always, when loading on demand)"""
+        if self.scheduler is not None:
+            return self.scheduler.is_ready()
+        if not WARMUP_ON_START:
+            return True
+        return all(handle.loaded and handle.warmed for handle in self.models.values())
+
+    def readiness(self):
+        """Per-model load status for the readiness probe"""
+        status = {
+            "ready": self.is_ready(),
+            "models": {name: handle.status() for name, handle in self.models.items()}
+        }
+        if self.scheduler is not None:
+            status["workers"] = self.scheduler.status()
+        return status
+
+    def _build_pipeline(self, include_feedback=True):
+        """Build the analysis stage graph.
+
+        The upload is decoded once into a shared read-only buffer. Pronunciation
+        scoring only needs that buffer, so it starts immediately; grammar,
+        feedback and vocabulary start as soon as the transcript exists.
+        Without feedback, the Groq suggestion is left to be streamed separately.
+        With the local wav2vec2 ASR backend the transcript comes out of the
+        same acoustic pass as the pronunciation scores.
+
+        Audio-dependent stages are cached by a hash of the decoded audio and
+        text-dependent stages by a hash of the normalized transcript. Fallback
+        results of a failed analysis are not cached.
+        """
+        cache = self.result_cache
+        stages = [
+            Stage("waveform", load_audio, ["audio"],
+                  timeout=STAGE_TIMEOUTS.get("waveform")),
+            Stage("audio_key", audio_key, ["waveform"]),
+        ]
+        if self.asr_backend == "wav2vec2":
+            # One Wav2Vec2 forward pass yields both the pronunciation scores and the transcript
+            stages += [
+                Stage("acoustic", cache.wrap("acoustic", self._model_call("pronunciation_analyzer", "analyze_with_transcript")),
+                      ["audio_key", "waveform"], timeout=STAGE_TIMEOUTS.get("acoustic")),
+                Stage("pronunciation", operator.itemgetter(0), ["acoustic"]),
+                Stage("transcript", operator.itemgetter(1), ["acoustic"]),
+            ]
+        else:
+            stages += [
+                Stage("transcript", cache.wrap("transcript", self._model_call("speech_processor", "transcribe")),
+                      ["audio_key", "waveform"], timeout=STAGE_TIMEOUTS.get("transcript")),
+                Stage("pronunciation", cache.wrap("pronunciation", self._model_call("pronunciation_analyzer", "analyze_pronunciation")),
+                      ["audio_key", "waveform"], timeout=STAGE_TIMEOUTS.get("pronunciation")),
+            ]
+        stages += [
+            Stage("text_key", text_key, ["transcript"]),
+            Stage("grammar", cache.wrap("grammar", self._model_call("speech_processor", "analyze_text"),
+                                        cache_if=lambda grammar: not isinstance(grammar, UncheckedText)),
+                  ["text_key", "transcript"], timeout=STAGE_TIMEOUTS.get("grammar")),
+            Stage("feedback", cache.wrap("feedback", self._model_call("speech_processor", "get_groq_feedback"),
+                                         cache_if=lambda feedback: feedback != FEEDBACK_UNAVAILABLE),
+                  ["text_key", "transcript"], timeout=STAGE_TIMEOUTS.get("feedback"),
+                  fallback=FEEDBACK_UNAVAILABLE),
+            Stage("vocabulary", cache.wrap("vocabulary", self._model_call("vocabulary_analyzer", "analyze_vocabulary"),
+                                           cache_if=lambda vocabulary: not isinstance(vocabulary, UnscoredVocabulary)),
+                  ["text_key", "transcript"], timeout=STAGE_TIMEOUTS.get("vocabulary")),
+        ]
+        if not include_feedback:
+            stages = [stage for stage in stages if stage.name != "feedback"]
+        return StagePipeline(stages, executor=self.executor)
+
+    def overall_scores(self, results):
+        """Pronunciation, grammar, vocabulary and fluency scores, in radar chart order"""
+        return [
+            results['pronunciation']['pronunciation_score'],
+            results['grammar_score'],
+            results['vocabulary']['lexical_diversity'],
+            results['pronunciation']['fluency_score']
+        ]
+
+    def render_charts(self, results):
+        """Radar and vocabulary figures for raw results, shared between results with the same scores"""
+        vocab = results['vocabulary']
+        scores = self.overall_scores(results)
+        key = chart_key(scores + [vocab['sophistication'], vocab['context_appropriateness']])
+        charts = self.chart_cache.get(key)
+        if charts is MISS:
+            try:
+                charts = (self.create_radar_chart(scores), self.create_vocabulary_chart(vocab))
+            except Exception as e:
+                print(f"Error rendering charts: {str(e)}")
+                return None, None
+            self.chart_cache.set(key, charts)
+        return charts
 
     def create_radar_chart(self, scores):
         """Create interactive radar chart using plotly"""
         categories = ['Pronunciation', 'Grammar', 'Vocabulary', 'Fluency']
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=scores + [scores[0]],
-            theta=categories + [categories[0]],
-            fill='toself',
-            name='Skills Assessment'
-        ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 1]
-                )),
-            showlegend=False,
-            title="Communication Skills Assessment"
-        )
+        with span("chart.radar"):
+            fig = go.Figure(
+                go.Scatterpolar(
+                    r=scores + [scores[0]],
+                    theta=categories + [categories[0]],
+                    fill='toself',
+                    name='Skills Assessment'
+                ),
+                layout=_chart_layouts()["radar"]
+            )
         return fig
 
     def create_vocabulary_chart(self, vocab_data):
@@ -49,80 +239,116 @@ class CommunicationAssessmentApp:
             vocab_data['context_appropriateness']
         ]
         
-        fig = px.bar(
-            x=metrics,
-            y=values,
-            title="Vocabulary Analysis",
-            labels={'x': 'Metrics', 'y': 'Score'},
-            color=values,
-            color_continuous_scale='viridis'
-        )
+        with span("chart.vocabulary"):
+            # Same figure plotly.express would build, without its dataframe round trip
+            fig = go.Figure(
+                go.Bar(x=metrics, y=values, marker=dict(color=values, coloraxis="coloraxis")),
+                layout=_chart_layouts()["vocabulary"]
+            )
         return fig
 
-    def process_input(self, audio_file):
-        """Process audio input and return comprehensive analysis"""
-        if audio_file is None:
-            return [("Grammar Analysis:", "Please provide an audio input."), 
-                   ("Grammar Score:", "0.00")], [("", "")], None, None, None, ""
+    def _calculate_grammar_score(self, grammar_issues, transcribed_text):
+        """Calculate grammar score and issue count from the formatted grammar issues"""
+        # Force a non-zero grammar score based on the corrections
+        if "No major issues found" in grammar_issues:
+            return 0.95, 0  # High score for no issues
 
-        try:
-            # Get transcribed text and initial feedback (optimized with async)
-            chat_history = self.speech_processor.process_audio(audio_file)
-            transcribed_text = chat_history[0][1]
+        # Count issues by splitting on commas
+        issue_list = [issue.strip() for issue in grammar_issues.split(',') if issue.strip()]
+        issue_count = len(issue_list)
 
-            # Parallel processing of analyses
-            vocab_analysis = self.vocabulary_analyzer.analyze_vocabulary(transcribed_text)
-            pron_analysis = self.pronunciation_analyzer.analyze_pronunciation(audio_file)
+        # Calculate score based on issue count and text length
+        words_count = len(transcribed_text.split())
+        if words_count > 0:
+            # Normalize by text length (longer text can have more issues)
+            normalized_issues = min(issue_count / (words_count / 10), 1.0)
+            grammar_score = max(0.1, 1.0 - normalized_issues)
+        else:
+            grammar_score = 0.1  # Minimum score
+        return grammar_score, issue_count
 
-            # Calculate grammar score more accurately
-            grammar_issues = chat_history[1][1]
-            grammar_corrections = chat_history[2][1]
-            
-            # Force a non-zero grammar score based on the corrections
-            if "No major issues found" in grammar_issues:
-                grammar_score = 0.95  # High score for no issues
-                issue_count = 0
-            else:
-                # Count issues by splitting on commas
-                issue_list = [issue.strip() for issue in grammar_issues.split(',') if issue.strip()]
-                issue_count = len(issue_list)
-                
-                # Calculate score based on issue count and text length
-                words_count = len(transcribed_text.split())
-                if words_count > 0:
-                    # Normalize by text length (longer text can have more issues)
-                    normalized_issues = min(issue_count / (words_count / 10), 1.0)
-                    grammar_score = max(0.1, 1.0 - normalized_issues)
-                else:
-                    grammar_score = 0.1  # Minimum score
-            
-            # Calculate overall scores
-            scores = [
-                pron_analysis['pronunciation_score'],
-                grammar_score,  # Improved grammar score
-                vocab_analysis['lexical_diversity'],
-                pron_analysis['fluency_score']
-            ]
+    def assess(self, audio_file, include_feedback=True, on_result=None):
+        """Run all analysis stages on an audio file and return the raw results.
 
-            # Create visualizations
-            radar_chart = self.create_radar_chart(scores)
-            vocab_chart = self.create_vocabulary_chart(vocab_analysis)
+        ``on_result(stage, value)`` is called as each stage resolves.
+        """
+        with request("assess"):
+            return self._assess(audio_file, include_feedback, on_result)
 
-            # Format the complete response - split into two parts for UI
-            # Remove transcription from language analysis
-            language_analysis = [
-                ("Grammar Analysis:", chat_history[2][1]),
-                ("Grammar Score:", f"{grammar_score:.2f}")
-            ]
-            
-            performance_analysis = [
-                ("Vocabulary Analysis:", f"Lexical Diversity: {vocab_analysis['lexical_diversity']:.2f}\nHigh-Quality Complex Words: {', '.join(vocab_analysis['unique_words']) if vocab_analysis['unique_words'] else 'None detected'}"),
-                ("Pronunciation Score:", f"{pron_analysis['pronunciation_score']:.2f}"),
-                ("Improvement Suggestion:", chat_history[3][1])
-            ]
+    def _assess(self, audio_file, include_feedback, on_result=None):
+        pipeline = self.pipeline if include_feedback else self.scoring_pipeline
+        results, errors = pipeline.run(on_result=on_result, audio=audio_file)
+        for stage in ("waveform", "audio_key", "acoustic", "transcript", "text_key", "grammar", "vocabulary", "pronunciation"):
+            if isinstance(errors.get(stage), AudioTooLongError):
+                raise errors[stage]
+            if stage in errors:
+                raise RuntimeError(f"{stage} stage failed: {errors[stage]}") from errors[stage]
+        if "feedback" in errors:
+            print(f"Error in feedback stage: {str(errors['feedback'])}")
+
+        return self._build_results(
+            duration_seconds=len(results["waveform"]) / SAMPLE_RATE,
+            transcript=results["transcript"],
+            grammar=results["grammar"],
+            vocabulary=results["vocabulary"],
+            pronunciation=results["pronunciation"],
+            feedback=results.get("feedback")
+        )
 
-            # Create a formatted report for the report_box
-            report_text = f"""Communication Assessment Report
+    def _build_results(self, duration_seconds, transcript, grammar, vocabulary, pronunciation, feedback=None):
+        """Combine stage outputs into the raw assessment results"""
+        if not transcript:
+            raise RuntimeError("Could not transcribe audio")
+
+        mistakes, corrected_text = grammar
+        grammar_issues = self.speech_processor.format_grammar_issues(mistakes)
+        grammar_score, issue_count = self._calculate_grammar_score(grammar_issues, transcript)
+
+        return {
+            "duration_seconds": duration_seconds,
+            "transcript": transcript,
+            "mistakes": mistakes,
+            "grammar_issues": grammar_issues,
+            "corrected_text": corrected_text,
+            "feedback": feedback,
+            "vocabulary": vocabulary,
+            "pronunciation": pronunciation,
+            "grammar_score": grammar_score,
+            "issue_count": issue_count
+        }
+
+    def create_session(self):
+        """Start an incremental assessment for a live microphone stream"""
+        return StreamingSession(self.pronunciation_analyzer, self.speech_processor, self.vocabulary_analyzer)
+
+    def finish_session(self, session, on_result=None):
+        """Finish a live session and return the same raw results as ``assess``"""
+        with request("finish_session"):
+            return self._build_results(**session.finish(on_result))
+
+    def _format_outputs(self, results):
+        """Build the UI outputs (chat entries, report) from raw assessment results; charts are left empty"""
+        transcribed_text = results['transcript']
+        vocab_analysis = results['vocabulary']
+        pron_analysis = results['pronunciation']
+        grammar_score = results['grammar_score']
+        issue_count = results['issue_count']
+
+        # Format the complete response - split into two parts for UI
+        # Remove transcription from language analysis
+        language_analysis = [
+            ("Grammar Analysis:", results['corrected_text']),
+            ("Grammar Score:", f"{grammar_score:.2f}")
+        ]
+        
+        performance_analysis = [
+            ("Vocabulary Analysis:", f"Lexical Diversity: {vocab_analysis['lexical_diversity']:.2f}\nHigh-Quality Complex Words: {', '.join(vocab_analysis['unique_words']) if vocab_analysis['unique_words'] else 'None detected'}"),
+            ("Pronunciation Score:", f"{pron_analysis['pronunciation_score']:.2f}"),
+            ("Improvement Suggestion:", results['feedback'] if results['feedback'] is not None else "Generating...")
+        ]
+
+        # Create a formatted report for the report_box
+        report_text = f"""Communication Assessment Report
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 OVERALL SCORES
@@ -138,12 +364,188 @@ KEY FINDINGS
 • Speech Fluency: {'Excellent' if pron_analysis['fluency_score'] > 0.8 else 'Good' if pron_analysis['fluency_score'] > 0.6 else 'Needs Improvement'}
 """
 
-            return language_analysis, performance_analysis, radar_chart, vocab_chart, transcribed_text, report_text
+        # Charts are drawn in the background by render_charts and filled in later
+        return language_analysis, performance_analysis, None, None, transcribed_text, report_text
+
+    async def process_input(self, audio_file):
+        """Process audio input and yield comprehensive analysis.
+
+        Model work runs in a worker thread; the Groq suggestion is requested
+        on the event loop as soon as the transcript exists, so a slow LLM call
+        neither holds a Gradio worker nor waits for scoring. Scores are
+        yielded first and the suggestion is filled in as it streams.
+        """
+        if audio_file is None:
+            yield [("Grammar Analysis:", "Please provide an audio input."), 
+                   ("Grammar Score:", "0.00")], [("", "")], None, None, None, ""
+            return
+
+        if self.scheduler is not None:
+            # Worker processes do not report stage results, so feedback starts once the job is done
+            assess_fn = lambda on_result: self.scheduler.submit(audio_file, include_feedback=False)
+        else:
+            assess_fn = functools.partial(self.assess, audio_file, include_feedback=False)
+        async for outputs in self._respond("process_input", assess_fn):
+            yield outputs
+
+    async def process_stream(self, chunk, session):
+        """Feed one live microphone chunk into the session and show the running scores"""
+        if chunk is None:
+            return session, "", ""
+        loop = asyncio.get_running_loop()
+        if session is None:
+            # The first chunk may have to wait for the models to load
+            session = await loop.run_in_executor(None, self.create_session)
+        sample_rate, data = chunk
+        stats = await loop.run_in_executor(None, session.add_chunk, sample_rate, data)
+        return session, stats["transcript"], self._format_live_stats(stats)
+
+    def _format_live_stats(self, stats):
+        """Running scores shown while the speaker is still talking"""
+        lines = [f"Recorded: {stats['duration_seconds']:.1f}s, speech segments processed: {stats['segments']}"]
+        if "pronunciation_score" in stats:
+            lines.append(f"Pronunciation: {stats['pronunciation_score']:.2f}  Fluency: {stats['fluency_score']:.2f}  "
+                         f"Pauses: {stats['pause_ratio']:.0%}")
+        if "lexical_diversity" in stats:
+            lines.append(f"Lexical Diversity: {stats['lexical_diversity']:.2f}")
+        if stats["truncated"]:
+            lines.append(f"Recording limit of {MAX_AUDIO_LENGTH}s reached; later audio is ignored")
+        return "\n".join(lines)
+
+    async def finish_stream(self, session):
+        """Produce the final report for a live session once the speaker stops"""
+        if session is None:
+            yield [("Grammar Analysis:", "Please record some speech first."),
+                   ("Grammar Score:", "0.00")], [("", "")], None, None, None, ""
+            return
+
+        async for outputs in self._respond("finish_stream", functools.partial(self.finish_session, session)):
+            yield outputs
+
+    def _start_feedback(self, transcript, trace):
+        """Request the Groq suggestion in the background.
+
+        Returns the task and a queue of text deltas that ends with None. A
+        cached suggestion, or a non-streamed one, arrives as a single delta.
+        """
+        loop = asyncio.get_running_loop()
+        deltas = asyncio.Queue()
+
+        async def produce():
+            key = text_key(transcript)
+            try:
+                cached = self.result_cache.get("feedback", key)
+                if cached is not MISS:
+                    deltas.put_nowait(cached)
+                    return
+                # The grammar stage may still be loading the speech processor
+                processor = await loop.run_in_executor(None, self.models["speech_processor"].get)
+                feedback = ""
+                if GROQ_STREAMING:
+                    with span("groq.stream", trace=trace):
+                        async for delta in processor.astream_groq_feedback(transcript):
+                            feedback += delta
+                            deltas.put_nowait(delta)
+                else:
+                    with span("groq.feedback", trace=trace):
+                        feedback = await processor.agroq_feedback(transcript)
+                    deltas.put_nowait(feedback)
+                if feedback and feedback != FEEDBACK_UNAVAILABLE:
+                    self.result_cache.set("feedback", key, feedback)
+            except Exception as e:
+                print(f"Error getting feedback: {str(e)}")
+                deltas.put_nowait(FEEDBACK_UNAVAILABLE)
+            finally:
+                deltas.put_nowait(None)
+
+        return asyncio.ensure_future(produce()), deltas
+
+    async def _respond(self, name, assess_fn):
+        """Run ``assess_fn`` off the event loop and yield UI outputs, then stream in the suggestion.
 
+        ``assess_fn(on_result)`` returns raw results (or a scheduler Future of
+        them) and reports stage results as they resolve. The Groq suggestion
+        is requested as soon as the transcript exists, so it is generated
+        while grammar, vocabulary and pronunciation scoring are still running.
+        """
+        loop = asyncio.get_running_loop()
+        # An async generator may resume in another context, so the trace is passed explicitly
+        trace = start_trace(name)
+        start = time.perf_counter()
+        transcript_ready = loop.create_future()
+
+        def resolve_transcript(transcript):
+            if not transcript_ready.done():
+                transcript_ready.set_result(transcript)
+
+        def on_result(stage, value):
+            # Called from a pipeline thread
+            if stage == "transcript" and value:
+                loop.call_soon_threadsafe(resolve_transcript, value)
+
+        feedback_task = None
+        try:
+            # Stages are scheduled on self.executor, so wait for them from the default pool
+            assessment = loop.run_in_executor(
+                None, functools.partial(run_in_trace, trace, assess_fn, on_result=on_result)
+            )
+            await asyncio.wait({assessment, transcript_ready}, return_when=asyncio.FIRST_COMPLETED)
+            if transcript_ready.done():
+                feedback_task, deltas = self._start_feedback(transcript_ready.result(), trace)
+            results = await assessment
+            if isinstance(results, Future):
+                # Admitted to the inference queue; wait for a model worker to finish it
+                with span("scheduler.job", trace=trace):
+                    results = await asyncio.wrap_future(results)
+            if feedback_task is None:
+                feedback_task, deltas = self._start_feedback(results['transcript'], trace)
+            outputs = self._format_outputs(results)
         except Exception as e:
-            print(f"Error in process_input: {str(e)}")
-            return [("Grammar Analysis:", "Error occurred"), 
-                   ("Grammar Score:", "0.00")], [("Error:", "Analysis failed")], None, None, None, "Error generating report"
+            if feedback_task is not None:
+                feedback_task.cancel()
+            print(f"Error in {name}: {str(e)}")
+            finish_request(name, trace, start, e)
+            if isinstance(e, AudioTooLongError):
+                message = f"Recording is too long (max {MAX_AUDIO_LENGTH}s)"
+            elif isinstance(e, SchedulerFullError):
+                message = "The server is busy, please try again in a moment"
+            else:
+                message = "Analysis failed"
+            yield [("Grammar Analysis:", "Error occurred"), 
+                   ("Grammar Score:", "0.00")], [("Error:", message)], None, None, None, "Error generating report"
+            return
+
+        # Scores go out first; the charts are drawn in the background meanwhile
+        charts = loop.run_in_executor(None, run_in_trace, trace, self.render_charts, results)
+        language_analysis, performance_analysis, radar_chart, vocab_chart, *rest = outputs
+
+        # Show whatever part of the suggestion arrived while scoring was running
+        feedback = ""
+        finished = False
+        while not deltas.empty():
+            delta = deltas.get_nowait()
+            if delta is None:
+                finished = True
+            else:
+                feedback += delta
+        if feedback:
+            performance_analysis = performance_analysis[:-1] + [("Improvement Suggestion:", feedback)]
+        yield (language_analysis, performance_analysis, radar_chart, vocab_chart, *rest)
+
+        # Stream the rest of the suggestion into the already rendered report
+        while not finished:
+            delta = await deltas.get()
+            if delta is None:
+                break
+            feedback += delta
+            performance_analysis = performance_analysis[:-1] + [("Improvement Suggestion:", feedback)]
+            if charts.done():
+                radar_chart, vocab_chart = charts.result()
+            yield (language_analysis, performance_analysis, radar_chart, vocab_chart, *rest)
+
+        radar_chart, vocab_chart = await charts
+        yield (language_analysis, performance_analysis, radar_chart, vocab_chart, *rest)
+        finish_request(name, trace, start)
 
     def create_interface(self):
         """Create and return the Gradio interface"""
@@ -164,6 +566,20 @@ KEY FINDINGS
                         label="Transcribed Text",
                         interactive=False
                     )
+                with gr.Column(scale=1):
+                    # Live mode: chunks are assessed while the speaker talks
+                    live_audio = gr.Audio(
+                        sources=["microphone"],
+                        type="numpy",
+                        streaming=True,
+                        label="Live Assessment"
+                    )
+                    live_stats = gr.Textbox(
+                        label="Live Scores",
+                        interactive=False,
+                        lines=3
+                    )
+                    live_session = gr.State()
 
             with gr.Row():
                 with gr.Column(scale=1):
@@ -194,13 +610,64 @@ KEY FINDINGS
                 outputs=[language_chatbot, performance_chatbot, radar_plot, vocab_plot, transcription, report_box]
             )
 
+            live_audio.stream(
+                fn=self.process_stream,
+                inputs=[live_audio, live_session],
+                outputs=[live_session, transcription, live_stats]
+            )
+            live_audio.stop_recording(
+                fn=self.finish_stream,
+                inputs=[live_session],
+                outputs=[language_chatbot, performance_chatbot, radar_plot, vocab_plot, transcription, report_box]
+            ).then(
+                fn=lambda: None,
+                outputs=[live_session]
+            )
+
         return interface
 
+def create_server(app, interface):
+    """Serve the Gradio UI and the JSON API together with health and readiness probes and Prometheus metrics"""
+    from fastapi import FastAPI
+    from fastapi.middleware.wsgi import WSGIMiddleware
+    from fastapi.responses import JSONResponse, PlainTextResponse
+
+    server = FastAPI()
+
+    @server.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @server.get("/ready")
+    def ready():
+        # 503 until warm, so load balancers only route to warm instances
+        status = app.readiness()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    @server.get("/metrics")
+    def prometheus_metrics():
+        if not metrics.enabled:
+            return PlainTextResponse("Metrics are disabled\n", status_code=404)
+        return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    # Headless JSON API for backend integrations; mounted before the UI catches "/"
+    server.mount("/api", WSGIMiddleware(create_api(app)))
+    return gr.mount_gradio_app(server, interface, path="/")
+
 def main():
+    import uvicorn
+
     multiprocessing.freeze_support()
-    app = CommunicationAssessmentApp()
+    scheduler = InferenceScheduler() if INFERENCE_WORKERS else None
+    app = CommunicationAssessmentApp(scheduler=scheduler)
+    if WARMUP_ON_START and scheduler is None:
+        app.start_warmup()
     interface = app.create_interface()
-    interface.launch(share=False, server_port=7860)
+    try:
+        uvicorn.run(create_server(app, interface), host=SERVER_HOST, port=SERVER_PORT)
+    finally:
+        if scheduler is not None:
+            scheduler.shutdown()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
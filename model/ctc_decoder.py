@@ -0,0 +1,121 @@
+import itertools
+import math
+from collections import defaultdict
+import numpy as np
+
+NEG_INF = -float("inf")
+
+
+def _log_add(a, b):
+    """log(exp(a) + exp(b)) without overflow"""
+    if a == NEG_INF:
+        return b
+    if b == NEG_INF:
+        return a
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
+
+
+def _log_softmax(logits):
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+class CTCDecoder:
+    """Turn Wav2Vec2 CTC logits into text, greedily or with prefix beam search"""
+
+    def __init__(self, tokenizer, beam_width=1, prune_top_k=8):
+        vocab = tokenizer.get_vocab()
+        self.id_to_token = {token_id: token for token, token_id in vocab.items()}
+        self.blank_id = tokenizer.pad_token_id
+        self.word_delimiter = getattr(tokenizer, "word_delimiter_token", "|")
+        self.special_ids = set(tokenizer.all_special_ids) | {self.blank_id}
+        self.beam_width = beam_width
+        self.prune_top_k = prune_top_k
+
+    def decode(self, logits):
+        """Decode a (frames, vocab) logit array into lower-case text"""
+        if len(logits) == 0:
+            return ""
+        if self.beam_width <= 1:
+            ids = self._greedy(logits)
+        else:
+            ids = self._beam_search(_log_softmax(np.asarray(logits, dtype=np.float64)))
+        return self._to_text(ids)
+
+    def decode_segments(self, segment_logits, overlap_frames=0):
+        """Decode consecutive segments as one utterance.
+
+        Logits are concatenated so words cut at segment edges are decoded
+        whole; with overlapping segments, each shared region is split half
+        and half between its two segments.
+        """
+        segment_logits = [logits for logits in segment_logits if len(logits)]
+        if not segment_logits:
+            return ""
+        head = overlap_frames // 2
+        tail = overlap_frames - head
+        trimmed = []
+        for i, logits in enumerate(segment_logits):
+            start = head if i > 0 else 0
+            end = len(logits) - tail if i < len(segment_logits) - 1 else len(logits)
+            trimmed.append(logits[start:max(start, end)])
+        return self.decode(np.concatenate(trimmed, axis=0))
+
+    def decode_runs(self, segment_logits, runs, overlap_frames=0):
+        """Decode segments run by run and join the runs' text with spaces.
+
+        ``runs`` gives the speech run of each segment. Consecutive segments
+        of one run are decoded as one utterance (see ``decode_segments``);
+        separate runs are decoded on their own so no word is fused across
+        the pause between them.
+        """
+        texts = []
+        for _, group in itertools.groupby(zip(runs, segment_logits), key=lambda item: item[0]):
+            texts.append(self.decode_segments([logits for _, logits in group], overlap_frames))
+        return " ".join(text for text in texts if text)
+
+    def _greedy(self, logits):
+        """Best path: argmax per frame, merge repeats, drop blanks"""
+        best = np.asarray(logits).argmax(axis=-1)
+        keep = np.ones(len(best), dtype=bool)
+        keep[1:] = best[1:] != best[:-1]
+        best = best[keep]
+        return [int(i) for i in best if i != self.blank_id]
+
+    def _beam_search(self, log_probs):
+        """CTC prefix beam search without a language model"""
+        # prefix -> [log P(prefix, ending in blank), log P(prefix, ending in non-blank)]
+        beams = {(): [0.0, NEG_INF]}
+        top_k = min(self.prune_top_k, log_probs.shape[-1])
+        for frame in log_probs:
+            candidates = np.argpartition(frame, -top_k)[-top_k:]
+            next_beams = defaultdict(lambda: [NEG_INF, NEG_INF])
+            for prefix, (p_blank, p_non_blank) in beams.items():
+                p_total = _log_add(p_blank, p_non_blank)
+                for token in candidates:
+                    token = int(token)
+                    p = float(frame[token])
+                    if token == self.blank_id:
+                        entry = next_beams[prefix]
+                        entry[0] = _log_add(entry[0], p_total + p)
+                        continue
+                    extended = next_beams[prefix + (token,)]
+                    if prefix and prefix[-1] == token:
+                        # A repeated token only extends the prefix across a blank
+                        extended[1] = _log_add(extended[1], p_blank + p)
+                        entry = next_beams[prefix]
+                        entry[1] = _log_add(entry[1], p_non_blank + p)
+                    else:
+                        extended[1] = _log_add(extended[1], p_total + p)
+            beams = dict(sorted(
+                next_beams.items(), key=lambda item: _log_add(*item[1]), reverse=True
+            )[:self.beam_width])
+        best_prefix = max(beams.items(), key=lambda item: _log_add(*item[1]))[0]
+        return list(best_prefix)
+
+    def _to_text(self, ids):
+        tokens = [self.id_to_token[i] for i in ids if i not in self.special_ids]
+        text = "".join(tokens).replace(self.word_delimiter, " ")
+        return " ".join(text.split()).lower()
@@ -0,0 +1,87 @@
+from functools import cached_property
+import math
+import numpy as np
+from config.settings import SAMPLE_RATE
+from utils.lazy_import import lazy_import
+
+librosa = lazy_import("librosa")
+signal = lazy_import("scipy.signal")
+
+FRAME_SECONDS = 0.03  # 30ms analysis windows
+HOP_SECONDS = 0.015
+
+# Syllable peaks are at least this far apart
+SYLLABLE_SECONDS = 0.1
+# Frames below this fraction of the mean energy count as pauses
+PAUSE_ENERGY_RATIO = 0.1
+# Stress peak picking windows, and the frame duration stress scores are expressed in
+# (the 512-sample hop the score was originally computed with)
+STRESS_WINDOW_SECONDS = 0.1
+STRESS_WAIT_SECONDS = 0.32
+STRESS_FRAME_SECONDS = 512 / SAMPLE_RATE
+
+
+class FrameFeatures:
+    """Frame-level energy features of one recording, computed in a single pass.
+
+    The RMS envelope is computed once per recording; speech rate, pauses and
+    per-segment stress are all derived from it instead of re-scanning the
+    samples for each score.
+    """
+
+    def __init__(self, waveform, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.hop_length = int(sample_rate * HOP_SECONDS)
+        self.duration = len(waveform) / sample_rate
+        self.energy = librosa.feature.rms(
+            y=waveform, frame_length=int(sample_rate * FRAME_SECONDS), hop_length=self.hop_length
+        )[0]
+
+    @classmethod
+    def from_energy(cls, energy, duration, sample_rate=SAMPLE_RATE):
+        """Wrap an RMS envelope computed elsewhere (e.g. incrementally, frame by frame)"""
+        features = cls.__new__(cls)
+        features.sample_rate = sample_rate
+        features.hop_length = int(sample_rate * HOP_SECONDS)
+        features.duration = duration
+        features.energy = energy
+        return features
+
+    def _frames(self, seconds):
+        return max(int(round(seconds / HOP_SECONDS)), 1)
+
+    @cached_property
+    def syllable_peaks(self):
+        """Frame indices of energy peaks at least SYLLABLE_SECONDS apart"""
+        peaks, _ = signal.find_peaks(self.energy, distance=self._frames(SYLLABLE_SECONDS))
+        return peaks
+
+    @cached_property
+    def pauses(self):
+        """Boolean mask of low-energy (pause) frames"""
+        return self.energy < np.mean(self.energy) * PAUSE_ENERGY_RATIO
+
+    def speech_rate(self):
+        """Syllable-like energy peaks per second"""
+        return len(self.syllable_peaks) / self.duration if self.duration else 0.0
+
+    def pause_ratio(self):
+        return float(np.mean(self.pauses)) if len(self.pauses) else 0.0
+
+    def stress(self, start=0, end=None):
+        """Stressed-syllable rate between two sample offsets, per STRESS_FRAME_SECONDS"""
+        end = len(self.energy) * self.hop_length if end is None else end
+        energy = self.energy[start // self.hop_length:math.ceil(end / self.hop_length)]
+        if len(energy) == 0:
+            return 0.0
+        window = self._frames(STRESS_WINDOW_SECONDS)
+        peaks = librosa.util.peak_pick(
+            energy,
+            pre_max=window,
+            post_max=window,
+            pre_avg=window,
+            post_avg=window,
+            delta=0.1,
+            wait=self._frames(STRESS_WAIT_SECONDS)
+        )
+        return len(peaks) * STRESS_FRAME_SECONDS / (len(energy) * HOP_SECONDS)
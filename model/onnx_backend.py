@@ -0,0 +1,163 @@
+import argparse
+import importlib.util
+import os
+from pathlib import Path
+from config.settings import (
+    ONNX_MODEL_DIR, ONNX_INTRA_OP_THREADS, INFERENCE_BACKEND,
+    PRONUNCIATION_MODEL, GRAMMAR_CORRECTION_MODEL, SAMPLE_RATE
+)
+from utils.lazy_import import lazy_import
+
+# onnxruntime and optimum are optional; torch is only needed for exporting
+onnxruntime = lazy_import("onnxruntime")
+transformers = lazy_import("transformers")
+torch = lazy_import("torch")
+
+ACOUSTIC_DIR = "acoustic"
+GRAMMAR_DIR = "grammar"
+ACOUSTIC_FILE = "model.onnx"
+
+
+def _model_files_exist(name, model_dir):
+    path = Path(model_dir) / name
+    if name == ACOUSTIC_DIR:
+        return (path / ACOUSTIC_FILE).exists()
+    return any(path.glob("encoder_model*.onnx"))
+
+
+def select_backend(name, model_dir=ONNX_MODEL_DIR):
+    """Pick the inference backend for one model ("acoustic" or "grammar").
+
+    Returns "onnx" only when it was requested, onnxruntime is installed and
+    the exported graph exists; otherwise the model runs on torch.
+    """
+    if INFERENCE_BACKEND != "onnx":
+        return "torch"
+    if importlib.util.find_spec("onnxruntime") is None:
+        print(f"onnxruntime is not installed, running the {name} model on torch")
+        return "torch"
+    if name == GRAMMAR_DIR and importlib.util.find_spec("optimum") is None:
+        print(f"optimum is not installed, running the {name} model on torch")
+        return "torch"
+    if not _model_files_exist(name, model_dir):
+        print(f"No ONNX export found for the {name} model in {model_dir}, running it on torch "
+              f"(export it with `python -m model.onnx_backend`)")
+        return "torch"
+    return "onnx"
+
+
+def session_options():
+    """Session options for CPU inference with every graph optimization enabled"""
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if ONNX_INTRA_OP_THREADS:
+        options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+    return options
+
+
+class OnnxAcousticModel:
+    """Wav2Vec2 CTC graph run through onnxruntime, returning numpy logits.
+
+    ``config`` is the original model config, so callers can use the same
+    frame arithmetic (``inputs_to_logits_ratio``, conv strides) as with torch.
+    """
+
+    def __init__(self, model_dir=Path(ONNX_MODEL_DIR) / ACOUSTIC_DIR):
+        model_dir = Path(model_dir)
+        self.config = transformers.Wav2Vec2Config.from_pretrained(model_dir)
+        self.session = onnxruntime.InferenceSession(
+            str(model_dir / ACOUSTIC_FILE), session_options(), providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, input_values, attention_mask=None):
+        feed = {"input_values": input_values}
+        if "attention_mask" in self.input_names:
+            feed["attention_mask"] = attention_mask
+        return self.session.run(["logits"], feed)[0]
+
+
+def load_grammar_model(model_dir=Path(ONNX_MODEL_DIR) / GRAMMAR_DIR):
+    """Load the exported seq2seq grammar model and its tokenizer for a text2text pipeline"""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir, provider="CPUExecutionProvider", session_options=session_options()
+    )
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_dir)
+    return model, tokenizer
+
+
+def optimize_graph(source, target):
+    """Apply onnxruntime's portable graph optimizations once and save the result"""
+    options = onnxruntime.SessionOptions()
+    # Extended fusions are hardware independent; layout-specific ones run at load time
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    options.optimized_model_filepath = str(target)
+    onnxruntime.InferenceSession(str(source), options, providers=["CPUExecutionProvider"])
+
+
+def export_acoustic(output_dir):
+    """Export the Wav2Vec2 CTC model with dynamic batch and length axes"""
+    output_dir = Path(output_dir) / ACOUSTIC_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model = transformers.Wav2Vec2ForCTC.from_pretrained(PRONUNCIATION_MODEL).eval()
+    use_mask = model.config.feat_extract_norm == "layer"
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_values, attention_mask=None):
+            return self.model(input_values, attention_mask=attention_mask).logits
+
+    dummy = torch.zeros(1, SAMPLE_RATE)
+    args = (dummy, torch.ones(1, SAMPLE_RATE, dtype=torch.int64)) if use_mask else (dummy,)
+    input_names = ["input_values", "attention_mask"] if use_mask else ["input_values"]
+    dynamic_axes = {name: {0: "batch", 1: "samples"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch", 1: "frames"}
+
+    raw_path = output_dir / "model.raw.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            LogitsOnly(model), args, str(raw_path),
+            input_names=input_names, output_names=["logits"],
+            dynamic_axes=dynamic_axes, opset_version=14
+        )
+    optimize_graph(raw_path, output_dir / ACOUSTIC_FILE)
+    raw_path.unlink()
+    model.config.save_pretrained(output_dir)
+    return output_dir
+
+
+def export_grammar(output_dir):
+    """Export the T5 grammar model (encoder, decoder and cached decoder graphs)"""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    output_dir = Path(output_dir) / GRAMMAR_DIR
+    model = ORTModelForSeq2SeqLM.from_pretrained(GRAMMAR_CORRECTION_MODEL, export=True)
+    model.save_pretrained(output_dir)
+    transformers.AutoTokenizer.from_pretrained(GRAMMAR_CORRECTION_MODEL).save_pretrained(output_dir)
+
+    for path in output_dir.glob("*.onnx"):
+        optimized = path.with_suffix(".opt")
+        optimize_graph(path, optimized)
+        os.replace(optimized, path)
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the models to ONNX for the onnxruntime backend")
+    parser.add_argument("--output", default=str(ONNX_MODEL_DIR), help="Directory to write the graphs to")
+    parser.add_argument("--only", choices=[ACOUSTIC_DIR, GRAMMAR_DIR], help="Export a single model")
+    args = parser.parse_args()
+    if args.only in (None, ACOUSTIC_DIR):
+        print(f"Acoustic model written to {export_acoustic(args.output)}")
+    if args.only in (None, GRAMMAR_DIR):
+        print(f"Grammar model written to {export_grammar(args.output)}")
+    print("Set INFERENCE_BACKEND=onnx to use them")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,117 @@
-import torch
-from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-import librosa
+import itertools
 import numpy as np
-from config.settings import PRONUNCIATION_MODEL, SAMPLE_RATE
-from scipy.signal import find_peaks
-import librosa.effects
+from config.settings import (
+    PRONUNCIATION_MODEL, SAMPLE_RATE, SEGMENT_SECONDS, SEGMENT_OVERLAP_SECONDS, MIN_SEGMENT_SECONDS,
+    PRONUNCIATION_BATCH_SIZE, CTC_BEAM_WIDTH, QUANTIZE_INT8, VAD_ENABLED
+)
+from model.ctc_decoder import CTCDecoder
+from model.frame_features import FrameFeatures
+from model.vad import VoiceActivity
+from model.onnx_backend import select_backend, OnnxAcousticModel
+from utils.audio_io import load_audio
+from utils.lazy_import import lazy_import
+from utils.quantization import quantize_linear_int8
+from utils.metrics import metrics
+from utils.tracing import span
+
+# Heavy libraries are imported on first use
+torch = lazy_import("torch")
+transformers = lazy_import("transformers")
+librosa = lazy_import("librosa")
 
 class PronunciationAnalyzer:
-    def __init__(self):
-        self.processor = Wav2Vec2Processor.from_pretrained(PRONUNCIATION_MODEL)
-        self.model = Wav2Vec2ForCTC.from_pretrained(PRONUNCIATION_MODEL)
+    def __init__(self, quantize=QUANTIZE_INT8, backend=None):
+        self.processor = transformers.Wav2Vec2Processor.from_pretrained(PRONUNCIATION_MODEL)
+        self.backend = backend or select_backend("acoustic")
+        if self.backend == "onnx":
+            try:
+                self.model = OnnxAcousticModel()
+            except Exception as e:
+                print(f"Error loading ONNX acoustic model, falling back to torch: {str(e)}")
+                self.backend = "torch"
+        if self.backend == "torch":
+            self.model = transformers.Wav2Vec2ForCTC.from_pretrained(PRONUNCIATION_MODEL)
+            if quantize:
+                self.model = quantize_linear_int8(self.model)
+        self.decoder = CTCDecoder(self.processor.tokenizer, beam_width=CTC_BEAM_WIDTH)
         
-    def analyze_pronunciation(self, audio_path):
-        """Analyze pronunciation quality from audio"""
-        # Load and preprocess audio
-        waveform, _ = librosa.load(audio_path, sr=SAMPLE_RATE)
+    def analyze_pronunciation(self, audio):
+        """Analyze pronunciation quality from an audio path or a decoded waveform"""
+        return self.score_acoustics(self.compute_acoustics(audio))
+
+    def analyze_with_transcript(self, audio):
+        """Score pronunciation and transcribe from the same Wav2Vec2 forward pass"""
+        acoustics = self.compute_acoustics(audio)
+        return self.score_acoustics(acoustics), self.transcribe(acoustics)
+
+    def compute_acoustics(self, audio):
+        """Run the acoustic model over the audio and keep per-segment results and logits"""
+        # Load and preprocess audio; a shared buffer is used as-is
+        if isinstance(audio, np.ndarray):
+            waveform = audio
+        else:
+            waveform = load_audio(audio)
+        metrics.increment("audio_seconds_processed_total", len(waveform) / SAMPLE_RATE, labels={"model": "wav2vec2"})
         
         # Speed up processing by trimming silence
         waveform, _ = librosa.effects.trim(waveform, top_db=20)
         
-        # Process shorter segments in parallel if audio is long
-        if len(waveform) > SAMPLE_RATE * 10:  # If longer than 10 seconds
-            segments = self._split_audio(waveform)
-            results = []
-            for segment in segments:
-                results.append(self._process_segment(segment))
-            
+        # Energy features are computed once and shared by the stress and fluency scores
+        with span("pronunciation.features"):
+            features = FrameFeatures(waveform)
+
+        # Only speech segments go through the model; pauses between them are skipped
+        vad = None
+        bounds = []
+        if VAD_ENABLED:
+            with span("pronunciation.vad"):
+                vad = VoiceActivity(features)
+                run_segments = vad.run_segments(len(waveform))
+            bounds = [(start, end) for start, end, _ in run_segments]
+            skipped = len(waveform) - sum(end - start for start, end in bounds)
+            metrics.increment("vad_skipped_seconds_total", skipped / SAMPLE_RATE)
+
+        if bounds:
+            # Speech segments never overlap; each speech run is decoded on its own
+            runs = [run for _, _, run in run_segments]
+            overlap_frames = 0
+        # Process shorter segments in batches if audio is long
+        elif len(waveform) > SAMPLE_RATE * 10:  # If longer than 10 seconds
+            bounds = self._segment_bounds(len(waveform))
+            runs = [0] * len(bounds)
+            overlap_frames = int(SAMPLE_RATE * SEGMENT_OVERLAP_SECONDS) // self.model.config.inputs_to_logits_ratio
+        else:
+            bounds = [(0, len(waveform))]
+            runs = [0]
+            overlap_frames = 0
+
+        segments = [waveform[start:end] for start, end in bounds]
+        # Analyze rhythm and stress patterns
+        with span("pronunciation.stress"):
+            stress = [features.stress(start, end) for start, end in bounds]
+        return {
+            "waveform": waveform,
+            "features": features,
+            "vad": vad,
+            "segments": self._process_segments(segments, stress),
+            "runs": runs,
+            "overlap_frames": overlap_frames
+        }
+
+    def score_acoustics(self, acoustics):
+        """Aggregate acoustic model results into pronunciation and fluency scores"""
+        results = acoustics["segments"]
+        if len(results) > 1:
             # Aggregate results
             confidence_scores = np.mean([r['confidence'] for r in results])
             stress_patterns = np.mean([r['stress'] for r in results])
-            fluency_score = self._calculate_fluency(waveform)
         else:
-            result = self._process_segment(waveform)
-            confidence_scores = result['confidence']
-            stress_patterns = result['stress']
-            fluency_score = self._calculate_fluency(waveform)
+            confidence_scores = results[0]['confidence']
+            stress_patterns = results[0]['stress']
+        with span("pronunciation.fluency"):
+            fluency_score = self._calculate_fluency(
+                acoustics["waveform"], acoustics.get("features"), acoustics.get("vad")
+            )
         
         return {
             "confidence_scores": confidence_scores,
@@ -42,96 +119,178 @@ class PronunciationAnalyzer:
             "pronunciation_score": self._calculate_overall_score(confidence_scores, stress_patterns),
             "fluency_score": fluency_score
         }
+
+    def transcribe(self, acoustics):
+        """CTC-decode the logits kept by ``compute_acoustics`` into a transcript"""
+        with span("ctc.decode"):
+            return self.decoder.decode_runs(
+                [r['logits'] for r in acoustics["segments"]],
+                acoustics["runs"],
+                overlap_frames=acoustics["overlap_frames"]
+            )
     
-    def _analyze_stress_patterns(self, waveform):
+    def _analyze_stress_patterns(self, waveform, features=None):
         """Analyze speech rhythm and stress patterns"""
-        # Calculate energy envelope
-        energy = librosa.feature.rms(y=waveform)[0]
-        
-        # Find peaks in energy (stressed syllables)
-        peaks = librosa.util.peak_pick(
-            energy,
-            pre_max=3,
-            post_max=3,
-            pre_avg=3,
-            post_avg=3,
-            delta=0.1,
-            wait=10
-        )
-        
-        return len(peaks) / len(energy)  # Rhythm regularity score
+        # Peaks in the energy envelope are stressed syllables
+        features = features or FrameFeatures(waveform)
+        return features.stress()  # Rhythm regularity score
     
     def _calculate_overall_score(self, confidence, stress_score):
         """Calculate overall pronunciation score"""
         return 0.7 * confidence + 0.3 * stress_score 
 
-    def _calculate_fluency(self, waveform):
+    def _calculate_fluency(self, waveform, features=None, vad=None):
         """Calculate fluency score based on speech rate and pauses"""
+        features = features or FrameFeatures(waveform)
+
         # Calculate speech rate
-        speech_rate = self._calculate_speech_rate(waveform)
+        speech_rate = self._calculate_speech_rate(waveform, features)
         
         # Analyze pauses
-        pause_score = self._analyze_pauses(waveform)
+        pause_score = self._analyze_pauses(waveform, features, vad)
         
         # Combine scores
         fluency_score = 0.6 * speech_rate + 0.4 * pause_score
         return min(max(fluency_score, 0), 1)  # Normalize between 0 and 1
 
-    def _calculate_speech_rate(self, waveform):
+    def _calculate_speech_rate(self, waveform, features=None):
         """Calculate speech rate score"""
-        # Get speech envelope
-        envelope = np.abs(waveform)
-        
-        # Find peaks in envelope (syllables)
-        peaks, _ = find_peaks(envelope, distance=int(SAMPLE_RATE * 0.1))
-        
-        # Calculate speech rate (syllables per second)
-        speech_rate = len(peaks) / (len(waveform) / SAMPLE_RATE)
+        # Syllables are peaks of the frame energy envelope
+        features = features or FrameFeatures(waveform)
+        speech_rate = features.speech_rate()
         
         # Normalize speech rate (typical speech is 2-5 syllables/second)
         return min(max((speech_rate - 2) / 3, 0), 1)
 
-    def _analyze_pauses(self, waveform):
+    def _analyze_pauses(self, waveform, features=None, vad=None):
         """Analyze pauses in speech"""
-        # Calculate energy in small windows
-        frame_length = int(SAMPLE_RATE * 0.03)  # 30ms windows
-        hop_length = frame_length // 2
-        
-        energy = librosa.feature.rms(y=waveform, frame_length=frame_length, hop_length=hop_length)[0]
-        
-        # Find pauses (low energy segments)
-        pause_threshold = np.mean(energy) * 0.1
-        pauses = energy < pause_threshold
+        # Pauses are the gaps between detected speech segments, or
+        # low-energy 30ms frames without voice activity detection
+        if vad is not None:
+            pause_ratio = vad.pause_ratio()
+        else:
+            features = features or FrameFeatures(waveform)
+            pause_ratio = features.pause_ratio()
         
         # Calculate pause score (penalize too many or too few pauses)
-        pause_ratio = np.mean(pauses)
         return 1 - abs(pause_ratio - 0.15) * 2  # Optimal pause ratio around 15%
 
     def _split_audio(self, waveform):
-        """Split audio into smaller segments for parallel processing"""
-        segment_length = SAMPLE_RATE * 5  # 5-second segments
-        return [waveform[i:i + segment_length] for i in range(0, len(waveform), segment_length)]
+        """Split audio into (optionally overlapping) segments; each segment is a view"""
+        return [waveform[start:end] for start, end in self._segment_bounds(len(waveform))]
+
+    def _segment_bounds(self, length):
+        """(start, end) sample offsets of fixed-length, optionally overlapping segments"""
+        segment_length = int(SAMPLE_RATE * SEGMENT_SECONDS)
+        step = max(segment_length - int(SAMPLE_RATE * SEGMENT_OVERLAP_SECONDS), 1)
+        bounds = []
+        for start in range(0, length, step):
+            bounds.append((start, min(start + segment_length, length)))
+            if start + segment_length >= length:
+                break
+        if len(bounds) > 1 and bounds[-1][1] - bounds[-1][0] < int(SAMPLE_RATE * MIN_SEGMENT_SECONDS):
+            # A tail too short for the model's receptive field would yield no frames
+            bounds.pop()
+            bounds[-1] = (bounds[-1][0], length)
+        return bounds
 
     def _process_segment(self, waveform):
         """Process a single audio segment"""
-        inputs = self.processor(
-            waveform, 
-            sampling_rate=SAMPLE_RATE, 
-            return_tensors="pt"
-        )
-        
-        # Get model predictions
+        return self._process_segments([waveform])[0]
+
+    def _process_segments(self, segments, stress=None):
+        """Process audio segments through the model in batches.
+
+        ``stress`` holds precomputed stress scores per segment; without it
+        each segment is scored on its own.
+        """
+        outputs = [None] * len(segments)
+        for batch in self._batches(segments):
+            for i, output in zip(batch, self._infer_batch([segments[i] for i in batch])):
+                outputs[i] = output
+
+        if stress is None:
+            with span("pronunciation.stress"):
+                stress = [self._analyze_stress_patterns(segment) for segment in segments]
+
+        return [
+            {
+                "confidence": confidence,
+                "logits": logits,
+                "stress": stress_score
+            }
+            for (confidence, logits), stress_score in zip(outputs, stress)
+        ]
+
+    def _batches(self, segments):
+        """Yield lists of segment indices to run through the model together.
+
+        Longest first so each batch holds similar lengths; equal-length
+        segments (every fixed chunk but the last) need no padding at all.
+        Without an attention mask the model takes zero padding for audio,
+        so then only segments of equal length share a batch.
+        """
+        order = sorted(range(len(segments)), key=lambda i: len(segments[i]), reverse=True)
+        if self._uses_attention_mask():
+            groups = [order]
+        else:
+            groups = [list(group) for _, group in itertools.groupby(order, key=lambda i: len(segments[i]))]
+        for group in groups:
+            for start in range(0, len(group), PRONUNCIATION_BATCH_SIZE):
+                yield group[start:start + PRONUNCIATION_BATCH_SIZE]
+
+    def _uses_attention_mask(self):
+        """Models with group-norm feature extractors are run without an attention mask"""
+        return self.model.config.feat_extract_norm == "layer"
+
+    def _infer_batch(self, segments):
+        """Run a padded batch of segments through the model.
+
+        Returns (confidence, logits) per segment, with logits trimmed to the
+        segment's real frames so they can be CTC-decoded later.
+        """
+        # Normalize each segment on its own so padding does not shift its statistics
+        input_values = [
+            self.processor(segment, sampling_rate=SAMPLE_RATE, return_tensors="np").input_values[0]
+            for segment in segments
+        ]
+        lengths = [len(values) for values in input_values]
+        batch = np.zeros((len(input_values), max(lengths)), dtype=np.float32)
+        attention_mask = np.zeros(batch.shape, dtype=np.int64)
+        for row, values in enumerate(input_values):
+            batch[row, :len(values)] = values
+            attention_mask[row, :len(values)] = 1
+
+        with span("wav2vec2.forward", batch_size=len(segments), samples=int(batch.shape[1])):
+            logits = self._forward(batch, attention_mask)
+
+        # Calculate pronunciation confidence over each segment's real frames only;
+        # the top softmax probability is 1 / sum(exp(logits - max))
+        shifted = logits - logits.max(axis=-1, keepdims=True)
+        confidence_scores = 1.0 / np.exp(shifted).sum(axis=-1)
+        frame_lengths = self._frame_lengths(lengths)
+        return [
+            (float(confidence_scores[row, :frames].mean()), logits[row, :frames])
+            for row, frames in enumerate(frame_lengths)
+        ]
+
+    def _forward(self, batch, attention_mask):
+        """Run the acoustic model and return float32 logits as a numpy array"""
+        # Batches for models without a mask hold equal lengths, so nothing is padded
+        use_mask = self._uses_attention_mask()
+        if self.backend == "onnx":
+            return self.model(batch, attention_mask if use_mask else None)
+
+        kwargs = {}
+        if use_mask:
+            kwargs["attention_mask"] = torch.from_numpy(attention_mask)
         with torch.no_grad():
-            logits = self.model(inputs.input_values).logits
-            
-        # Calculate pronunciation confidence scores
-        probs = torch.nn.functional.softmax(logits, dim=-1)
-        confidence_scores = torch.max(probs, dim=-1)[0]
-        
-        # Analyze rhythm and stress patterns
-        stress_patterns = self._analyze_stress_patterns(waveform)
-        
-        return {
-            "confidence": confidence_scores.mean().item(),
-            "stress": stress_patterns
-        } 
\ No newline at end of file
+            return self.model(torch.from_numpy(batch), **kwargs).logits.numpy()
+
+    def _frame_lengths(self, lengths):
+        """Number of logit frames the feature encoder produces for each input length"""
+        lengths = np.asarray(lengths)
+        for kernel, stride in zip(self.model.config.conv_kernel, self.model.config.conv_stride):
+            lengths = (lengths - kernel) // stride + 1
+        # Inputs shorter than the receptive field still get one (padded) frame, never an empty mean
+        return [max(int(frames), 1) for frames in lengths]
@@ -1,28 +1,68 @@
-import speech_recognition as sr
-from groq import Groq
-from transformers import pipeline, AutoModelForSeq2SeqLM, AutoTokenizer
-from textblob import TextBlob
 from dotenv import load_dotenv
-import os
+from config.settings import (
+    SAMPLE_RATE, GROQ_MODEL, GRAMMAR_BATCH_SIZE, GRAMMAR_MAX_LENGTH,
+    GRAMMAR_MAX_SENTENCE_WORDS, GRAMMAR_CACHE_SIZE, QUANTIZE_INT8, GRAMMAR_CORRECTION_MODEL
+)
+from model.onnx_backend import select_backend, load_grammar_model
+from utils.audio_io import load_audio, to_pcm16
+from utils.llm_client import get_llm_client
+from utils.metrics import metrics
+from utils.tracing import span
+from utils.result_cache import LRUCache, MISS
+from utils.lazy_import import lazy_import
+from utils.quantization import quantize_linear_int8
+import numpy as np
 import re
+import time
+
+# Heavy libraries are imported on first use
+sr = lazy_import("speech_recognition")
+transformers = lazy_import("transformers")
 
 load_dotenv()
 
+FEEDBACK_UNAVAILABLE = "Unable to generate feedback at this time."
+
+
+class UncheckedText(tuple):
+    """``(mistakes, corrected_text)`` returned when the grammar could not be checked"""
+    pass
+
 class SpeechProcessor:
-    def __init__(self):
-        self.groq_client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+    def __init__(self, quantize=QUANTIZE_INT8, backend=None):
+        self.quantize = quantize
+        self.backend = backend or select_backend("grammar")
+        # Pooled client shared by every SpeechProcessor in the process
+        self.groq_client = get_llm_client()
         self.grammar_checker = self._initialize_grammar_model()
+        # Corrections per sentence, so repeated sentences are never regenerated
+        self.correction_cache = LRUCache(GRAMMAR_CACHE_SIZE)
         self.recognizer = sr.Recognizer()
 
     def _initialize_grammar_model(self):
         """Initialize a better grammar checker model"""
+        if self.backend == "onnx":
+            try:
+                model, tokenizer = load_grammar_model()
+                return transformers.pipeline(
+                    "text2text-generation",
+                    model=model,
+                    tokenizer=tokenizer,
+                    max_length=512
+                )
+            except Exception as e:
+                print(f"Error loading ONNX grammar model, falling back to torch: {str(e)}")
+                self.backend = "torch"
+
         try:
             # Use T5-based grammar correction model instead
-            model_name = "vennify/t5-base-grammar-correction"
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+            model_name = GRAMMAR_CORRECTION_MODEL
+            tokenizer = transformers.AutoTokenizer.from_pretrained(model_name)
+            model = transformers.AutoModelForSeq2SeqLM.from_pretrained(model_name)
+            if self.quantize:
+                model = quantize_linear_int8(model)
             
-            return pipeline(
+            return transformers.pipeline(
                 "text2text-generation",
                 model=model,
                 tokenizer=tokenizer,
@@ -32,40 +72,85 @@ class SpeechProcessor:
             print(f"Error initializing grammar model: {str(e)}")
             # Fallback to the original model if the new one fails
             try:
-                return pipeline("text2text-generation", 
+                checker = transformers.pipeline("text2text-generation", 
                               model="prithivida/grammar_error_correcter_v1",
                               device="cpu")
+                if self.quantize:
+                    checker.model = quantize_linear_int8(checker.model)
+                return checker
             except:
                 return None
 
+    def _groq_request(self, text):
+        """Build the chat completion request for improvement feedback"""
+        return dict(
+            model=GROQ_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an expert English language coach specializing in sophisticated grammar and vocabulary. Analyze the provided speech for grammar issues and suggest more elegant, complex phrasing where appropriate. Focus on transforming basic expressions into more sophisticated ones. Keep responses concise and actionable."},
+                {"role": "user", "content": text}
+            ],
+            temperature=0.5,
+            max_completion_tokens=1024,
+            top_p=1,
+            stop=None
+        )
+
     def get_groq_feedback(self, text):
         """Send user speech to Groq chatbot for better phrasing suggestions"""
         try:
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are an expert English language coach specializing in sophisticated grammar and vocabulary. Analyze the provided speech for grammar issues and suggest more elegant, complex phrasing where appropriate. Focus on transforming basic expressions into more sophisticated ones. Keep responses concise and actionable."},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.5,
-                max_completion_tokens=1024,
-                top_p=1,
-                stop=None,
-                stream=False
-            )
-            return response.choices[0].message.content
+            return self.groq_client.complete(**self._groq_request(text))
         except Exception as e:
             print(f"Error getting Groq feedback: {str(e)}")
-            return "Unable to generate feedback at this time."
+            return FEEDBACK_UNAVAILABLE
+
+    async def agroq_feedback(self, text):
+        """Async version of ``get_groq_feedback`` that does not hold a worker thread"""
+        try:
+            return await self.groq_client.acomplete(**self._groq_request(text))
+        except Exception as e:
+            print(f"Error getting Groq feedback: {str(e)}")
+            return FEEDBACK_UNAVAILABLE
+
+    def stream_groq_feedback(self, text):
+        """Yield Groq phrasing suggestions as text deltas while they are generated"""
+        start = time.perf_counter()
+        received = False
+        try:
+            for delta in self.groq_client.stream(**self._groq_request(text)):
+                if not received:
+                    received = True
+                    metrics.observe("groq_time_to_first_token_seconds", time.perf_counter() - start)
+                yield delta
+            metrics.observe("groq_stream_duration_seconds", time.perf_counter() - start)
+        except Exception as e:
+            print(f"Error streaming Groq feedback: {str(e)}")
+            if not received:
+                yield FEEDBACK_UNAVAILABLE
+
+    async def astream_groq_feedback(self, text):
+        """Async version of ``stream_groq_feedback`` that does not hold a worker thread"""
+        start = time.perf_counter()
+        received = False
+        try:
+            async for delta in self.groq_client.astream(**self._groq_request(text)):
+                if not received:
+                    received = True
+                    metrics.observe("groq_time_to_first_token_seconds", time.perf_counter() - start)
+                yield delta
+            metrics.observe("groq_stream_duration_seconds", time.perf_counter() - start)
+        except Exception as e:
+            print(f"Error streaming Groq feedback: {str(e)}")
+            if not received:
+                yield FEEDBACK_UNAVAILABLE
 
     def analyze_text(self, text):
         """Analyze text for grammar mistakes and spelling errors"""
         try:
             if self.grammar_checker is None:
-                return [], text
+                return UncheckedText(([], text))
 
-            # Generate corrected text
-            corrected_text = self.grammar_checker(text, max_length=512)[0]["generated_text"]
+            # Generate corrected text sentence by sentence
+            corrected_text = " ".join(self._correct_sentences(self._split_for_correction(text)))
             
             # Find specific grammar errors by comparing original and corrected text
             original_sentences = self._split_into_sentences(text)
@@ -96,54 +181,93 @@ class SpeechProcessor:
             return mistakes, corrected_text
         except Exception as e:
             print(f"Error analyzing text: {str(e)}")
-            return [], text
+            return UncheckedText(([], text))
     
+    def _split_for_correction(self, text):
+        """Split text into sentences, chunking run-ons so none exceeds the model input size"""
+        pieces = []
+        for sentence in self._split_into_sentences(text):
+            words = sentence.split()
+            for start in range(0, len(words), GRAMMAR_MAX_SENTENCE_WORDS):
+                pieces.append(" ".join(words[start:start + GRAMMAR_MAX_SENTENCE_WORDS]))
+        return pieces
+
+    def _correct_sentences(self, sentences):
+        """Correct sentences in padded batches, reusing cached corrections"""
+        corrections = {}
+        missing = []
+        for sentence in dict.fromkeys(sentences):
+            cached = self.correction_cache.get(sentence)
+            if cached is MISS:
+                missing.append(sentence)
+            else:
+                corrections[sentence] = cached
+
+        if missing:
+            # Similar lengths in a batch keep padding to a minimum
+            missing.sort(key=len)
+            with span("t5.generate", sentences=len(missing)):
+                outputs = self.grammar_checker(missing, max_length=GRAMMAR_MAX_LENGTH, batch_size=GRAMMAR_BATCH_SIZE)
+            if metrics.enabled:
+                generated = self.grammar_checker.tokenizer([output["generated_text"] for output in outputs]).input_ids
+                metrics.increment("t5_generated_tokens_total", sum(len(ids) for ids in generated))
+            for sentence, output in zip(missing, outputs):
+                corrections[sentence] = output["generated_text"]
+                self.correction_cache.set(sentence, output["generated_text"])
+
+        return [corrections[sentence] for sentence in sentences]
+
     def _split_into_sentences(self, text):
         """Split text into sentences more accurately"""
         # Simple sentence splitting - can be improved
         sentences = re.split(r'(?<=[.!?])\s+', text)
         return sentences
 
+    def transcribe(self, audio):
+        """Transcribe audio to text with Google speech recognition.
+
+        ``audio`` is either a file path or a decoded waveform at SAMPLE_RATE,
+        as returned by ``utils.audio_io.load_audio``.
+        """
+        if not isinstance(audio, np.ndarray):
+            audio = load_audio(audio)
+        audio_data = sr.AudioData(to_pcm16(audio), SAMPLE_RATE, 2)
+        metrics.increment("audio_seconds_processed_total", len(audio) / SAMPLE_RATE, labels={"model": "google_asr"})
+        with span("google_asr.recognize"):
+            return self.recognizer.recognize_google(audio_data)
+
+    def format_grammar_issues(self, mistakes):
+        """Format grammar mistakes for display"""
+        return ', '.join(mistakes) if mistakes else 'No major issues found'
+
     def process_audio(self, audio_file):
         """Process audio file and return analysis results"""
         try:
             if not audio_file:
                 return [("Error:", "No audio file provided")]
 
-            with sr.AudioFile(audio_file) as source:
-                # Adjust for longer audio files
-                audio = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio)
-                
-                if not text:
-                    return [("Error:", "Could not transcribe audio")]
-
-                # Initialize default responses
-                chat_history = [
-                    ("You said:", text),
-                    ("Grammar Issues:", "Analyzing..."),
-                    ("Corrected Version:", "Processing..."),
-                    ("Improvement Suggestion:", "Generating...")
-                ]
-
-                # Get analyses
-                mistakes, grammar_feedback = self.analyze_text(text)
-                chatbot_feedback = self.get_groq_feedback(text)
-                
-                # Update chat history with actual results
-                chat_history = [
-                    ("You said:", text),
-                    ("Grammar Issues:", f"{', '.join(mistakes) if mistakes else 'No major issues found'}"),
-                    ("Corrected Version:", grammar_feedback),
-                    ("Improvement Suggestion:", chatbot_feedback)
-                ]
-                
-                return chat_history
-                
+            text = self.transcribe(audio_file)
+
+            if not text:
+                return [("Error:", "Could not transcribe audio")]
+
+            # Get analyses
+            mistakes, grammar_feedback = self.analyze_text(text)
+            chatbot_feedback = self.get_groq_feedback(text)
+
+            chat_history = [
+                ("You said:", text),
+                ("Grammar Issues:", self.format_grammar_issues(mistakes)),
+                ("Corrected Version:", grammar_feedback),
+                ("Improvement Suggestion:", chatbot_feedback)
+            ]
+
+            return chat_history
+
         except sr.UnknownValueError:
             return [("Error:", "Could not understand the audio")]
         except sr.RequestError as e:
             return [("Error:", f"Could not process audio; {str(e)}")]
         except Exception as e:
             print(f"Error processing audio: {str(e)}")
-            return [("Error:", "An error occurred while processing the audio")] 
\ No newline at end of file
+            return [("Error:", "An error occurred while processing the audio")]
\ No newline at end of file
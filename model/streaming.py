@@ -0,0 +1,237 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config.settings import SAMPLE_RATE, MAX_AUDIO_LENGTH, GRAMMAR_MAX_SENTENCE_WORDS, VAD_MIN_SPEECH_SECONDS
+from model.frame_features import FrameFeatures, FRAME_SECONDS, HOP_SECONDS
+from model.vad import VoiceActivity
+from utils.audio_io import to_mono_float
+from utils.lazy_import import lazy_import
+
+librosa = lazy_import("librosa")
+
+# Grammar corrections are prepared off the audio path while the speaker talks
+_grammar_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stream-grammar")
+
+
+class StreamingSession:
+    """Incremental assessment of audio that arrives in chunks, e.g. from a microphone.
+
+    The frame energy envelope is extended as each chunk arrives. Every speech
+    segment is scored and transcribed by the acoustic model as soon as the
+    speaker pauses after it, and vocabulary and grammar are refreshed as the
+    transcript grows. Finishing only has to process the last segment.
+
+    Pieces of a long speech run that were already scored are decoded
+    together with the rest of the run once it ends, the same way
+    ``PronunciationAnalyzer.transcribe`` decodes a whole recording.
+    """
+
+    def __init__(self, pronunciation_analyzer, speech_processor, vocabulary_analyzer):
+        self.pronunciation_analyzer = pronunciation_analyzer
+        self.speech_processor = speech_processor
+        self.vocabulary_analyzer = vocabulary_analyzer
+        self._lock = threading.Lock()
+        self.frame_length = int(SAMPLE_RATE * FRAME_SECONDS)
+        self.hop_length = int(SAMPLE_RATE * HOP_SECONDS)
+
+        # Only audio not yet sent to the model is kept; _offset is the
+        # absolute sample index of _audio[0]. Energy frames are centred like
+        # librosa's (center=True), so the recording starts with half a frame
+        # of zero padding.
+        padding = self.frame_length // 2
+        self._audio = np.zeros(padding, dtype=np.float32)
+        self._offset = -padding
+        self.length = 0
+        self._energy = np.zeros(0, dtype=np.float32)
+        self._next_frame = -padding
+        self._processed_until = 0
+
+        self.results = []
+        self.texts = []
+        # Logits of scored pieces of a speech run that has not ended yet
+        self._open_logits = []
+        self.transcript = ""
+        self.vocabulary = None
+        self._grammar_words = 0
+        self._grammar_future = None
+        self.truncated = False
+
+    @property
+    def duration(self):
+        return self.length / SAMPLE_RATE
+
+    def add_chunk(self, sample_rate, data):
+        """Append a chunk of audio, process any speech segment it completes and return running stats"""
+        # Scaled like uploads decoded by load_audio, so live and uploaded audio score the same
+        waveform = to_mono_float(data)
+        if sample_rate != SAMPLE_RATE:
+            waveform = librosa.resample(waveform, orig_sr=sample_rate, target_sr=SAMPLE_RATE)
+        with self._lock:
+            room = int(MAX_AUDIO_LENGTH * SAMPLE_RATE) - self.length
+            if len(waveform) > room:
+                waveform = waveform[:max(room, 0)]
+                self.truncated = True
+            self._append(waveform)
+            features, vad = self._process_ready(final=False)
+            return self._stats(features, vad)
+
+    def finish(self, on_result=None):
+        """Process the remaining audio and return the final transcript and scores.
+
+        ``on_result("transcript", text)`` is called as soon as the final
+        transcript is known, before grammar and vocabulary are finished.
+        """
+        with self._lock:
+            # The last frames reach into zero padding after the end, as with librosa
+            self._extend_energy(np.concatenate([self._audio, np.zeros(self.frame_length // 2, dtype=np.float32)]))
+            features, vad = self._process_ready(final=True)
+            if not self.results and self.length > self._processed_until:
+                # No speech detected: score whatever was recorded as one segment
+                self._run_segments([(self._processed_until, self.length, 0)], features, run_open=False)
+            elif self._open_logits:
+                # The rest of the last run was too short to score
+                self._run_segments([], features, run_open=False)
+            if not self.results:
+                raise RuntimeError("No audio received")
+            if on_result is not None and self.transcript:
+                on_result("transcript", self.transcript)
+
+            if self._grammar_future is not None:
+                self._grammar_future.result()
+            grammar = self.speech_processor.analyze_text(self.transcript) if self.transcript else ([], "")
+            if self.vocabulary is None and self.transcript:
+                self.vocabulary = self.vocabulary_analyzer.analyze_vocabulary(self.transcript)
+            return {
+                "duration_seconds": self.duration,
+                "transcript": self.transcript,
+                "grammar": grammar,
+                "vocabulary": self.vocabulary,
+                "pronunciation": self._pronunciation(*self._scoring_view(features, vad))
+            }
+
+    def _append(self, waveform):
+        self._audio = np.concatenate([self._audio, waveform])
+        self.length += len(waveform)
+        self._extend_energy(self._audio)
+
+    def _extend_energy(self, audio):
+        """Extend the energy envelope with every frame of ``audio`` (the buffer, maybe padded) that is now complete"""
+        start = self._next_frame - self._offset
+        count = (len(audio) - start - self.frame_length) // self.hop_length + 1
+        if count > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(
+                audio[start:], self.frame_length
+            )[::self.hop_length][:count]
+            energy = np.sqrt(np.mean(np.square(frames), axis=1))
+            self._energy = np.concatenate([self._energy, energy.astype(np.float32)])
+            self._next_frame += count * self.hop_length
+
+    def _features(self):
+        return FrameFeatures.from_energy(self._energy, self.duration)
+
+    def _process_ready(self, final):
+        """Run the model over every speech segment that is complete (all of them if final)"""
+        features = self._features()
+        vad = VoiceActivity(features)
+        min_samples = int(VAD_MIN_SPEECH_SECONDS * SAMPLE_RATE)
+        bounds = [
+            (max(start, self._processed_until), end, run)
+            for start, end, run in vad.run_segments(self.length, complete_only=not final)
+            if end - max(start, self._processed_until) >= min_samples
+        ]
+        if bounds:
+            first_run = bounds[0][2]
+            # Held-back pieces belong to the first run if it started before them
+            continued = first_run if vad.runs[first_run][0] * features.hop_length < self._processed_until else -1
+            self._run_segments(bounds, features, run_open=not final and vad.is_open(bounds[-1][2]),
+                               continued_run=continued)
+        return features, vad
+
+    def _run_segments(self, bounds, features, run_open, continued_run=-1):
+        """Score (start, end, run) segments and extend the transcript with every run that has ended.
+
+        Pieces of the last run are held back while ``run_open``, and
+        decoded with the rest of that run later; ``continued_run`` is the
+        run in ``bounds`` that the pieces held back earlier belong to.
+        """
+        analyzer = self.pronunciation_analyzer
+        segments = [self._audio[start - self._offset:end - self._offset] for start, end, _ in bounds]
+        stress = [features.stress(start, end) for start, end, _ in bounds]
+        logits = []
+        for result in analyzer._process_segments(segments, stress):
+            logits.append(result.pop("logits"))
+            self.results.append(result)
+        if bounds:
+            self._processed_until = bounds[-1][1]
+
+        runs = [continued_run] * len(self._open_logits) + [run for _, _, run in bounds]
+        logits = self._open_logits + logits
+        closed = len(runs)
+        if run_open:
+            closed = runs.index(runs[-1])
+        text = analyzer.decoder.decode_runs(logits[:closed], runs[:closed])
+        if text:
+            self.texts.append(text)
+        self._open_logits = logits[closed:]
+
+        # Drop audio that is neither pending for the model nor needed for the next energy frame
+        keep_from = min(self._processed_until, self._next_frame)
+        self._audio = self._audio[keep_from - self._offset:].copy()
+        self._offset = keep_from
+
+        # The running transcript includes a provisional decoding of the open run
+        texts = self.texts + [analyzer.decoder.decode_runs(self._open_logits, [0] * len(self._open_logits))]
+        self.transcript = " ".join(text for text in texts if text)
+        self._update_language()
+
+    def _update_language(self):
+        """Refresh vocabulary metrics and prepare corrections for completed chunks of the transcript"""
+        if not self.transcript:
+            return
+        self.vocabulary = self.vocabulary_analyzer.analyze_vocabulary(self.transcript)
+
+        # Unpunctuated transcripts are corrected in fixed word chunks (see
+        # SpeechProcessor._split_for_correction), so completed chunks can be
+        # corrected now and are served from the correction cache at the end
+        words = self.transcript.split()
+        complete = len(words) // GRAMMAR_MAX_SENTENCE_WORDS * GRAMMAR_MAX_SENTENCE_WORDS
+        if complete > self._grammar_words and (self._grammar_future is None or self._grammar_future.done()):
+            self._grammar_words = complete
+            self._grammar_future = _grammar_executor.submit(
+                self.speech_processor.analyze_text, " ".join(words[:complete])
+            )
+
+    def _scoring_view(self, features, vad):
+        """Features and voice activity restricted to the span between the first and last speech"""
+        if not vad.runs:
+            return features, vad
+        first, last = vad.runs[0][0], vad.runs[-1][1]
+        trimmed = FrameFeatures.from_energy(features.energy[first:last], (last - first) * HOP_SECONDS)
+        return trimmed, VoiceActivity(trimmed)
+
+    def _pronunciation(self, features, vad):
+        """Pronunciation and fluency scores over everything processed so far"""
+        analyzer = self.pronunciation_analyzer
+        confidence = float(np.mean([r["confidence"] for r in self.results]))
+        stress = float(np.mean([r["stress"] for r in self.results]))
+        return {
+            "confidence_scores": confidence,
+            "stress_patterns": stress,
+            "pronunciation_score": analyzer._calculate_overall_score(confidence, stress),
+            "fluency_score": analyzer._calculate_fluency(None, features, vad)
+        }
+
+    def _stats(self, features, vad):
+        stats = {
+            "duration_seconds": self.duration,
+            "segments": len(self.results),
+            "transcript": self.transcript,
+            "truncated": self.truncated
+        }
+        if self.results:
+            features, vad = self._scoring_view(features, vad)
+            stats.update(self._pronunciation(features, vad))
+            stats["pause_ratio"] = vad.pause_ratio()
+        if self.vocabulary is not None:
+            stats["lexical_diversity"] = self.vocabulary["lexical_diversity"]
+        return stats
@@ -0,0 +1,107 @@
+import numpy as np
+from config.settings import (
+    VAD_TOP_DB, VAD_MIN_PAUSE_SECONDS, VAD_MIN_SPEECH_SECONDS,
+    VAD_PADDING_SECONDS, VAD_MAX_SEGMENT_SECONDS
+)
+from model.frame_features import HOP_SECONDS
+
+
+class VoiceActivity:
+    """Energy-based voice activity detection over a recording's frame features.
+
+    Speech runs are found on the shared RMS envelope: quiet frames are
+    silence, gaps shorter than VAD_MIN_PAUSE_SECONDS are bridged and bursts
+    shorter than VAD_MIN_SPEECH_SECONDS are dropped. The gaps between runs
+    are the recording's pauses.
+    """
+
+    def __init__(self, features, top_db=VAD_TOP_DB):
+        self.features = features
+        energy = features.energy
+        if len(energy) == 0:
+            self.runs = []
+            return
+        reference = np.percentile(energy, 95)
+        threshold = max(reference * 10 ** (-top_db / 20), 1e-6)
+        self.runs = self._find_runs(energy >= threshold)
+
+    def _frames(self, seconds):
+        return max(int(round(seconds / HOP_SECONDS)), 1)
+
+    def _find_runs(self, speech):
+        """(start, end) frame ranges of speech, with short gaps bridged and short bursts dropped"""
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+        runs = [[start, end] for start, end in zip(edges[::2], edges[1::2])]
+
+        merged = []
+        min_pause = self._frames(VAD_MIN_PAUSE_SECONDS)
+        for start, end in runs:
+            if merged and start - merged[-1][1] < min_pause:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        min_speech = self._frames(VAD_MIN_SPEECH_SECONDS)
+        return [(start, end) for start, end in merged if end - start >= min_speech]
+
+    def _split_long(self, start, end, max_frames):
+        """Cut a run longer than max_frames at its quietest frame in the second half of each window"""
+        energy = self.features.energy
+        pieces = []
+        while end - start > max_frames:
+            window = energy[start + max_frames // 2:start + max_frames]
+            cut = start + max_frames // 2 + int(np.argmin(window))
+            pieces.append((start, cut))
+            start = cut
+        pieces.append((start, end))
+        return pieces
+
+    def segments(self, length, complete_only=False):
+        """Padded (start, end) sample offsets of every speech segment, in order and non-overlapping.
+
+        With ``complete_only``, audio that is still arriving is taken into
+        account: the last piece of a run that is not yet followed by a full
+        pause may still grow, so it is left out.
+        """
+        return [(start, end) for start, end, _ in self.run_segments(length, complete_only)]
+
+    def run_segments(self, length, complete_only=False):
+        """Like ``segments``, as (start, end, run) with the index of the speech run each piece belongs to.
+
+        Pieces of one run, cut at VAD_MAX_SEGMENT_SECONDS, are contiguous and
+        should be decoded together; different runs are separated by a pause.
+        """
+        hop = self.features.hop_length
+        padding = int(VAD_PADDING_SECONDS * self.features.sample_rate)
+        max_frames = self._frames(VAD_MAX_SEGMENT_SECONDS - 2 * VAD_PADDING_SECONDS)
+
+        bounds = []
+        for run, (run_start, run_end) in enumerate(self.runs):
+            pieces = self._split_long(run_start, run_end, max_frames)
+            if complete_only and self.is_open(run):
+                pieces = pieces[:-1]
+            for start, end in pieces:
+                start = max(start * hop - padding, 0)
+                end = min(end * hop + padding, length)
+                if bounds and start < bounds[-1][1]:
+                    # Padding of neighbouring segments meets halfway
+                    middle = (start + bounds[-1][1]) // 2
+                    bounds[-1] = (bounds[-1][0], middle, bounds[-1][2])
+                    start = middle
+                if end > start:
+                    bounds.append((start, end, run))
+        return bounds
+
+    def is_open(self, run):
+        """True if a run is not yet followed by a full pause, so it may still grow as audio arrives"""
+        return self.runs[run][1] > len(self.features.energy) - self._frames(VAD_MIN_PAUSE_SECONDS)
+
+    def pauses(self):
+        """Durations in seconds of the pauses between speech runs"""
+        return [(start - end) * HOP_SECONDS for (_, end), (start, _) in zip(self.runs, self.runs[1:])]
+
+    def pause_ratio(self):
+        """Share of the recording spent in pauses between speech"""
+        if not self.features.duration:
+            return 0.0
+        return sum(self.pauses()) / self.features.duration
@@ -1,26 +1,31 @@
 from collections import Counter
-from textblob import TextBlob
-import spacy
-from nltk.corpus import wordnet, cmudict
+from functools import lru_cache
 import numpy as np
-from nltk.corpus import brown, gutenberg
-from nltk.probability import FreqDist
-import nltk
+from model.word_index import load_word_index, load_cmudict, count_syllables, word_features
+from config.settings import OOV_CACHE_SIZE
+from utils.lazy_import import lazy_import
+from utils.tracing import span
+
+# spaCy is imported on first use
+spacy = lazy_import("spacy")
+
+CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+
+
+class UnscoredVocabulary(dict):
+    """All-zero vocabulary scores returned when the analysis failed"""
+    pass
+
 
 class VocabularyAnalyzer:
     def __init__(self):
         self.nlp = spacy.load("en_core_web_md")
         # Initialize NLTK resources
-        try:
-            self.cmu = cmudict.dict()
-        except LookupError:
-            nltk.download('cmudict')
-            self.cmu = cmudict.dict()
+        self.cmu = load_cmudict()
         
-        # Create frequency distributions from standard corpora
-        self.freq_dist = self._initialize_frequency_dist()
-        # Create word ranks dictionary
-        self.word_ranks = self._create_word_ranks()
+        # Memory-mapped word ranks prebuilt from standard corpora
+        # (see `python -m model.word_index`)
+        self.word_ranks = load_word_index()
         
         # CEFR level approximations based on frequency ranks
         self.cefr_thresholds = {
@@ -31,72 +36,37 @@ class VocabularyAnalyzer:
             'C1': 7000,
             'C2': float('inf')  # Beyond common usage
         }
+        # Upper rank bounds of every level but C2, for vectorized lookup
+        self._cefr_bounds = np.array([self.cefr_thresholds[level] for level in CEFR_LEVELS[:-1]])
+
+        # Words outside the prebuilt lexicon are scored live, with a bounded cache
+        self._oov_features = lru_cache(maxsize=OOV_CACHE_SIZE)(self._compute_word_features)
     
-    def _initialize_frequency_dist(self):
-        """Initialize frequency distribution from standard corpora"""
-        try:
-            words = []
-            # Use Brown corpus (standard American English)
-            words.extend(brown.words())
-            # Use Gutenberg corpus (classic literature)
-            words.extend(gutenberg.words())
-            return FreqDist(word.lower() for word in words)
-        except LookupError:
-            nltk.download('brown')
-            nltk.download('gutenberg')
-            words = []
-            words.extend(brown.words())
-            words.extend(gutenberg.words())
-            return FreqDist(word.lower() for word in words)
-
-    def _create_word_ranks(self):
-        """Create a dictionary of word ranks based on frequency"""
-        words_by_freq = sorted(self.freq_dist.items(), key=lambda x: x[1], reverse=True)
-        return {word: rank for rank, (word, _) in enumerate(words_by_freq, 1)}
-    
+    def _compute_word_features(self, word):
+        """Compute complexity features for a word missing from the prebuilt lexicon"""
+        return word_features(word, self._get_frequency_rank(word), self.cmu)
+
+    def _lookup_features(self, words):
+        """Gather complexity features and frequency ranks for a list of words"""
+        rows = self.word_ranks.find_many(words)
+        known = rows >= 0
+        features = np.empty((len(words), self.word_ranks.features.shape[1]))
+        ranks = np.full(len(words), len(self.word_ranks), dtype=np.int64)
+        features[known] = self.word_ranks.features[rows[known]]
+        ranks[known] = self.word_ranks.ranks[rows[known]]
+        for i in np.flatnonzero(~known):
+            features[i] = self._oov_features(words[i])
+        return features, ranks
+
     def _get_word_complexity(self, word):
         """Calculate word complexity based on multiple factors"""
-        complexity_scores = []
-        
-        # 1. Length complexity
-        length_score = min(len(word) / 12, 1.0)  # Normalize by max expected length
-        complexity_scores.append(length_score)
-        
-        # 2. Syllable complexity
-        try:
-            syllables = len(self._count_syllables(word))
-            syllable_score = min(syllables / 5, 1.0)  # Normalize by max expected syllables
-            complexity_scores.append(syllable_score)
-        except (KeyError, IndexError):
-            syllable_score = 0.5  # Default if word not found
-            complexity_scores.append(syllable_score)
-        
-        # 3. Frequency-based complexity
-        freq_rank = self._get_frequency_rank(word)
-        freq_score = min(freq_rank / 10000, 1.0)  # Normalize by rank
-        complexity_scores.append(freq_score)
-        
-        # 4. Semantic complexity (number of meanings)
-        try:
-            meanings = len(wordnet.synsets(word))
-            semantic_score = min(meanings / 10, 1.0)  # Normalize by max expected meanings
-            complexity_scores.append(semantic_score)
-        except LookupError:
-            nltk.download('wordnet')
-            meanings = len(wordnet.synsets(word))
-            semantic_score = min(meanings / 10, 1.0)
-            complexity_scores.append(semantic_score)
-        
-        return np.mean(complexity_scores)
-    
+        features, _ = self._lookup_features([word.lower()])
+        return features[0].mean()
+
     def _count_syllables(self, word):
         """Count syllables using CMU pronouncing dictionary"""
-        try:
-            return [len(list(y for y in x if y[-1].isdigit())) for x in self.cmu[word.lower()]]
-        except KeyError:
-            # Fallback syllable counting if word not in CMU dict
-            return [len(''.join(c for c in word if c.lower() in 'aeiou'))]
-    
+        return count_syllables(word, self.cmu)
+
     def _get_frequency_rank(self, word):
         """Get word frequency rank"""
         word = word.lower()
@@ -113,7 +83,8 @@ class VocabularyAnalyzer:
     def analyze_vocabulary(self, text):
         """Analyze vocabulary richness and appropriateness"""
         try:
-            doc = self.nlp(text)
+            with span("spacy.parse"):
+                doc = self.nlp(text)
             
             # Analyze lexical diversity
             words = [token.text.lower() for token in doc if token.is_alpha and not token.is_stop]
@@ -128,34 +99,33 @@ class VocabularyAnalyzer:
                     "complex_words": []
                 }
             
-            # Analyze word complexity and CEFR levels
-            word_complexities = {}
-            cefr_levels = {'A1': 0, 'A2': 0, 'B1': 0, 'B2': 0, 'C1': 0, 'C2': 0}
-            
-            for word in words:
-                try:
-                    complexity = self._get_word_complexity(word)
-                    word_complexities[word] = complexity
-                    cefr_level = self._get_cefr_level(word)
-                    cefr_levels[cefr_level] += 1
-                except Exception as e:
-                    print(f"Error processing word '{word}': {str(e)}")
-                    continue
-            
-            # Get complex words (above B1 level with high complexity)
+            # Analyze word complexity and CEFR levels in one pass over the
+            # unique words, using the precomputed lexicon feature table
+            unique_words = list(dict.fromkeys(words))
+            # Words outside the lexicon are scored live with WordNet and CMUdict
+            with span("vocabulary.lexicon", words=len(unique_words)):
+                features, ranks = self._lookup_features(unique_words)
+            complexities = features.mean(axis=1)
+            level_ids = np.searchsorted(self._cefr_bounds, ranks, side='left')
+
+            word_ids = {word: i for i, word in enumerate(unique_words)}
+            token_levels = level_ids[[word_ids[word] for word in words]]
+            level_counts = np.bincount(token_levels, minlength=len(CEFR_LEVELS))
+            cefr_levels = dict(zip(CEFR_LEVELS, level_counts.tolist()))
+
+            # Get complex words (above B1 level with high complexity),
+            # sorted by complexity
+            complex_ids = np.flatnonzero(complexities > 0.6)  # Threshold for complex words
+            complex_ids = complex_ids[np.argsort(-complexities[complex_ids], kind='stable')]
             complex_words = [
                 {
-                    'word': word,
-                    'complexity': score,
-                    'cefr_level': self._get_cefr_level(word)
+                    'word': unique_words[i],
+                    'complexity': float(complexities[i]),
+                    'cefr_level': CEFR_LEVELS[level_ids[i]]
                 }
-                for word, score in word_complexities.items()
-                if score > 0.6  # Threshold for complex words
+                for i in complex_ids
             ]
             
-            # Sort complex words by complexity
-            complex_words.sort(key=lambda x: x['complexity'], reverse=True)
-            
             # Extract high-quality complex words (C1 and C2 level)
             high_quality_words = [
                 word['word'] for word in complex_words 
@@ -164,7 +134,7 @@ class VocabularyAnalyzer:
             
             return {
                 "lexical_diversity": len(set(words)) / len(words),
-                "sophistication": np.mean(list(word_complexities.values())) if word_complexities else 0,
+                "sophistication": float(complexities.mean()),
                 "context_appropriateness": self._analyze_context(doc),
                 "unique_words": high_quality_words[:10],  # Top 10 high-quality complex words
                 "total_words": len(words),
@@ -173,7 +143,7 @@ class VocabularyAnalyzer:
             }
         except Exception as e:
             print(f"Error in analyze_vocabulary: {str(e)}")
-            return {
+            return UnscoredVocabulary({
                 "lexical_diversity": 0,
                 "sophistication": 0,
                 "context_appropriateness": 0,
@@ -181,23 +151,50 @@ class VocabularyAnalyzer:
                 "total_words": 0,
                 "cefr_levels": {'A1': 0, 'A2': 0, 'B1': 0, 'B2': 0, 'C1': 0, 'C2': 0},
                 "complex_words": []
-            }
+            })
     
     def _analyze_context(self, doc):
         """Analyze if words are used in appropriate context"""
         try:
-            context_scores = []
-            for sent in doc.sents:
-                sent_vectors = [w.vector for w in sent if w.has_vector]
-                if sent_vectors:
-                    context_vector = np.mean(sent_vectors, axis=0)
-                    for token in sent:
-                        if token.has_vector:
-                            similarity = np.dot(token.vector, context_vector) / (
-                                np.linalg.norm(token.vector) * np.linalg.norm(context_vector)
-                            )
-                            context_scores.append(similarity)
-            return np.mean(context_scores) if context_scores else 0
+            with span("vocabulary.context"):
+                return context_scores([doc])[0]
         except Exception as e:
             print(f"Error in context analysis: {str(e)}")
-            return 0 
\ No newline at end of file
+            return 0
+
+
+def context_scores(docs):
+    """Mean token-to-sentence cosine similarity for each of several spaCy docs.
+
+    Every token vector of every doc is stacked into one matrix, sentence
+    context vectors are computed with a single segmented sum, and all
+    similarities come from one normalized row-wise product.
+    """
+    vectors, sent_sizes, doc_sizes = [], [], []
+    for doc in docs:
+        doc_size = 0
+        for sent in doc.sents:
+            sent_vectors = [token.vector for token in sent if token.has_vector]
+            if sent_vectors:
+                vectors.extend(sent_vectors)
+                sent_sizes.append(len(sent_vectors))
+                doc_size += len(sent_vectors)
+        doc_sizes.append(doc_size)
+
+    if not vectors:
+        return [0] * len(doc_sizes)
+
+    matrix = np.vstack(vectors)
+    sent_sizes = np.array(sent_sizes)
+    sent_starts = np.concatenate(([0], np.cumsum(sent_sizes)[:-1]))
+    contexts = np.add.reduceat(matrix, sent_starts, axis=0) / sent_sizes[:, None]
+    sent_ids = np.repeat(np.arange(len(sent_sizes)), sent_sizes)
+
+    # Normalize each token and each sentence context once, then take the dot products
+    with np.errstate(divide='ignore', invalid='ignore'):
+        token_units = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        context_units = contexts / np.linalg.norm(contexts, axis=1, keepdims=True)
+    similarities = np.einsum('ij,ij->i', token_units, context_units[sent_ids])
+
+    doc_similarities = np.split(similarities, np.cumsum(doc_sizes)[:-1])
+    return [float(np.mean(sims)) if len(sims) else 0 for sims in doc_similarities]
@@ -0,0 +1,231 @@
+import argparse
+import bisect
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import numpy as np
+from config.settings import WORD_INDEX_DIR
+from utils.lazy_import import lazy_import
+
+# NLTK is only needed to build the index or score out-of-vocabulary words
+nltk = lazy_import("nltk")
+filelock = lazy_import("filelock")
+
+WORDS_FILE = "words.bin"
+OFFSETS_FILE = "offsets.npy"
+RANKS_FILE = "ranks.npy"
+FEATURES_FILE = "features.npy"
+
+# Columns of the complexity feature table
+FEATURE_NAMES = ("length", "syllables", "frequency", "meanings")
+
+
+def load_frequency_dist():
+    """Build a frequency distribution from standard corpora"""
+    try:
+        # Brown corpus (standard American English) and Gutenberg (classic literature)
+        words = list(nltk.corpus.brown.words()) + list(nltk.corpus.gutenberg.words())
+    except LookupError:
+        nltk.download('brown')
+        nltk.download('gutenberg')
+        words = list(nltk.corpus.brown.words()) + list(nltk.corpus.gutenberg.words())
+    return nltk.probability.FreqDist(word.lower() for word in words)
+
+
+def compute_word_ranks(freq_dist):
+    """Rank words by descending frequency, starting at 1"""
+    words_by_freq = sorted(freq_dist.items(), key=lambda x: x[1], reverse=True)
+    return {word: rank for rank, (word, _) in enumerate(words_by_freq, 1)}
+
+
+def load_cmudict():
+    """Load the CMU pronouncing dictionary, downloading it if needed"""
+    try:
+        return nltk.corpus.cmudict.dict()
+    except LookupError:
+        nltk.download('cmudict')
+        return nltk.corpus.cmudict.dict()
+
+
+def count_syllables(word, cmu):
+    """Count syllables using CMU pronouncing dictionary"""
+    try:
+        return [len(list(y for y in x if y[-1].isdigit())) for x in cmu[word.lower()]]
+    except KeyError:
+        # Fallback syllable counting if word not in CMU dict
+        return [len(''.join(c for c in word if c.lower() in 'aeiou'))]
+
+
+def word_features(word, rank, cmu):
+    """Return the complexity features of a word, in FEATURE_NAMES order"""
+    # 1. Length complexity
+    length_score = min(len(word) / 12, 1.0)  # Normalize by max expected length
+
+    # 2. Syllable complexity
+    try:
+        syllables = len(count_syllables(word, cmu))
+        syllable_score = min(syllables / 5, 1.0)  # Normalize by max expected syllables
+    except (KeyError, IndexError):
+        syllable_score = 0.5  # Default if word not found
+
+    # 3. Frequency-based complexity
+    freq_score = min(rank / 10000, 1.0)  # Normalize by rank
+
+    # 4. Semantic complexity (number of meanings)
+    try:
+        meanings = len(nltk.corpus.wordnet.synsets(word))
+    except LookupError:
+        nltk.download('wordnet')
+        meanings = len(nltk.corpus.wordnet.synsets(word))
+    semantic_score = min(meanings / 10, 1.0)  # Normalize by max expected meanings
+
+    return length_score, syllable_score, freq_score, semantic_score
+
+
+def _build_index_arrays():
+    """Compute the sorted word blob, offsets, ranks and feature table"""
+    word_ranks = compute_word_ranks(load_frequency_dist())
+    entries = sorted((word.encode("utf-8"), word, rank) for word, rank in word_ranks.items())
+
+    offsets = np.zeros(len(entries) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(key) for key, _, _ in entries])
+    ranks = np.array([rank for _, _, rank in entries], dtype=np.uint32)
+
+    cmu = load_cmudict()
+    features = np.array(
+        [word_features(word, rank, cmu) for _, word, rank in entries],
+        dtype=np.float64
+    ).reshape(len(entries), len(FEATURE_NAMES))
+
+    blob = b"".join(key for key, _, _ in entries)
+    return blob, offsets, ranks, features
+
+
+def _index_exists(index_dir):
+    return all((index_dir / name).exists() for name in (WORDS_FILE, OFFSETS_FILE, RANKS_FILE, FEATURES_FILE))
+
+
+def _build_lock(index_dir):
+    """Inter-process lock serializing builds of one index directory"""
+    index_dir.parent.mkdir(parents=True, exist_ok=True)
+    return filelock.FileLock(str(index_dir.with_name(index_dir.name + ".lock")))
+
+
+def build_word_index(output_dir=WORD_INDEX_DIR):
+    """Write the word rank table as a sorted UTF-8 blob plus offset, rank and feature arrays"""
+    output_dir = Path(output_dir)
+    with _build_lock(output_dir):
+        return _write_word_index(output_dir)
+
+
+def _write_word_index(output_dir):
+    """Build and write the index; the caller holds the build lock"""
+    blob, offsets, ranks, features = _build_index_arrays()
+
+    # Write into a private scratch directory first so readers never see a partial index
+    tmp_dir = Path(tempfile.mkdtemp(prefix=output_dir.name + ".", suffix=".tmp", dir=output_dir.parent))
+    try:
+        with open(tmp_dir / WORDS_FILE, "wb") as f:
+            f.write(blob)
+        np.save(tmp_dir / OFFSETS_FILE, offsets)
+        np.save(tmp_dir / RANKS_FILE, ranks)
+        np.save(tmp_dir / FEATURES_FILE, features)
+
+        shutil.rmtree(output_dir, ignore_errors=True)
+        os.replace(tmp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return output_dir
+
+
+class _SortedWords:
+    """Sequence view over the word blob so bisect can search it in place"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+
+class WordRankIndex:
+    """Read-only word -> frequency rank and complexity feature lookup.
+
+    Opened with ``WordRankIndex.open``, all arrays are mapped from disk, so
+    worker processes share the same pages instead of each holding its own dict.
+    """
+
+    def __init__(self, blob, offsets, ranks, features):
+        self._words = _SortedWords(blob, offsets)
+        self.ranks = ranks
+        self.features = features
+
+    @classmethod
+    def open(cls, index_dir=WORD_INDEX_DIR):
+        """Memory-map an index written by ``build_word_index``"""
+        index_dir = Path(index_dir)
+        with open(index_dir / WORDS_FILE, "rb") as f:
+            # mmap cannot map empty files
+            blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        return cls(
+            blob,
+            np.load(index_dir / OFFSETS_FILE, mmap_mode="r"),
+            np.load(index_dir / RANKS_FILE, mmap_mode="r"),
+            np.load(index_dir / FEATURES_FILE, mmap_mode="r")
+        )
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def find(self, word):
+        """Return the row of ``word`` in the index, or -1 if it is not present"""
+        key = word.encode("utf-8")
+        i = bisect.bisect_left(self._words, key)
+        if i < len(self._words) and self._words[i] == key:
+            return i
+        return -1
+
+    def find_many(self, words):
+        """Return the rows of ``words`` as an array, with -1 for missing words"""
+        return np.fromiter((self.find(word) for word in words), dtype=np.int64, count=len(words))
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    def get(self, word, default=None):
+        i = self.find(word)
+        return int(self.ranks[i]) if i >= 0 else default
+
+
+def load_word_index(index_dir=WORD_INDEX_DIR):
+    """Open the prebuilt word index, building it first if it does not exist yet"""
+    index_dir = Path(index_dir)
+    if not _index_exists(index_dir):
+        try:
+            with _build_lock(index_dir):
+                # Another process may have built it while this one waited for the lock
+                if not _index_exists(index_dir):
+                    print(f"Word index not found at {index_dir}, building it now")
+                    _write_word_index(index_dir)
+        except OSError as e:
+            print(f"Error writing word index: {str(e)}")
+            return WordRankIndex(*_build_index_arrays())
+    return WordRankIndex.open(index_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped word frequency index")
+    parser.add_argument("--output", default=str(WORD_INDEX_DIR), help="Directory to write the index to")
+    args = parser.parse_args()
+    print(f"Word index written to {build_word_index(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Check that importing the app stays cheap.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+fails if the cumulative import time exceeds the budget or if any heavy
+library (models, plotting, UI) is imported eagerly. Run from the
+repository root:
+
+    python scripts/check_import_time.py --budget-ms 1500
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must only be imported when first used
+DEFERRED = [
+    "torch", "transformers", "gradio", "spacy", "nltk", "librosa", "scipy",
+    "matplotlib", "seaborn", "pandas", "plotly", "groq", "speech_recognition"
+]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Return [(cumulative_us, depth, name)] for every import made by ``import module``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            imports.append((int(cumulative), (len(indent) - 1) // 2, name))
+    return imports
+
+
+def analyze(module):
+    """Return (total_ms, eager heavy modules, imports) of ``import module``"""
+    imports = measure(module)
+    total_ms = next(cumulative for cumulative, _, name in imports if name == module) / 1000
+    eager = sorted({name for _, _, name in imports if name.split(".")[0] in DEFERRED})
+    return total_ms, eager, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    total_ms, eager, imports = analyze(args.module)
+
+    print(f"import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print("Slowest top-level imports:")
+    top_level = sorted((item for item in imports if item[1] == 0), reverse=True)
+    for cumulative, _, name in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
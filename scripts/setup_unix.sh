@@ -7,4 +7,7 @@ pip install -r requirements.txt
 python -m spacy download en_core_web_md
 
 # Download required NLTK data
-python -c "import nltk; nltk.download('brown'); nltk.download('gutenberg'); nltk.download('wordnet'); nltk.download('cmudict'); nltk.download('averaged_perceptron_tagger')"
\ No newline at end of file
+python -c "import nltk; nltk.download('brown'); nltk.download('gutenberg'); nltk.download('wordnet'); nltk.download('cmudict'); nltk.download('averaged_perceptron_tagger')"
+
+# Build the word frequency index used by the vocabulary analyzer
+python -m model.word_index
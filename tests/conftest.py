@@ -0,0 +1,119 @@
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class GroqStub:
+    """Local stand-in for the Groq chat completions endpoint.
+
+    Each request takes the next scripted response from ``responses`` (the
+    last one repeats). A response is a dict with optional keys:
+    ``status`` (default 200), ``delay`` (seconds before the headers),
+    ``headers``, ``content`` (full completion text) and, for streamed
+    requests, ``chunks`` sent ``interval`` seconds apart.
+    """
+
+    def __init__(self):
+        self.responses = [{"content": "ok"}]
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append({"time": time.perf_counter(), "body": body})
+                    index = min(len(stub.requests), len(stub.responses)) - 1
+                    response = stub.responses[index]
+                try:
+                    stub._respond(self, body, response)
+                except OSError:
+                    pass  # the client gave up on this request (timeout or hedge loser)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _respond(self, handler, body, response):
+        time.sleep(response.get("delay", 0))
+        status = response.get("status", 200)
+        if status != 200:
+            payload = json.dumps({"error": {"message": f"stub error {status}", "type": "stub_error"}}).encode()
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            for name, value in response.get("headers", {}).items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+
+        if not body.get("stream"):
+            content = response.get("content", "".join(response.get("chunks", [])))
+            payload = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }).encode()
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.end_headers()
+        for i, chunk in enumerate(response.get("chunks", [response.get("content", "")])):
+            if i:
+                time.sleep(response.get("interval", 0))
+            event = {
+                "id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]
+            }
+            handler.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            handler.wfile.flush()
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+@pytest.fixture
+def groq_stub():
+    stub = GroqStub()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def make_client(groq_stub):
+    """Build an LLMClient talking to the stub; retries and hedging are off unless overridden"""
+    for module in ("dotenv", "groq", "httpx"):
+        pytest.importorskip(module)
+    from utils.llm_client import LLMClient, CircuitBreaker
+
+    def make(**kwargs):
+        options = dict(api_key="test-key", base_url=groq_stub.base_url, timeout=5, max_retries=0,
+                       backoff_base=0.01, backoff_max=1, hedge_delay=None,
+                       breaker=CircuitBreaker(failure_threshold=100, reset_timeout=60))
+        options.update(kwargs)
+        return LLMClient(**options)
+
+    return make
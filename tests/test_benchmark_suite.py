@@ -0,0 +1,52 @@
+import json
+import sys
+import pytest
+
+pytest.importorskip("dotenv")
+
+from benchmarks import suite
+
+
+def results(**medians):
+    return {case: {"benchmark": case.split("[")[0], "median": median} for case, median in medians.items()}
+
+
+def run_compare(tmp_path, monkeypatch, baseline, current, *options):
+    paths = {}
+    for name, data in (("baseline", baseline), ("current", current)):
+        paths[name] = tmp_path / f"{name}.json"
+        paths[name].write_text(json.dumps(data))
+    monkeypatch.setattr(sys, "argv", ["suite", "--baseline", str(paths["baseline"]),
+                                      "--current", str(paths["current"]), *options])
+    with pytest.raises(SystemExit) as exit_info:
+        suite.main()
+        raise SystemExit(0)
+    return exit_info.value.code
+
+
+BASELINE = {"results": results(**{"a[1]": 1.0, "a[2]": 2.0, "b[1]": 1.0})}
+
+
+def test_unchanged_results_pass(tmp_path, monkeypatch):
+    current = {"results": BASELINE["results"], "skipped": {}}
+
+    assert run_compare(tmp_path, monkeypatch, BASELINE, current) == 0
+
+
+def test_errored_benchmark_fails(tmp_path, monkeypatch):
+    current = {"results": results(**{"a[1]": 1.0, "a[2]": 2.0}), "skipped": {"b": "model failed to load"}}
+
+    assert run_compare(tmp_path, monkeypatch, BASELINE, current) == 1
+
+
+def test_missing_case_fails(tmp_path, monkeypatch):
+    current = {"results": results(**{"a[1]": 1.0, "b[1]": 1.0}), "skipped": {}}
+
+    assert run_compare(tmp_path, monkeypatch, BASELINE, current) == 1
+
+
+def test_cases_of_unselected_benchmarks_are_not_missing(tmp_path, monkeypatch):
+    monkeypatch.setitem(suite.BENCHMARKS, "a", None)
+    current = {"results": results(**{"a[1]": 1.0, "a[2]": 2.0}), "skipped": {}}
+
+    assert run_compare(tmp_path, monkeypatch, BASELINE, current, "--only", "a") == 0
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+import numpy as np
+
+from model.ctc_decoder import CTCDecoder
+
+VOCAB = {"<pad>": 0, "|": 1, "A": 2, "B": 3, "C": 4}
+
+
+def make_decoder(beam_width=1):
+    tokenizer = SimpleNamespace(
+        get_vocab=lambda: VOCAB, pad_token_id=0, word_delimiter_token="|", all_special_ids=[0]
+    )
+    return CTCDecoder(tokenizer, beam_width=beam_width)
+
+
+def logits(tokens):
+    """One-hot logits spelling ``tokens``, with a blank after each token"""
+    ids = []
+    for token in tokens:
+        ids += [VOCAB[token], 0]
+    frames = np.full((len(ids), len(VOCAB)), -10.0, dtype=np.float32)
+    frames[np.arange(len(ids)), ids] = 10.0
+    return frames
+
+
+def test_runs_are_decoded_separately_and_joined_with_spaces():
+    decoder = make_decoder()
+    # No word delimiter is emitted across the pause between the runs
+    segments = [logits("AB"), logits("C")]
+
+    assert decoder.decode_segments(segments) == "abc"
+    assert decoder.decode_runs(segments, [0, 1]) == "ab c"
+
+
+def test_pieces_of_one_run_are_decoded_as_one_utterance():
+    decoder = make_decoder()
+    # A run cut in the middle of a word, followed by a second run
+    segments = [logits("A"), logits("B"), logits("C")]
+
+    assert decoder.decode_runs(segments, [0, 0, 1]) == "ab c"
+
+
+def test_empty_runs_add_no_spaces():
+    decoder = make_decoder(beam_width=4)
+    segments = [logits("A"), np.zeros((0, len(VOCAB)), dtype=np.float32), logits("B")]
+
+    assert decoder.decode_runs(segments, [0, 1, 2]) == "a b"
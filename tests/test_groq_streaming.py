@@ -0,0 +1,108 @@
+import asyncio
+import time
+import pytest
+
+pytest.importorskip("numpy")
+
+CHUNKS = ["Try ", "saying ", "'I went' ", "instead."]
+
+
+@pytest.fixture
+def processor(make_client):
+    from model.speech_processor import SpeechProcessor
+
+    def make(**kwargs):
+        # Only the Groq client is needed; skip loading the grammar and ASR models
+        processor = SpeechProcessor.__new__(SpeechProcessor)
+        processor.groq_client = make_client(**kwargs)
+        return processor
+
+    return make
+
+
+def test_stream_yields_deltas_in_order(groq_stub, processor):
+    groq_stub.responses = [{"chunks": CHUNKS, "interval": 0.02}]
+
+    deltas = list(processor().stream_groq_feedback("I goes to school"))
+
+    assert deltas == CHUNKS
+    assert groq_stub.requests[0]["body"]["stream"] is True
+
+
+def test_first_token_arrives_before_stream_finishes(groq_stub, processor):
+    groq_stub.responses = [{"chunks": CHUNKS, "interval": 0.3}]
+
+    start = time.perf_counter()
+    arrivals = [time.perf_counter() - start for _ in processor().stream_groq_feedback("I goes to school")]
+
+    # Deltas are passed on as they arrive instead of after the whole answer
+    assert arrivals[0] < 0.3
+    assert arrivals[-1] >= 0.9
+    assert all(later > earlier for earlier, later in zip(arrivals, arrivals[1:]))
+
+
+def test_async_stream_yields_deltas_as_they_arrive(groq_stub, processor):
+    groq_stub.responses = [{"chunks": CHUNKS, "interval": 0.3}]
+    feedback = processor()
+
+    async def collect():
+        start = time.perf_counter()
+        return [(delta, time.perf_counter() - start)
+                async for delta in feedback.astream_groq_feedback("I goes to school")]
+
+    received = asyncio.run(collect())
+
+    assert [delta for delta, _ in received] == CHUNKS
+    assert received[0][1] < 0.3
+    assert received[-1][1] >= 0.9
+
+
+def test_stream_failure_before_first_token_yields_fallback(groq_stub, processor):
+    from model.speech_processor import FEEDBACK_UNAVAILABLE
+
+    groq_stub.responses = [{"status": 500}]
+
+    assert list(processor().stream_groq_feedback("I goes to school")) == [FEEDBACK_UNAVAILABLE]
+
+
+def test_feedback_starts_as_soon_as_transcript_exists(groq_stub, processor, monkeypatch):
+    import main
+    from utils.lazy import LazyModel
+    from utils.result_cache import ResultCache, LRUCache
+
+    monkeypatch.setattr(main, "GROQ_STREAMING", True)
+    groq_stub.responses = [{"chunks": CHUNKS, "interval": 0.05}]
+    feedback_processor = processor()
+
+    app = main.CommunicationAssessmentApp.__new__(main.CommunicationAssessmentApp)
+    app.models = {"speech_processor": LazyModel("speech_processor", lambda: feedback_processor)}
+    app.result_cache = ResultCache()
+    app.chart_cache = LRUCache(4)
+    app.render_charts = lambda results: (None, None)
+    results = {
+        "duration_seconds": 2.0, "transcript": "I goes to school", "mistakes": [],
+        "grammar_issues": "No major issues found", "corrected_text": "I go to school", "feedback": None,
+        "vocabulary": {"lexical_diversity": 1.0, "sophistication": 0.2, "context_appropriateness": 0.5,
+                       "unique_words": []},
+        "pronunciation": {"pronunciation_score": 0.8, "fluency_score": 0.7},
+        "grammar_score": 0.9, "issue_count": 0
+    }
+    scoring_seconds = 1.0
+
+    def assess(on_result):
+        on_result("transcript", results["transcript"])
+        time.sleep(scoring_seconds)  # pronunciation and grammar scoring still running
+        return dict(results)
+
+    async def run():
+        start = time.perf_counter()
+        outputs = [outputs async for outputs in app._respond("test", assess)]
+        return start, outputs
+
+    start, outputs = asyncio.run(run())
+
+    # The Groq request went out while scoring was still running...
+    assert groq_stub.requests[0]["time"] - start < scoring_seconds / 2
+    # ...so the whole suggestion is already there when the scores are shown
+    performance_analysis = outputs[0][1]
+    assert performance_analysis[-1] == ("Improvement Suggestion:", "".join(CHUNKS))
@@ -0,0 +1,22 @@
+import importlib.util
+from pathlib import Path
+import pytest
+
+pytest.importorskip("dotenv")
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "check_import_time.py"
+spec = importlib.util.spec_from_file_location("check_import_time", SCRIPT)
+check_import_time = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(check_import_time)
+
+BUDGET_MS = 1500
+
+
+def test_main_imports_within_budget_without_heavy_modules():
+    total_ms, eager, imports = check_import_time.analyze("main")
+
+    assert total_ms <= BUDGET_MS
+    assert eager == []
+    # groq is installed here, so this also shows that deferral works, not just that packages are missing
+    assert {"torch", "transformers", "gradio", "librosa", "matplotlib", "groq"} <= set(check_import_time.DEFERRED)
+    assert "groq" not in {name for _, _, name in imports}
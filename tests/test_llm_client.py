@@ -0,0 +1,167 @@
+import asyncio
+import time
+import pytest
+
+groq = pytest.importorskip("groq")
+pytest.importorskip("dotenv")
+
+from utils.llm_client import CircuitBreaker, CircuitOpenError
+
+REQUEST = dict(model="stub-model", messages=[{"role": "user", "content": "I goes to school"}])
+
+
+def intervals(stub):
+    times = [request["time"] for request in stub.requests]
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+def test_complete_returns_content(groq_stub, make_client):
+    groq_stub.responses = [{"content": "Say 'I go'."}]
+
+    assert make_client().complete(**REQUEST) == "Say 'I go'."
+    assert len(groq_stub.requests) == 1
+
+
+def test_slow_attempt_times_out_and_is_retried(groq_stub, make_client):
+    groq_stub.responses = [{"delay": 1.0, "content": "slow"}, {"content": "fast"}]
+    client = make_client(timeout=0.2, max_retries=1)
+
+    start = time.perf_counter()
+    assert client.complete(**REQUEST) == "fast"
+    assert time.perf_counter() - start < 1.0
+    assert len(groq_stub.requests) == 2
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_rate_limits_and_server_errors_are_retried(groq_stub, make_client, status):
+    groq_stub.responses = [{"status": status}, {"status": status}, {"content": "ok"}]
+
+    assert make_client(max_retries=2).complete(**REQUEST) == "ok"
+    assert len(groq_stub.requests) == 3
+
+
+def test_retry_after_header_sets_the_delay(groq_stub, make_client):
+    groq_stub.responses = [{"status": 429, "headers": {"Retry-After": "0.5"}}, {"content": "ok"}]
+
+    assert make_client(max_retries=1, backoff_base=0.01).complete(**REQUEST) == "ok"
+    assert intervals(groq_stub)[0] >= 0.5
+
+
+def test_retries_give_up_after_max_retries(groq_stub, make_client):
+    groq_stub.responses = [{"status": 503}]
+
+    with pytest.raises(groq.InternalServerError):
+        make_client(max_retries=2).complete(**REQUEST)
+    assert len(groq_stub.requests) == 3
+
+
+def test_client_errors_are_not_retried(groq_stub, make_client):
+    groq_stub.responses = [{"status": 400}, {"content": "ok"}]
+
+    with pytest.raises(groq.BadRequestError):
+        make_client(max_retries=2).complete(**REQUEST)
+    assert len(groq_stub.requests) == 1
+
+
+def test_hedged_request_wins_over_slow_first_attempt(groq_stub, make_client):
+    groq_stub.responses = [{"delay": 1.5, "content": "slow"}, {"content": "hedged"}]
+    client = make_client(hedge_delay=0.2)
+
+    start = time.perf_counter()
+    assert client.complete(**REQUEST) == "hedged"
+    assert time.perf_counter() - start < 1.0
+    assert len(groq_stub.requests) == 2
+    # Measured from the call: the first attempt may reach the stub late while connecting
+    assert groq_stub.requests[1]["time"] - start >= 0.2
+
+
+def test_no_hedge_when_first_attempt_is_fast(groq_stub, make_client):
+    groq_stub.responses = [{"content": "fast"}]
+
+    assert make_client(hedge_delay=0.5).complete(**REQUEST) == "fast"
+    time.sleep(0.6)
+    assert len(groq_stub.requests) == 1
+
+
+def test_cancelled_call_cancels_both_hedged_attempts(make_client):
+    client = make_client(hedge_delay=0.1)
+    started, cancelled = [], []
+
+    async def hang(request):
+        started.append(request)
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(request)
+            raise
+
+    client._create = hang
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(client.acomplete(**REQUEST), timeout=0.5))
+
+    deadline = time.monotonic() + 5
+    while len(cancelled) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(started) == 2
+    assert len(cancelled) == 2
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(groq_stub, make_client):
+    groq_stub.responses = [{"status": 500}]
+    client = make_client(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    for _ in range(2):
+        with pytest.raises(groq.InternalServerError):
+            client.complete(**REQUEST)
+    with pytest.raises(CircuitOpenError):
+        client.complete(**REQUEST)
+
+    assert client.breaker.state == "open"
+    assert len(groq_stub.requests) == 2
+
+
+def test_breaker_lets_one_trial_through_after_reset_timeout(groq_stub, make_client):
+    groq_stub.responses = [{"status": 500}, {"content": "recovered"}]
+    client = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.3))
+
+    with pytest.raises(groq.InternalServerError):
+        client.complete(**REQUEST)
+    with pytest.raises(CircuitOpenError):
+        client.complete(**REQUEST)
+
+    time.sleep(0.35)
+    assert client.breaker.state == "half-open"
+    assert client.complete(**REQUEST) == "recovered"
+    assert client.breaker.state == "closed"
+    assert len(groq_stub.requests) == 2
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.1)
+    for _ in range(3):
+        breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow()
+    # Only one trial at a time while half-open
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_client_errors_do_not_trip_breaker(groq_stub, make_client):
+    groq_stub.responses = [{"status": 400}]
+    client = make_client(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+    for _ in range(2):
+        with pytest.raises(groq.BadRequestError):
+            client.complete(**REQUEST)
+    assert client.breaker.state == "closed"
+
+
+def test_stream_open_is_retried(groq_stub, make_client):
+    groq_stub.responses = [{"status": 503}, {"chunks": ["a", "b"]}]
+
+    assert list(make_client(max_retries=1).stream(**REQUEST)) == ["a", "b"]
+    assert len(groq_stub.requests) == 2
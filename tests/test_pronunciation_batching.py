@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("dotenv")
+
+from model.pronunciation_analyzer import PronunciationAnalyzer
+
+
+class GroupNormModel:
+    """Stand-in acoustic model whose output, like group norm, depends on the whole padded row"""
+
+    def __init__(self, feat_extract_norm):
+        self.config = SimpleNamespace(feat_extract_norm=feat_extract_norm, conv_kernel=[400], conv_stride=[320])
+        self.batches = []
+
+    def __call__(self, batch, attention_mask=None):
+        self.batches.append(batch.shape)
+        frames = (batch.shape[1] - 400) // 320 + 1
+        row_level = batch.mean(axis=1, keepdims=True)
+        logits = np.zeros((len(batch), frames, 3), dtype=np.float32)
+        logits[:, :, 0] = row_level
+        return logits
+
+
+def make_analyzer(feat_extract_norm):
+    analyzer = PronunciationAnalyzer.__new__(PronunciationAnalyzer)
+    analyzer.backend = "onnx"
+    analyzer.model = GroupNormModel(feat_extract_norm)
+    analyzer.processor = lambda segment, **kwargs: SimpleNamespace(input_values=np.asarray(segment)[None])
+    return analyzer
+
+
+def segments():
+    rng = np.random.default_rng(0)
+    return [rng.uniform(0.5, 1.0, length).astype(np.float32) for length in (1600, 1000, 1600, 1000, 700)]
+
+
+def test_unmasked_model_only_batches_equal_lengths():
+    analyzer = make_analyzer("group")
+    audio = segments()
+
+    batched = analyzer._process_segments(audio, stress=[0.0] * len(audio))
+    single = [analyzer._process_segments([segment], stress=[0.0])[0] for segment in audio]
+
+    assert sorted(analyzer.model.batches[:3]) == [(1, 700), (2, 1000), (2, 1600)]
+    for together, alone in zip(batched, single):
+        assert together["confidence"] == pytest.approx(alone["confidence"])
+        np.testing.assert_allclose(together["logits"], alone["logits"])
+
+
+def test_masked_model_pads_mixed_lengths_together():
+    analyzer = make_analyzer("layer")
+    audio = segments()
+
+    analyzer._process_segments(audio, stress=[0.0] * len(audio))
+
+    # Batches of PRONUNCIATION_BATCH_SIZE (4), longest first
+    assert analyzer.model.batches == [(4, 1600), (1, 700)]
+
+
+def test_tiny_tail_is_merged_into_previous_segment():
+    analyzer = make_analyzer("group")
+    length = 2 * 5 * 16000 + 100
+
+    bounds = analyzer._segment_bounds(length)
+
+    assert bounds == [(0, 80000), (80000, length)]
+
+
+def test_segment_shorter_than_receptive_field_gets_finite_confidence():
+    analyzer = make_analyzer("layer")
+    audio = segments()[:1] + [np.full(300, 0.5, dtype=np.float32)]
+
+    results = analyzer._process_segments(audio, stress=[0.0, 0.0])
+
+    assert analyzer._frame_lengths([300]) == [1]
+    assert all(np.isfinite(result["confidence"]) for result in results)
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils.report_generator import ReportGenerator, _as_raw, _scores
+
+RAW = {
+    "pronunciation": {"pronunciation_score": 0.8, "fluency_score": 0.6, "confidence_scores": 0.9},
+    "grammar_score": 0.7,
+    "vocabulary": {"lexical_diversity": 0.5, "unique_words": ["apple", "pear"]},
+    "corrected_text": "Fixed text."
+}
+
+FLAT = {
+    "pronunciation_score": 0.8,
+    "grammar_score": 0.7,
+    "vocabulary_score": 0.4,
+    "fluency_score": 0.6,
+    "grammar_feedback": "Fixed text.",
+    "vocabulary_analysis": {"lexical_diversity": 0.5, "unique_words": 2},
+    "pronunciation_analysis": {"confidence_scores": 0.9}
+}
+
+
+def test_raw_results_are_used_as_they_are():
+    assert _as_raw(RAW) is RAW
+    assert _scores(RAW) == [0.8, 0.7, 0.5, 0.6]
+
+
+def test_flat_schema_is_still_accepted():
+    raw = _as_raw(FLAT)
+
+    assert _scores(raw) == [0.8, 0.7, 0.4, 0.6]
+    assert raw["vocabulary"]["lexical_diversity"] == 0.5
+    assert raw["pronunciation"]["confidence_scores"] == 0.9
+    assert raw["corrected_text"] == "Fixed text."
+
+
+def test_text_report_from_flat_schema(tmp_path):
+    generator = ReportGenerator(output_dir=tmp_path)
+
+    generator._generate_text_report(_as_raw(FLAT), tmp_path)
+
+    report = (tmp_path / "detailed_report.txt").read_text()
+    assert "- Vocabulary: 0.40" in report
+    assert "- Unique words: 2" in report
+    assert "Fixed text." in report
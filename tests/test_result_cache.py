@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils.result_cache import DiskCache, ResultCache, MISS, config_fingerprint
+
+
+def test_disk_cache_overwrite_replaces_entry_size(tmp_path):
+    cache = DiskCache(tmp_path, ttl=60, max_bytes=10 ** 6)
+
+    cache.set("key", "x" * 1000)
+    cache.set("key", "x" * 10)
+
+    assert cache._size == sum(path.stat().st_size for path in tmp_path.glob("*.pkl"))
+
+
+def test_entries_are_not_shared_across_configurations(tmp_path):
+    torch = ResultCache(disk_dir=tmp_path, fingerprint=config_fingerprint(inference_backend="torch"))
+    onnx = ResultCache(disk_dir=tmp_path, fingerprint=config_fingerprint(inference_backend="onnx"))
+
+    torch.set("pronunciation", "audio", {"pronunciation_score": 0.8})
+
+    assert onnx.get("pronunciation", "audio") is MISS
+    assert ResultCache(disk_dir=tmp_path, fingerprint=torch.fingerprint).get("pronunciation", "audio") == {
+        "pronunciation_score": 0.8
+    }
+
+
+def test_fallback_results_are_not_cached():
+    from model.speech_processor import UncheckedText
+
+    cache = ResultCache(disk_dir=None)
+    results = iter([UncheckedText(([], "i goes")), (["'goes' → 'go'"], "i go")])
+    grammar = cache.wrap("grammar", lambda text: next(results),
+                         cache_if=lambda value: not isinstance(value, UncheckedText))
+
+    assert grammar("key", "i goes") == ([], "i goes")
+    assert grammar("key", "i goes") == (["'goes' → 'go'"], "i go")
+    assert grammar("key", "i goes") == (["'goes' → 'go'"], "i go")
@@ -0,0 +1,104 @@
+import os
+import time
+import wave
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils import scheduler
+
+
+def init_worker(asr_backend, threads, ready, startup_errors):
+    with ready.get_lock():
+        ready.value += 1
+
+
+def fail_to_load():
+    raise OSError("model files missing")
+
+
+def init_worker_with_failing_models(asr_backend, threads, ready, startup_errors):
+    """The real initializer, in a worker whose model factories all raise"""
+    import main
+    for name in ("SpeechProcessor", "VocabularyAnalyzer", "PronunciationAnalyzer"):
+        setattr(main, name, fail_to_load)
+    scheduler._init_worker(asr_backend, threads, ready, startup_errors)
+
+
+def run_job(audio_path, include_feedback):
+    if os.path.basename(audio_path).startswith("crash"):
+        os._exit(1)  # like an OOM kill or a segfault
+    return {"file": os.path.basename(audio_path)}, None, scheduler.metrics.drain()
+
+
+def write_wav(path, seconds=0.1, rate=16000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\0\0" * int(seconds * rate))
+    return str(path)
+
+
+def wait_until(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def make_scheduler(monkeypatch):
+    schedulers = []
+
+    def make(initializer=init_worker, workers=2):
+        monkeypatch.setattr(scheduler, "_init_worker", initializer)
+        monkeypatch.setattr(scheduler, "_run_job", run_job)
+        instance = scheduler.InferenceScheduler(workers=workers, threads=1, max_queue=8, admission_timeout=0)
+        schedulers.append(instance)
+        return instance
+
+    yield make
+    for instance in schedulers:
+        instance.shutdown()
+
+
+def test_jobs_run_once_workers_are_ready(make_scheduler, tmp_path):
+    jobs = make_scheduler()
+    wait_until(jobs.is_ready)
+
+    futures = [jobs.submit(write_wav(tmp_path / f"clip{i}.wav")) for i in range(3)]
+
+    assert [future.result(timeout=30) for future in futures] == [{"file": f"clip{i}.wav"} for i in range(3)]
+    assert jobs.status()["running"] == 0
+
+
+def test_dead_worker_fails_its_job_and_pool_is_replaced(make_scheduler, tmp_path):
+    jobs = make_scheduler()
+    wait_until(jobs.is_ready)
+
+    crashed = jobs.submit(write_wav(tmp_path / "crash.wav"))
+    with pytest.raises(BrokenProcessPool):
+        crashed.result(timeout=30)
+
+    # The slot is released and later jobs run on the new pool
+    assert jobs.status()["running"] == 0
+    assert jobs.submit(write_wav(tmp_path / "clip.wav")).result(timeout=30) == {"file": "clip.wav"}
+    wait_until(jobs.is_ready)
+
+
+def test_worker_startup_failure_is_reported(make_scheduler, tmp_path):
+    pytest.importorskip("groq")
+    jobs = make_scheduler(initializer=init_worker_with_failing_models, workers=1)
+
+    wait_until(lambda: jobs.status()["error"] is not None, timeout=60)
+
+    error = jobs.status()["error"]
+    assert error.startswith("RuntimeError: Models failed to load")
+    for model in ("speech_processor", "vocabulary_analyzer", "pronunciation_analyzer"):
+        assert f"{model}: model files missing" in error
+    assert not jobs.is_ready()
+    with pytest.raises(scheduler.WorkerStartupError):
+        jobs.submit(write_wav(tmp_path / "clip.wav"))
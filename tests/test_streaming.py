@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+pytest.importorskip("dotenv")
+
+from config.settings import SAMPLE_RATE
+from model.ctc_decoder import CTCDecoder
+from model.frame_features import FrameFeatures, FRAME_SECONDS, HOP_SECONDS
+from model.streaming import StreamingSession
+
+VOCAB = {"<pad>": 0, "|": 1, "A": 2, "B": 3}
+
+
+class FakeAnalyzer:
+    """Acoustic model stand-in: every segment spells "AB" without a word delimiter"""
+
+    def __init__(self):
+        tokenizer = SimpleNamespace(get_vocab=lambda: VOCAB, pad_token_id=0, word_delimiter_token="|",
+                                    all_special_ids=[0])
+        self.decoder = CTCDecoder(tokenizer)
+        self.segments = []
+
+    def _process_segments(self, segments, stress):
+        self.segments += [len(segment) for segment in segments]
+        logits = np.full((4, len(VOCAB)), -10.0, dtype=np.float32)
+        logits[np.arange(4), [2, 0, 3, 0]] = 10.0
+        return [{"confidence": 1.0, "stress": score, "logits": logits} for score in stress]
+
+    def _calculate_overall_score(self, confidence, stress):
+        return confidence
+
+    def _calculate_fluency(self, waveform, features=None, vad=None):
+        return 1.0
+
+
+def make_session(monkeypatch):
+    monkeypatch.setattr(FrameFeatures, "stress", lambda self, start=0, end=None: 0.0)
+    speech = SimpleNamespace(analyze_text=lambda text: ([], text))
+    vocabulary = SimpleNamespace(analyze_vocabulary=lambda text: {"lexical_diversity": 1.0})
+    return StreamingSession(FakeAnalyzer(), speech, vocabulary)
+
+
+def centered_rms(waveform):
+    """librosa.feature.rms with its defaults (center=True, zero padding)"""
+    frame_length = int(SAMPLE_RATE * FRAME_SECONDS)
+    hop_length = int(SAMPLE_RATE * HOP_SECONDS)
+    padded = np.pad(waveform, frame_length // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length]
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+def speech(seconds, rng):
+    return rng.uniform(-0.5, 0.5, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+
+def feed(session, waveform, chunk_seconds=0.37):
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    for start in range(0, len(waveform), chunk):
+        session.add_chunk(SAMPLE_RATE, waveform[start:start + chunk])
+
+
+def test_incremental_energy_matches_centered_rms(monkeypatch):
+    rng = np.random.default_rng(0)
+    waveform = speech(2.3, rng)
+    session = make_session(monkeypatch)
+
+    feed(session, waveform)
+    session.finish()
+
+    np.testing.assert_allclose(session._energy, centered_rms(waveform), rtol=1e-5, atol=1e-7)
+
+
+def test_incremental_energy_matches_librosa(monkeypatch):
+    librosa = pytest.importorskip("librosa")
+    rng = np.random.default_rng(1)
+    waveform = speech(1.1, rng)
+    session = make_session(monkeypatch)
+
+    feed(session, waveform)
+    session.finish()
+
+    np.testing.assert_allclose(session._energy, FrameFeatures(waveform).energy, rtol=1e-5, atol=1e-7)
+
+
+def test_long_run_split_across_chunks_stays_one_word(monkeypatch):
+    rng = np.random.default_rng(2)
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    # A 15 s run is cut in two at VAD_MAX_SEGMENT_SECONDS, then a pause and a short run
+    waveform = np.concatenate([speech(15, rng), silence, speech(1, rng), silence])
+    session = make_session(monkeypatch)
+
+    feed(session, waveform)
+    result = session.finish()
+
+    assert len(session.pronunciation_analyzer.segments) == 3
+    assert result["transcript"] == "abab ab"
+
+
+def test_microphone_chunks_are_scaled_like_decoded_uploads():
+    from utils.audio_io import to_mono_float
+
+    pcm = np.array([-32768, 0, 16384, 32767], dtype=np.int16)
+
+    np.testing.assert_array_equal(to_mono_float(pcm), [-1.0, 0.0, 0.5, 32767 / 32768])
+    np.testing.assert_array_equal(to_mono_float(np.stack([pcm, pcm], axis=1)), to_mono_float(pcm))
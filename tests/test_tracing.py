@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils import tracing
+from utils.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(tracing, "metrics", registry)
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    return registry
+
+
+def requests_total(registry):
+    counters = registry.snapshot()["counters"]
+    return {key: value for key, value in counters.items() if key.startswith("requests_total")}
+
+
+def test_nested_request_is_counted_once_without_tracing(registry):
+    with tracing.request("api.assess"):
+        with tracing.request("assess"):
+            pass
+
+    assert requests_total(registry) == {'requests_total{handler="api.assess"}': 1}
+
+
+def test_request_in_executor_job_is_part_of_outer_request(registry):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def assess():
+            with tracing.request("assess"):
+                pass
+
+        # The way process_input runs the pipeline, and the API its batch jobs
+        executor.submit(tracing.run_in_trace, None, assess).result()
+        with tracing.request("api.assess"):
+            executor.submit(contextvars.copy_context().run, assess).result()
+
+    assert requests_total(registry) == {'requests_total{handler="api.assess"}': 1}
+
+
+def test_separate_requests_are_each_counted(registry):
+    for _ in range(2):
+        with tracing.request("assess"):
+            pass
+
+    assert requests_total(registry) == {'requests_total{handler="assess"}': 2}
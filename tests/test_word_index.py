@@ -0,0 +1,45 @@
+import threading
+import time
+import numpy as np
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("filelock")
+
+from model import word_index
+
+
+def small_index_arrays():
+    time.sleep(0.2)  # long enough for concurrent loaders to overlap
+    words = [b"apple", b"banana", b"cherry"]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    offsets[1:] = np.cumsum([len(word) for word in words])
+    ranks = np.array([3, 1, 2], dtype=np.uint32)
+    features = np.zeros((len(words), len(word_index.FEATURE_NAMES)))
+    return b"".join(words), offsets, ranks, features
+
+
+def test_concurrent_loads_build_the_index_once(tmp_path, monkeypatch):
+    builds = []
+
+    def build():
+        builds.append(threading.get_ident())
+        return small_index_arrays()
+
+    monkeypatch.setattr(word_index, "_build_index_arrays", build)
+    index_dir = tmp_path / "index"
+    indexes = [None] * 4
+
+    def load(i):
+        indexes[i] = word_index.load_word_index(index_dir)
+
+    threads = [threading.Thread(target=load, args=(i,)) for i in range(len(indexes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(len(index) == 3 for index in indexes)
+    # No scratch directories are left behind
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index", "index.lock"]
@@ -0,0 +1,179 @@
+import os
+import struct
+import numpy as np
+from config.settings import SAMPLE_RATE, MAX_AUDIO_LENGTH, AUDIO_BLOCK_SECONDS
+from utils.lazy_import import lazy_import
+
+# Decoders are imported on first use
+sf = lazy_import("soundfile")
+soxr = lazy_import("soxr")
+librosa = lazy_import("librosa")
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+WAV_DTYPES = {
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4")
+}
+
+
+class AudioTooLongError(ValueError):
+    """Raised before decoding when a recording is longer than the allowed duration"""
+
+    def __init__(self, duration, max_seconds):
+        super().__init__(f"Audio is {duration:.0f}s long; the limit is {max_seconds:.0f}s")
+        self.duration = duration
+        self.max_seconds = max_seconds
+
+    def __reduce__(self):
+        # Rebuilt from the original arguments when sent back from a worker process
+        return type(self), (self.duration, self.max_seconds)
+
+
+def check_duration(duration, max_seconds):
+    if max_seconds is not None and duration > max_seconds:
+        raise AudioTooLongError(duration, max_seconds)
+
+
+def _wav_layout(audio_path):
+    """Locate the samples of an uncompressed WAV file.
+
+    Returns (data offset, frames, channels, dtype, sample rate), or None if
+    the file is not a WAV file with 16/32-bit integer or 32-bit float samples.
+    """
+    try:
+        f = open(audio_path, "rb")
+    except (OSError, TypeError):
+        return None
+    with f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                data = f.read(size + (size & 1))
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", data[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                    tag = struct.unpack("<H", data[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                tag, channels, rate, bits = fmt
+                dtype = WAV_DTYPES.get((tag, bits))
+                if dtype is None or not channels or not rate:
+                    return None
+                offset = f.tell()
+                # Streamed WAVs may leave the size unset; the rest of the file is then data
+                available = os.fstat(f.fileno()).st_size - offset
+                size = available if size in (0, 0xFFFFFFFF) else min(size, available)
+                return offset, size // (dtype.itemsize * channels), channels, dtype, rate
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def audio_duration(audio_path):
+    """Duration in seconds of an audio file, read from its header without decoding"""
+    layout = _wav_layout(audio_path)
+    if layout is not None:
+        _, frames, _, _, rate = layout
+        return frames / rate
+    try:
+        info = sf.info(audio_path)
+    except RuntimeError:
+        return librosa.get_duration(path=audio_path)
+    return info.frames / info.samplerate
+
+
+def to_mono_float(block):
+    """Mix PCM samples, mono or a (frames, channels) block, down to mono float32 in [-1, 1].
+
+    Integer samples are scaled by the magnitude of the type's minimum
+    (32768 for int16), the same convention as soundfile and librosa.
+    """
+    block = np.asarray(block)
+    if np.issubdtype(block.dtype, np.integer):
+        block = block.astype(np.float32) / -np.iinfo(block.dtype).min
+    if block.ndim == 1:
+        return np.asarray(block, dtype=np.float32)
+    if block.shape[1] == 1:
+        return np.asarray(block[:, 0], dtype=np.float32)
+    return block.mean(axis=1, dtype=np.float32)
+
+
+def _decode_blocks(blocks, frames, input_rate, sample_rate):
+    """Mix down and resample blocks of audio into one preallocated mono buffer"""
+    capacity = int(np.ceil(frames * sample_rate / input_rate)) + sample_rate
+    waveform = np.empty(capacity, dtype=np.float32)
+    resampler = soxr.ResampleStream(input_rate, sample_rate, 1, dtype="float32") if input_rate != sample_rate else None
+    length = 0
+
+    def write(samples):
+        nonlocal waveform, length
+        if length + len(samples) > len(waveform):
+            # Frame counts from compressed headers can be slightly off
+            waveform = np.concatenate([waveform, np.empty(len(samples) + sample_rate, dtype=np.float32)])
+        waveform[length:length + len(samples)] = samples
+        length += len(samples)
+
+    for block in blocks:
+        mono = to_mono_float(block)
+        write(resampler.resample_chunk(mono, last=False) if resampler else mono)
+    if resampler:
+        write(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+    return waveform[:length]
+
+
+def load_audio(audio_path, sample_rate=SAMPLE_RATE, max_seconds=MAX_AUDIO_LENGTH):
+    """Decode an audio file once into a read-only mono float32 buffer.
+
+    The duration is read from the file header first, and recordings longer
+    than ``max_seconds`` raise AudioTooLongError before anything is decoded.
+    Uncompressed WAV files are memory-mapped; a mono float32 WAV already at
+    ``sample_rate`` is returned as the read-only map itself. Everything else
+    is decoded, mixed down and resampled block by block into one buffer, so
+    peak memory is bounded by the duration cap rather than the upload size.
+    """
+    block_seconds = AUDIO_BLOCK_SECONDS
+    layout = _wav_layout(audio_path)
+    if layout is not None:
+        offset, frames, channels, dtype, rate = layout
+        check_duration(frames / rate, max_seconds)
+        samples = np.memmap(audio_path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+        if rate == sample_rate and channels == 1 and dtype == np.float32:
+            return samples[:, 0]
+        block = int(rate * block_seconds)
+        waveform = _decode_blocks(
+            (samples[start:start + block] for start in range(0, frames, block)), frames, rate, sample_rate
+        )
+    else:
+        try:
+            info = sf.info(audio_path)
+        except RuntimeError:
+            # Format not supported by libsndfile (e.g. some compressed uploads)
+            info = None
+
+        if info is not None:
+            check_duration(info.frames / info.samplerate, max_seconds)
+            blocks = sf.blocks(audio_path, blocksize=int(info.samplerate * block_seconds),
+                               dtype="float32", always_2d=True)
+            waveform = _decode_blocks(blocks, info.frames, info.samplerate, sample_rate)
+        else:
+            check_duration(librosa.get_duration(path=audio_path), max_seconds)
+            waveform, _ = librosa.load(audio_path, sr=sample_rate, duration=max_seconds)
+
+    waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+    waveform.flags.writeable = False
+    return waveform
+
+
+def to_pcm16(waveform):
+    """Convert a float waveform in [-1, 1] to little-endian 16-bit PCM bytes"""
+    return (np.clip(waveform, -1.0, 1.0) * 32767).astype("<i2").tobytes()
@@ -0,0 +1,16 @@
+import json
+import numpy as np
+
+
+def to_json(value):
+    """``json.dumps`` default hook: numpy scalars and arrays become plain Python values"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """Serialize assessment results, which may contain numpy values, to JSON"""
+    return json.dumps(payload, default=to_json)
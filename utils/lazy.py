@@ -0,0 +1,63 @@
+import threading
+import time
+from utils.metrics import metrics
+
+
+class LazyModel:
+    """Thread-safe handle that builds a model on first use.
+
+    Concurrent callers wait for a single load instead of each building their
+    own copy. A failed load is not cached, so the next caller retries it.
+    """
+
+    def __init__(self, name, factory, warmup=None):
+        self.name = name
+        self.factory = factory
+        self.warmup = warmup
+        self._lock = threading.Lock()
+        self._instance = None
+        self.warmed = False
+        self.load_seconds = None
+        self.error = None
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def get(self):
+        """Return the model, loading it if this is the first use"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                start = time.perf_counter()
+                try:
+                    self._instance = self.factory()
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.error = None
+                self.load_seconds = time.perf_counter() - start
+                metrics.observe("model_load_seconds", self.load_seconds)
+                print(f"Loaded {self.name} in {self.load_seconds:.1f}s")
+            return self._instance
+
+    def warm_up(self):
+        """Load the model and run its dummy inference once"""
+        instance = self.get()
+        if self.warmup is not None and not self.warmed:
+            try:
+                self.warmup(instance)
+            except Exception as e:
+                print(f"Error warming up {self.name}: {str(e)}")
+                return
+        self.warmed = True
+
+    def status(self):
+        return {
+            "loaded": self.loaded,
+            "warmed": self.warmed,
+            "load_seconds": self.load_seconds,
+            "error": self.error
+        }
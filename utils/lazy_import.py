@@ -0,0 +1,30 @@
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is only imported on first attribute access.
+
+    After the first access the real module's namespace is copied in, so later
+    lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def _load(self):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        # Only called for names not yet in the namespace
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """Return a module proxy for ``name`` that defers the actual import until it is used"""
+    return LazyModule(name)
@@ -0,0 +1,287 @@
+import asyncio
+import queue
+import random
+import threading
+import time
+from config.settings import (
+    GROQ_API_KEY, GROQ_BASE_URL, GROQ_TIMEOUT, GROQ_MAX_RETRIES, GROQ_BACKOFF_BASE,
+    GROQ_BACKOFF_MAX, GROQ_HEDGE_DELAY, GROQ_MAX_CONNECTIONS, GROQ_BREAKER_FAILURES,
+    GROQ_BREAKER_RESET
+)
+from utils.metrics import metrics
+from utils.lazy_import import lazy_import
+
+# The HTTP and SDK stack is imported when the first client is created
+httpx = lazy_import("httpx")
+groq = lazy_import("groq")
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Stop calling a failing upstream for a while after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds; then a single trial call is
+    let through (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """Return True if a call may be attempted now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                metrics.increment("groq_circuit_opened_total")
+            self._trial_in_flight = False
+
+    def release(self):
+        """Forget a call that ended without an outcome (e.g. it was cancelled)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def _is_retryable(error):
+    """Timeouts, connection errors, rate limits and server errors are worth retrying"""
+    if isinstance(error, (groq.APITimeoutError, groq.APIConnectionError)):
+        return True
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error):
+    """Seconds requested by a Retry-After header, if any"""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class LLMClient:
+    """Shared Groq chat client running on its own event loop.
+
+    One pooled HTTP connection set serves every caller. Requests get a
+    per-attempt timeout, retries with jittered exponential backoff, an
+    optional hedged duplicate after ``hedge_delay`` seconds, and a circuit
+    breaker so an unavailable upstream fails fast. Both blocking methods
+    (``complete``, ``stream``) and awaitables usable from any event loop
+    (``acomplete``, ``astream``) are provided.
+    """
+
+    def __init__(self, api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL, timeout=GROQ_TIMEOUT,
+                 max_retries=GROQ_MAX_RETRIES, backoff_base=GROQ_BACKOFF_BASE,
+                 backoff_max=GROQ_BACKOFF_MAX, hedge_delay=GROQ_HEDGE_DELAY,
+                 max_connections=GROQ_MAX_CONNECTIONS, breaker=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_delay = hedge_delay
+        self.breaker = breaker or CircuitBreaker(GROQ_BREAKER_FAILURES, GROQ_BREAKER_RESET)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout)
+        )
+        # Retries are handled here, not by the SDK
+        self._client = groq.AsyncGroq(
+            api_key=api_key, base_url=base_url, http_client=http_client,
+            timeout=timeout, max_retries=0
+        )
+
+    # Blocking and cross-loop entry points
+
+    def complete(self, **request):
+        """Return the completion text for a chat request, blocking the caller"""
+        return asyncio.run_coroutine_threadsafe(self._complete(request), self._loop).result()
+
+    async def acomplete(self, **request):
+        """Awaitable ``complete`` that can be used from any event loop"""
+        future = asyncio.run_coroutine_threadsafe(self._complete(request), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def stream(self, **request):
+        """Yield completion text deltas, blocking the caller between deltas"""
+        items = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump(request, items.put), self._loop)
+        try:
+            while True:
+                kind, value = items.get()
+                if kind == "delta":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    async def astream(self, **request):
+        """Async generator of completion text deltas usable from any event loop"""
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        push = lambda item: loop.call_soon_threadsafe(items.put_nowait, item)
+        future = asyncio.run_coroutine_threadsafe(self._pump(request, push), self._loop)
+        try:
+            while True:
+                kind, value = await items.get()
+                if kind == "delta":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    # Coroutines running on the client loop
+
+    async def _complete(self, request):
+        return await self._with_retries(lambda: self._hedged(request))
+
+    async def _call_upstream(self, call):
+        """Single API attempt, guarded by and feeding the circuit breaker"""
+        if not self.breaker.allow():
+            metrics.increment("groq_circuit_rejected_total")
+            raise CircuitOpenError("Groq circuit breaker is open")
+        metrics.increment("groq_requests_total")
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            # Client errors (bad request, auth) mean the upstream itself is healthy
+            if _is_retryable(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _create(self, request):
+        start = time.perf_counter()
+        response = await self._call_upstream(
+            lambda: self._client.chat.completions.create(**request, stream=False)
+        )
+        metrics.observe("groq_request_seconds", time.perf_counter() - start)
+        if response.usage is not None:
+            metrics.increment("groq_completion_tokens_total", response.usage.completion_tokens)
+        return response.choices[0].message.content
+
+    async def _hedged(self, request):
+        """Send a duplicate request if the first is slower than hedge_delay; first success wins"""
+        first = asyncio.ensure_future(self._create(request))
+        if not self.hedge_delay:
+            return await first
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if done:
+                return first.result()
+
+            metrics.increment("groq_hedged_requests_total")
+            pending.add(asyncio.ensure_future(self._create(request)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also reached when the caller is cancelled; no attempt may outlive it
+            for task in pending:
+                task.cancel()
+
+    async def _with_retries(self, attempt):
+        """Run ``attempt`` until it succeeds, retrying transient errors with jittered backoff"""
+        for retry in range(self.max_retries + 1):
+            try:
+                return await attempt()
+            except Exception as e:
+                if retry == self.max_retries or not _is_retryable(e):
+                    metrics.increment("groq_failures_total")
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    # Full jitter: uniform over the exponential backoff window
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** retry))
+                metrics.increment("groq_retries_total")
+                await asyncio.sleep(min(delay, self.backoff_max))
+
+    async def _open_stream(self, request):
+        return await self._call_upstream(
+            lambda: self._client.chat.completions.create(**request, stream=True)
+        )
+
+    async def _pump(self, request, push):
+        """Stream deltas into ``push``; only opening the stream is retried, never a partial answer"""
+        try:
+            stream = await self._with_retries(lambda: self._open_stream(request))
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        push(("delta", chunk.choices[0].delta.content))
+                    # Groq reports usage on the final chunk
+                    usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                    if usage is not None:
+                        metrics.increment("groq_completion_tokens_total", usage.completion_tokens)
+            finally:
+                await stream.close()
+            push(("done", None))
+        except Exception as e:
+            push(("error", e))
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Return the process-wide LLM client, creating it on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = LLMClient()
+        return _shared_client
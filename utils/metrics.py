@@ -0,0 +1,155 @@
+import math
+import threading
+from config.settings import METRICS_ENABLED
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, math.inf)
+
+
+def metric_key(name, labels=None):
+    """Registry key for a metric with optional labels, in Prometheus notation"""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _split_key(key):
+    name, _, labels = key.partition("{")
+    return name, labels.rstrip("}")
+
+
+def _format_value(value):
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class MetricsRegistry:
+    """Thread-safe in-process counters, gauges and value summaries.
+
+    Every call is a no-op when the registry is disabled, so instrumented
+    code costs next to nothing with metrics turned off.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._summaries = {}
+
+    def increment(self, name, value=1, labels=None):
+        """Add ``value`` to a counter"""
+        if not self.enabled:
+            return
+        key = metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, labels=None):
+        """Set a gauge to its current value (e.g. a queue depth)"""
+        if not self.enabled:
+            return
+        key = metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, labels=None):
+        """Record one observation (e.g. a latency in seconds)"""
+        if not self.enabled:
+            return
+        key = metric_key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = {
+                    "count": 0, "sum": 0.0, "max": 0.0, "last": 0.0, "buckets": [0] * len(LATENCY_BUCKETS)
+                }
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    summary["buckets"][i] += 1
+                    break
+
+    def drain(self):
+        """Return and reset the counters and summaries recorded so far, e.g. to ship them to another process"""
+        with self._lock:
+            drained = {"counters": self._counters, "summaries": self._summaries}
+            self._counters = {}
+            self._summaries = {}
+        return drained
+
+    def merge(self, drained):
+        """Add counters and summaries returned by ``drain`` in another process"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for key, value in drained["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, other in drained["summaries"].items():
+                summary = self._summaries.get(key)
+                if summary is None:
+                    self._summaries[key] = dict(other, buckets=list(other["buckets"]))
+                    continue
+                summary["count"] += other["count"]
+                summary["sum"] += other["sum"]
+                summary["max"] = max(summary["max"], other["max"])
+                summary["last"] = other["last"]
+                summary["buckets"] = [a + b for a, b in zip(summary["buckets"], other["buckets"])]
+
+    def snapshot(self):
+        """Return a copy of all counters, gauges and summaries"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    key: {k: v for k, v in summary.items() if k != "buckets"}
+                    for key, summary in self._summaries.items()
+                }
+            }
+
+    def render_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            summaries = {key: dict(summary, buckets=list(summary["buckets"]))
+                         for key, summary in self._summaries.items()}
+
+        lines = []
+        typed = set()
+        for key in sorted(counters):
+            name, labels = _split_key(key)
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{key} {_format_value(counters[key])}")
+
+        for key in sorted(gauges):
+            name, labels = _split_key(key)
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{key} {_format_value(gauges[key])}")
+
+        for key in sorted(summaries):
+            name, labels = _split_key(key)
+            summary = summaries[key]
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, summary["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}')
+            suffix = "{" + labels + "}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {_format_value(summary['sum'])}")
+            lines.append(f"{name}_count{suffix} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by all components
+metrics = MetricsRegistry(enabled=METRICS_ENABLED)
@@ -0,0 +1,110 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.tracing import span
+
+_NO_FALLBACK = object()
+
+
+class StageTimeoutError(Exception):
+    """Raised when a pipeline stage does not finish within its timeout"""
+
+
+class Stage:
+    def __init__(self, name, fn, depends_on=(), timeout=None, fallback=_NO_FALLBACK):
+        """A unit of work that runs once all of its dependencies have resolved.
+
+        ``fn`` receives the values of ``depends_on`` as positional arguments, in
+        the order they are listed. If the stage fails or times out and a
+        ``fallback`` is given, dependents receive the fallback value instead.
+        """
+        self.name = name
+        self.fn = fn
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+class StagePipeline:
+    def __init__(self, stages, executor=None, max_workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers or len(self.stages))
+
+    def run(self, on_result=None, **inputs):
+        """Run all stages, starting each one as soon as its dependencies are ready.
+
+        Returns ``(results, errors)``: stage/input name -> value, and
+        stage name -> exception for every stage that failed, timed out or was
+        skipped because a dependency had no value. ``on_result(name, value)``,
+        if given, is called as each stage succeeds, so callers can start
+        follow-up work before the rest of the pipeline has finished.
+        """
+        results = dict(inputs)
+        errors = {}
+        pending = dict(self.stages)
+        running = {}
+
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.depends_on):
+                        args = [results[dep] for dep in stage.depends_on]
+                        # Each stage runs in a copy of the caller's context, so it joins the request's trace
+                        future = self.executor.submit(contextvars.copy_context().run, self._run_stage, stage, args)
+                        deadline = time.monotonic() + stage.timeout if stage.timeout else None
+                        running[future] = (stage, deadline)
+                        del pending[name]
+                        progressed = True
+                    else:
+                        failed = [dep for dep in stage.depends_on if dep in errors and dep not in results]
+                        if failed:
+                            self._fail(stage, errors[failed[0]], results, errors)
+                            del pending[name]
+                            progressed = True
+
+            if not running:
+                if pending:
+                    missing = {name: [d for d in s.depends_on if d not in results] for name, s in pending.items()}
+                    raise ValueError(f"Unresolvable stage dependencies: {missing}")
+                break
+
+            deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+            wait_timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, _ = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as e:
+                    self._fail(stage, e, results, errors)
+                    continue
+                if on_result is not None:
+                    try:
+                        on_result(stage.name, results[stage.name])
+                    except Exception as e:
+                        print(f"Error in on_result for stage {stage.name}: {str(e)}")
+
+            now = time.monotonic()
+            for future, (stage, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    # Threads cannot be interrupted; the stage keeps running but
+                    # its result is discarded and dependents stop waiting on it.
+                    future.cancel()
+                    del running[future]
+                    error = StageTimeoutError(f"Stage '{stage.name}' timed out after {stage.timeout}s")
+                    self._fail(stage, error, results, errors)
+
+        return results, errors
+
+    def _run_stage(self, stage, args):
+        with span(f"stage.{stage.name}"):
+            return stage.fn(*args)
+
+    def _fail(self, stage, error, results, errors):
+        """Record a stage failure and substitute its fallback value if it has one"""
+        errors[stage.name] = error
+        if stage.fallback is not _NO_FALLBACK:
+            results[stage.name] = stage.fallback
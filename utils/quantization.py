@@ -0,0 +1,13 @@
+from utils.lazy_import import lazy_import
+
+torch = lazy_import("torch")
+
+
+def quantize_linear_int8(model):
+    """Apply dynamic int8 quantization to a model's linear layers for CPU inference.
+
+    Weights are stored as int8 and activations are quantized on the fly, so
+    no calibration data is needed.
+    """
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
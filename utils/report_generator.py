@@ -1,93 +1,197 @@
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
-import seaborn as sns
 from pathlib import Path
+import io
+import threading
 import numpy as np
+from config.settings import CHART_CACHE_SIZE
+from utils.lazy_import import lazy_import
+from utils.result_cache import LRUCache, MISS
+from utils.tracing import span
+
+# Plotting libraries are imported on first use. Figures are drawn through the
+# object-oriented Agg API; the global pyplot state is not thread-safe
+mpl_figure = lazy_import("matplotlib.figure")
+backend_agg = lazy_import("matplotlib.backends.backend_agg")
+
+RADAR_CATEGORIES = ['Pronunciation', 'Grammar', 'Vocabulary', 'Fluency']
+VOCABULARY_METRICS = ['lexical_diversity', 'sophistication', 'context_appropriateness']
+VOCABULARY_COLORS = ['#4C72B0', '#DD8452', '#55A868']  # seaborn "deep" palette
+
+def chart_key(values):
+    """Cache key of a chart: its values at the precision the chart can show"""
+    return tuple(round(float(value), 3) for value in values)
+
+
+def _png(figure, **kwargs):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", **kwargs)
+    return buffer.getvalue()
+
+
+class _RadarTemplate:
+    """Radar chart figure built once; each render only moves the score polygon"""
+
+    def __init__(self):
+        self.figure = mpl_figure.Figure(figsize=(8, 8))
+        backend_agg.FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(projection='polar')
+        angles = np.linspace(0, 2*np.pi, len(RADAR_CATEGORIES), endpoint=False)
+        self.angles = np.concatenate((angles, [angles[0]]))
+        self.line, = self.ax.plot(self.angles, np.zeros(len(self.angles)))
+        self.fill, = self.ax.fill(self.angles, np.zeros(len(self.angles)), alpha=0.25)
+        self.ax.set_xticks(angles)
+        self.ax.set_xticklabels(RADAR_CATEGORIES)
+
+    def render(self, scores):
+        scores = np.concatenate((scores, [scores[0]]))
+        self.line.set_ydata(scores)
+        self.fill.set_xy(np.column_stack((self.angles, scores)))
+        self.ax.set_ylim(0, max(1.0, float(scores.max())))
+        return _png(self.figure)
+
+
+class _VocabularyTemplate:
+    """Vocabulary bar chart figure built once; each render only resizes the bars"""
+
+    def __init__(self):
+        self.figure = mpl_figure.Figure(figsize=(10, 6))
+        backend_agg.FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.bars = self.ax.bar(VOCABULARY_METRICS, np.zeros(len(VOCABULARY_METRICS)), color=VOCABULARY_COLORS)
+        self.ax.set_title('Vocabulary Analysis Metrics')
+        self.ax.tick_params(axis='x', labelrotation=45)
+
+    def render(self, values):
+        for bar, value in zip(self.bars, values):
+            bar.set_height(value)
+        self.ax.set_ylim(min(0.0, min(values)), max(1.0, max(values)) * 1.05)
+        return _png(self.figure, bbox_inches='tight')
+
+
+def _as_raw(results):
+    """Raw assessment results, converting the older flat report schema if needed.
+
+    Callers used to pass flat dicts with ``pronunciation_score``,
+    ``fluency_score``, ``vocabulary_score``, ``grammar_feedback``,
+    ``vocabulary_analysis`` and ``pronunciation_analysis``; those are still
+    accepted and mapped onto the layout returned by ``assess``.
+    """
+    if 'pronunciation' in results or 'vocabulary' in results:
+        return results
+    pronunciation = dict(results.get('pronunciation_analysis', {}))
+    pronunciation['pronunciation_score'] = results.get('pronunciation_score', 0)
+    pronunciation['fluency_score'] = results.get('fluency_score', 0)
+    raw = dict(results, pronunciation=pronunciation, vocabulary=results.get('vocabulary_analysis', {}))
+    raw.setdefault('corrected_text', results.get('grammar_feedback'))
+    return raw
+
+
+def _scores(results):
+    """Pronunciation, grammar, vocabulary and fluency scores of raw assessment results"""
+    pronunciation = results.get('pronunciation', {})
+    vocabulary_score = results.get('vocabulary_score')
+    if vocabulary_score is None:
+        vocabulary_score = results.get('vocabulary', {}).get('lexical_diversity', 0)
+    return [
+        pronunciation.get('pronunciation_score', 0),
+        results.get('grammar_score', 0),
+        vocabulary_score,
+        pronunciation.get('fluency_score', 0)
+    ]
+
+
+def _word_list(words):
+    # The flat schema stored a count of unique words, assess returns the words
+    if isinstance(words, (list, tuple, set)):
+        return ', '.join(words) or 'None'
+    return str(words)
+
 
 class ReportGenerator:
+    """Writes assessment reports (charts and a text summary) to ``output_dir``.
+
+    Each rendering thread keeps its own figure templates and only updates
+    their data, and rendered PNGs are cached by the values they show, so
+    recurring score vectors are written without drawing at all.
+    """
+
     def __init__(self, output_dir="reports"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        
+        self.chart_cache = LRUCache(CHART_CACHE_SIZE)
+        self._templates = threading.local()
+
     def generate_report(self, analysis_results):
-        """Generate a comprehensive analysis report"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        """Generate a comprehensive analysis report.
+
+        Takes the raw results of ``assess``; the older flat schema
+        (``pronunciation_score``, ``vocabulary_analysis``, ...) is still accepted.
+        """
+        analysis_results = _as_raw(analysis_results)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         report_path = self.output_dir / f"analysis_report_{timestamp}"
-        
+
         # Create report directory
         report_path.mkdir(exist_ok=True)
-        
+
         # Generate visualizations
-        self._create_score_radar(analysis_results, report_path)
-        self._create_vocabulary_analysis(analysis_results, report_path)
-        
+        (report_path / 'radar_chart.png').write_bytes(self.render_radar(_scores(analysis_results)))
+        vocab_data = analysis_results.get('vocabulary', {})
+        (report_path / 'vocabulary_analysis.png').write_bytes(
+            self.render_vocabulary([vocab_data.get(metric, 0) for metric in VOCABULARY_METRICS])
+        )
+
         # Generate detailed report
         self._generate_text_report(analysis_results, report_path)
-        
+
         return report_path
-    
-    def _create_score_radar(self, results, report_path):
-        """Create radar chart of various scores"""
-        categories = ['Pronunciation', 'Grammar', 'Vocabulary', 'Fluency']
-        scores = [
-            results.get('pronunciation_score', 0),
-            results.get('grammar_score', 0),
-            results.get('vocabulary_score', 0),
-            results.get('fluency_score', 0)
-        ]
-        
-        # Create radar chart
-        angles = np.linspace(0, 2*np.pi, len(categories), endpoint=False)
-        scores = np.concatenate((scores, [scores[0]]))
-        angles = np.concatenate((angles, [angles[0]]))
-        
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
-        ax.plot(angles, scores)
-        ax.fill(angles, scores, alpha=0.25)
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(categories)
-        
-        plt.savefig(report_path / 'radar_chart.png')
-        plt.close()
-    
-    def _create_vocabulary_analysis(self, results, report_path):
-        """Create vocabulary analysis visualizations"""
-        vocab_data = results.get('vocabulary_analysis', {})
-        
-        # Create bar chart for vocabulary metrics
-        plt.figure(figsize=(10, 6))
-        metrics = ['lexical_diversity', 'sophistication', 'context_appropriateness']
-        values = [vocab_data.get(metric, 0) for metric in metrics]
-        
-        sns.barplot(x=metrics, y=values)
-        plt.title('Vocabulary Analysis Metrics')
-        plt.xticks(rotation=45)
-        
-        plt.savefig(report_path / 'vocabulary_analysis.png', bbox_inches='tight')
-        plt.close()
-    
+
+    def render_radar(self, scores):
+        """PNG radar chart of the four skill scores"""
+        return self._render("radar", _RadarTemplate, scores)
+
+    def render_vocabulary(self, values):
+        """PNG bar chart of the vocabulary metrics"""
+        return self._render("vocabulary", _VocabularyTemplate, values)
+
+    def _render(self, name, template_class, values):
+        key = (name, chart_key(values))
+        png = self.chart_cache.get(key)
+        if png is not MISS:
+            return png
+        template = getattr(self._templates, name, None)
+        if template is None:
+            template = template_class()
+            setattr(self._templates, name, template)
+        with span(f"report.{name}"):
+            png = template.render(np.asarray(values, dtype=float))
+        self.chart_cache.set(key, png)
+        return png
+
     def _generate_text_report(self, results, report_path):
         """Generate detailed text report"""
+        pronunciation_score, grammar_score, vocabulary_score, fluency_score = _scores(results)
+        vocab_data = results.get('vocabulary', {})
+        pron_data = results.get('pronunciation', {})
         report_content = [
             "Communication Assessment Report",
             "=" * 30,
             f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "\nOverall Scores:",
-            f"- Pronunciation: {results.get('pronunciation_score', 0):.2f}",
-            f"- Grammar: {results.get('grammar_score', 0):.2f}",
-            f"- Vocabulary: {results.get('vocabulary_score', 0):.2f}",
-            f"- Fluency: {results.get('fluency_score', 0):.2f}",
+            f"- Pronunciation: {pronunciation_score:.2f}",
+            f"- Grammar: {grammar_score:.2f}",
+            f"- Vocabulary: {vocabulary_score:.2f}",
+            f"- Fluency: {fluency_score:.2f}",
             "\nDetailed Analysis:",
             "1. Grammar Corrections:",
-            results.get('grammar_feedback', 'No feedback available'),
+            results.get('corrected_text') or 'No feedback available',
             "\n2. Vocabulary Usage:",
-            f"- Unique words: {results.get('vocabulary_analysis', {}).get('unique_words', 0)}",
-            f"- Lexical diversity: {results.get('vocabulary_analysis', {}).get('lexical_diversity', 0):.2f}",
+            f"- Unique words: {_word_list(vocab_data.get('unique_words', []))}",
+            f"- Lexical diversity: {vocab_data.get('lexical_diversity', 0):.2f}",
             "\n3. Pronunciation Details:",
-            f"- Confidence score: {results.get('pronunciation_analysis', {}).get('confidence_scores', 0):.2f}",
-            f"- Stress pattern score: {results.get('pronunciation_analysis', {}).get('stress_patterns', 0):.2f}"
+            f"- Confidence score: {pron_data.get('confidence_scores', 0):.2f}",
+            f"- Stress pattern score: {pron_data.get('stress_patterns', 0):.2f}"
         ]
-        
+
         with open(report_path / 'detailed_report.txt', 'w') as f:
-            f.write('\n'.join(report_content)) 
\ No newline at end of file
+            f.write('\n'.join(report_content))
@@ -0,0 +1,209 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from config.settings import (
+    RESULT_CACHE_SIZE, RESULT_CACHE_DIR, RESULT_CACHE_TTL, RESULT_CACHE_MAX_BYTES, PRONUNCIATION_MODEL,
+    GRAMMAR_CORRECTION_MODEL, GROQ_MODEL, QUANTIZE_INT8, INFERENCE_BACKEND, ASR_BACKEND, VAD_ENABLED, CTC_BEAM_WIDTH
+)
+from utils.metrics import metrics
+
+MISS = object()
+
+
+def audio_key(waveform):
+    """Content hash of a decoded waveform buffer"""
+    return hashlib.sha256(memoryview(waveform)).hexdigest()
+
+
+def text_key(text):
+    """Hash of a transcript with Unicode and whitespace differences normalized away"""
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def config_fingerprint(**overrides):
+    """Short hash of the models and settings that change analysis results"""
+    settings = dict(
+        pronunciation_model=PRONUNCIATION_MODEL, grammar_model=GRAMMAR_CORRECTION_MODEL, groq_model=GROQ_MODEL,
+        quantize_int8=QUANTIZE_INT8, inference_backend=INFERENCE_BACKEND, asr_backend=ASR_BACKEND,
+        vad_enabled=VAD_ENABLED, ctc_beam_width=CTC_BEAM_WIDTH
+    )
+    settings.update(overrides)
+    return hashlib.sha256(repr(sorted(settings.items())).encode("utf-8")).hexdigest()[:16]
+
+
+class LRUCache:
+    """Thread-safe in-memory cache holding at most ``maxsize`` entries"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key, default=MISS):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """Pickle-per-entry cache directory with a TTL and a total size limit"""
+
+    def __init__(self, directory, ttl, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*.pkl"))
+
+    def _path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key, default=MISS):
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                self._remove(path)
+                return default
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return default
+
+    def set(self, key, value):
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = tmp_path.stat().st_size
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing cache entry: {str(e)}")
+            return
+        with self._lock:
+            # An overwritten entry no longer takes up space
+            self._size += size - replaced
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _remove(self, path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def _evict(self):
+        """Drop expired entries, then the oldest ones until under 90% of the size limit"""
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes * 0.9 and now - mtime <= self.ttl:
+                continue
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._size = total
+
+
+class ResultCache:
+    """Two-tier (memory LRU, optional disk) cache for analysis results.
+
+    Entries are grouped by namespace ("pronunciation", "grammar", ...) and
+    keyed by ``audio_key`` or ``text_key`` hashes. Every namespace includes
+    ``fingerprint`` (by default ``config_fingerprint()``), so results made
+    with other models or settings, e.g. from an on-disk tier shared across
+    restarts, are never served.
+    """
+
+    def __init__(self, memory_size=RESULT_CACHE_SIZE, disk_dir=RESULT_CACHE_DIR,
+                 ttl=RESULT_CACHE_TTL, max_bytes=RESULT_CACHE_MAX_BYTES, fingerprint=None):
+        self.memory = LRUCache(memory_size)
+        self.disk = DiskCache(disk_dir, ttl, max_bytes) if disk_dir else None
+        self.fingerprint = fingerprint if fingerprint is not None else config_fingerprint()
+
+    def _full_key(self, namespace, key):
+        return f"{namespace}-{self.fingerprint}-{key}"
+
+    def get(self, namespace, key):
+        full_key = self._full_key(namespace, key)
+        value = self.memory.get(full_key)
+        if value is not MISS:
+            metrics.increment("result_cache_memory_hits_total")
+            metrics.increment(f"result_cache_{namespace}_hits_total")
+            return value
+        if self.disk is not None:
+            value = self.disk.get(full_key)
+            if value is not MISS:
+                metrics.increment("result_cache_disk_hits_total")
+                metrics.increment(f"result_cache_{namespace}_hits_total")
+                self.memory.set(full_key, value)
+                return value
+        metrics.increment("result_cache_misses_total")
+        metrics.increment(f"result_cache_{namespace}_misses_total")
+        return MISS
+
+    def set(self, namespace, key, value):
+        full_key = self._full_key(namespace, key)
+        self.memory.set(full_key, value)
+        if self.disk is not None:
+            self.disk.set(full_key, value)
+
+    def wrap(self, namespace, fn, cache_if=None):
+        """Return ``cached(key, *args)`` that memoizes ``fn(*args)`` under ``key``.
+
+        ``cache_if`` can reject values that should not be stored, such as
+        fallback messages produced when an upstream service failed.
+        """
+        def cached(key, *args):
+            value = self.get(namespace, key)
+            if value is not MISS:
+                return value
+            value = fn(*args)
+            if cache_if is None or cache_if(value):
+                self.set(namespace, key, value)
+            return value
+        return cached
+
+    def stats(self):
+        """Hit and miss counters for every tier and namespace"""
+        counters = metrics.snapshot()["counters"]
+        return {name: value for name, value in counters.items() if name.startswith("result_cache_")}
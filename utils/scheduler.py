@@ -0,0 +1,290 @@
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config.settings import (
+    ASR_BACKEND, INFERENCE_WORKERS, INFERENCE_THREADS, SCHEDULER_MAX_QUEUE,
+    SCHEDULER_MAX_QUEUE_SECONDS, SCHEDULER_ADMISSION_TIMEOUT, MAX_AUDIO_LENGTH
+)
+from utils.audio_io import audio_duration, check_duration
+from utils.metrics import metrics
+from utils.tracing import run_in_trace
+
+# Smoothing factor of the processing-time-per-audio-second estimate
+COST_SMOOTHING = 0.2
+
+# Per-worker state, set up once by _init_worker
+_app = None
+
+
+class SchedulerFullError(Exception):
+    """Raised when a job is rejected because the inference queue is full"""
+    pass
+
+
+class WorkerStartupError(Exception):
+    """Raised when the model workers could not be started"""
+    pass
+
+
+def _init_worker(asr_backend, threads, ready, startup_errors):
+    global _app
+    try:
+        # Split the cores between workers instead of letting every worker use all of them
+        for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "ONNX_INTRA_OP_THREADS"):
+            os.environ[name] = str(threads)
+        from main import CommunicationAssessmentApp
+
+        _app = CommunicationAssessmentApp(asr_backend=asr_backend)
+        _app.start_warmup().join()
+        # Warm-up only prints load errors; a worker without its models must not report ready
+        failed = [handle for handle in _app.models.values() if not (handle.loaded and handle.warmed)]
+        if failed:
+            raise RuntimeError("Models failed to load: " + "; ".join(
+                f"{handle.name}: {handle.error or 'warm-up failed'}" for handle in failed
+            ))
+    except Exception as e:
+        # The pool itself only reports that a worker died, so pass the cause on
+        startup_errors.put(f"{type(e).__name__}: {str(e)}")
+        raise
+    with ready.get_lock():
+        ready.value += 1
+
+
+def _start():
+    """No-op job; submitting one per worker makes the pool start them all"""
+    pass
+
+
+def _run_job(audio_path, include_feedback):
+    """Assess one file in a worker; returns (results, error, metrics recorded meanwhile)"""
+    try:
+        # Counted as a request by the handler that submitted the job
+        result, error = run_in_trace(None, _app.assess, audio_path, include_feedback=include_feedback), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, metrics.drain()
+
+
+class _Job:
+    __slots__ = ("audio_path", "include_feedback", "cost", "future", "submitted", "started")
+
+    def __init__(self, audio_path, include_feedback, cost):
+        self.audio_path = audio_path
+        self.include_feedback = include_feedback
+        self.cost = cost
+        self.future = Future()
+        self.submitted = time.perf_counter()
+        self.started = None
+
+
+class InferenceScheduler:
+    """Runs assessments in a fixed pool of model worker processes.
+
+    Each worker loads its own models once and runs one job at a time, so at
+    most ``workers`` Wav2Vec2/T5 passes compete for the CPU. Jobs wait in a
+    bounded FIFO queue with their audio duration, read from the file header,
+    as cost estimate. When SCHEDULER_MAX_QUEUE jobs or
+    SCHEDULER_MAX_QUEUE_SECONDS of audio are already waiting, ``submit``
+    waits up to SCHEDULER_ADMISSION_TIMEOUT for room and then raises
+    SchedulerFullError, so overload turns into fast rejections instead of
+    ever-growing latency.
+
+    If a worker dies mid-job (OOM kill, segfault), the jobs running at that
+    moment fail and the pool is replaced. If a worker fails to load its
+    models, the scheduler stops taking jobs and reports the error in
+    ``status()`` instead of restarting it over and over.
+    """
+
+    def __init__(self, workers=INFERENCE_WORKERS, asr_backend=ASR_BACKEND, threads=INFERENCE_THREADS,
+                 max_queue=SCHEDULER_MAX_QUEUE, max_queue_seconds=SCHEDULER_MAX_QUEUE_SECONDS,
+                 admission_timeout=SCHEDULER_ADMISSION_TIMEOUT):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_queue_seconds = max_queue_seconds
+        self.admission_timeout = admission_timeout
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._queued_seconds = 0.0
+        self._running = 0
+        self._closed = False
+        self._startup_error = None
+        # Processing seconds per second of audio, learned from finished jobs
+        self._seconds_per_audio_second = None
+
+        # Spawned workers start clean instead of inheriting the server's threads
+        self._context = multiprocessing.get_context("spawn")
+        self._startup_errors = self._context.SimpleQueue()
+        self._initargs = (asr_backend, threads or max(os.cpu_count() // workers, 1))
+        self._start_pool()
+        self._record_queue()
+
+    def is_ready(self):
+        """True once every worker has loaded and warmed up its models"""
+        return self._startup_error is None and self._ready.value >= self.workers
+
+    def status(self):
+        with self._condition:
+            return {
+                "workers": self.workers,
+                "ready_workers": min(self._ready.value, self.workers),
+                "running": self._running,
+                "queued": len(self._queue),
+                "queued_seconds": self._queued_seconds,
+                "estimated_wait_seconds": self._estimated_wait(),
+                "error": self._startup_error
+            }
+
+    def submit(self, audio_path, include_feedback=False):
+        """Queue an assessment and return a Future of its raw results.
+
+        Raises AudioTooLongError for recordings over the length limit,
+        SchedulerFullError when the queue stays full for the admission timeout
+        and WorkerStartupError when the workers could not load their models.
+        """
+        cost = audio_duration(audio_path)
+        check_duration(cost, MAX_AUDIO_LENGTH)
+        job = _Job(audio_path, include_feedback, cost)
+        deadline = time.monotonic() + self.admission_timeout
+        with self._condition:
+            while self._full(cost):
+                remaining = deadline - time.monotonic()
+                if self._closed or remaining <= 0:
+                    metrics.increment("scheduler_rejected_total")
+                    raise SchedulerFullError(
+                        f"Inference queue is full ({len(self._queue)} jobs, "
+                        f"{self._queued_seconds:.0f}s of audio waiting)"
+                    )
+                self._condition.wait(remaining)
+            if self._startup_error is not None:
+                raise WorkerStartupError(f"Inference workers failed to start: {self._startup_error}")
+            self._queue.append(job)
+            self._queued_seconds += cost
+            metrics.increment("scheduler_admitted_total")
+            self._dispatch()
+        return job.future
+
+    def shutdown(self):
+        """Stop the workers and fail every job that has not started"""
+        with self._condition:
+            self._closed = True
+            queued, self._queue = list(self._queue), deque()
+            self._queued_seconds = 0.0
+            self._record_queue()
+            self._condition.notify_all()
+        for job in queued:
+            job.future.set_exception(RuntimeError("Inference scheduler shut down"))
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start_pool(self):
+        """Start a fresh set of workers (called with the condition held, or from __init__)"""
+        self._ready = self._context.Value("i", 0)
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=self._context, initializer=_init_worker,
+            initargs=self._initargs + (self._ready, self._startup_errors)
+        )
+        # Workers are otherwise spawned on demand; start them all now so they
+        # load their models before the first upload arrives
+        for _ in range(self.workers):
+            self._executor.submit(_start).add_done_callback(
+                functools.partial(self._check_pool, self._executor)
+            )
+
+    def _full(self, cost):
+        if self._closed:
+            return True
+        if not self._queue:
+            # A single job is always admitted, however long its audio
+            return False
+        return len(self._queue) >= self.max_queue or self._queued_seconds + cost > self.max_queue_seconds
+
+    def _estimated_wait(self):
+        if self._seconds_per_audio_second is None:
+            return None
+        return self._queued_seconds * self._seconds_per_audio_second / self.workers
+
+    def _dispatch(self):
+        """Hand queued jobs to free workers (called with the condition held)"""
+        while self._queue and self._running < self.workers and not self._closed:
+            try:
+                future = self._executor.submit(_run_job, self._queue[0].audio_path, self._queue[0].include_feedback)
+            except BrokenProcessPool as e:
+                # A worker died while the pool was idle; the job stays queued for the new pool
+                self._pool_broken(self._executor, e)
+                continue
+            job = self._queue.popleft()
+            self._queued_seconds -= job.cost
+            self._running += 1
+            job.started = time.perf_counter()
+            metrics.observe("scheduler_wait_seconds", job.started - job.submitted)
+            future.add_done_callback(functools.partial(self._finished, job, self._executor))
+        self._record_queue()
+        self._condition.notify_all()
+
+    def _record_queue(self):
+        metrics.set("scheduler_queue_depth", len(self._queue))
+        metrics.set("scheduler_queue_audio_seconds", self._queued_seconds)
+        metrics.set("scheduler_running_jobs", self._running)
+
+    def _release(self, job):
+        duration = time.perf_counter() - job.started
+        metrics.observe("scheduler_run_seconds", duration)
+        with self._condition:
+            self._running -= 1
+            if job.cost:
+                rate = duration / job.cost
+                previous = self._seconds_per_audio_second
+                self._seconds_per_audio_second = rate if previous is None else (
+                    previous + COST_SMOOTHING * (rate - previous)
+                )
+            self._dispatch()
+
+    def _check_pool(self, executor, future):
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            with self._condition:
+                self._pool_broken(executor, error)
+
+    def _pool_broken(self, executor, error):
+        """Replace a pool whose worker died, or give up if a worker could not start.
+
+        Called with the condition held. Every future of a broken pool reports
+        it, so only the first report for the current pool acts.
+        """
+        if executor is not self._executor or self._closed or self._startup_error is not None:
+            return
+        if self._startup_errors.empty():
+            print(f"Error in inference worker, restarting the pool: {str(error)}")
+            metrics.increment("scheduler_pool_restarts_total")
+            self._start_pool()
+            return
+
+        # Restarting would only load the same failing models again
+        self._startup_error = self._startup_errors.get()
+        print(f"Error starting inference worker: {self._startup_error}")
+        queued, self._queue = list(self._queue), deque()
+        self._queued_seconds = 0.0
+        self._record_queue()
+        self._condition.notify_all()
+        for job in queued:
+            job.future.set_exception(WorkerStartupError(f"Inference workers failed to start: {self._startup_error}"))
+
+    def _finished(self, job, executor, future):
+        # Runs on the pool's management thread
+        try:
+            result, error, worker_metrics = future.result()
+            metrics.merge(worker_metrics)
+        except Exception as e:
+            print(f"Error in inference worker: {str(e)}")
+            result, error = None, e
+            self._check_pool(executor, future)
+        # Releasing the slot also hands queued jobs to the (possibly new) pool
+        self._release(job)
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
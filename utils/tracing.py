@@ -0,0 +1,166 @@
+import contextlib
+import contextvars
+import json
+import threading
+import time
+import uuid
+from config.settings import TRACING_ENABLED, TRACE_LOG
+from utils.metrics import metrics
+
+# Trace of the request being handled in the current thread or task
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+# Set while a request is being handled, traced or not, so nested request()
+# blocks are only spans and the request is counted once, by its entry point
+_in_request = contextvars.ContextVar("in_request", default=False)
+_log_lock = threading.Lock()
+
+
+class Trace:
+    """Spans recorded while handling one request, written out as one JSON line"""
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+
+    def add_span(self, name, start, duration, error=None, attrs=None):
+        span = {"name": name, "offset": start - self.start, "duration": duration}
+        if attrs:
+            span["attrs"] = attrs
+        if error is not None:
+            span["error"] = error
+        with self._lock:
+            self.spans.append(span)
+
+    def finish(self, duration, error=None):
+        """Write the finished trace to TRACE_LOG (or stdout)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["offset"])
+        line = json.dumps({
+            "trace_id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": duration,
+            "error": error,
+            "spans": spans
+        }, default=str)
+        if TRACE_LOG:
+            with _log_lock, open(TRACE_LOG, "a") as f:
+                f.write(line + "\n")
+        else:
+            print(line)
+
+
+class _Span:
+    __slots__ = ("name", "trace", "attrs", "start")
+
+    def __init__(self, name, trace, attrs):
+        self.name = name
+        self.trace = trace
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        labels = {"span": self.name}
+        metrics.observe("span_seconds", duration, labels)
+        if exc_type is not None:
+            metrics.increment("span_errors_total", labels=labels)
+        trace = self.trace or _current_trace.get()
+        if trace is not None:
+            trace.add_span(self.name, self.start, duration, repr(exc) if exc is not None else None, self.attrs)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, trace=None, **attrs):
+    """Time a block as a named span.
+
+    The duration is recorded in the ``span_seconds`` histogram and, inside a
+    traced request, added to the request's trace (``trace`` overrides the
+    current one). With metrics and tracing both off this returns a shared
+    no-op context manager.
+    """
+    if not metrics.enabled and not TRACING_ENABLED:
+        return _NOOP_SPAN
+    return _Span(name, trace, attrs)
+
+
+def start_trace(name):
+    """Return a new trace for a request, or None when tracing is off"""
+    return Trace(name) if TRACING_ENABLED else None
+
+
+def finish_request(name, trace, start, error=None):
+    """Record a finished request's count and latency and write out its trace"""
+    duration = time.perf_counter() - start
+    labels = {"handler": name}
+    metrics.increment("requests_total", labels=labels)
+    metrics.observe("request_seconds", duration, labels)
+    if error is not None:
+        metrics.increment("request_errors_total", labels=labels)
+    if trace is not None:
+        trace.finish(duration, repr(error) if error is not None else None)
+
+
+def run_in_trace(trace, fn, *args, **kwargs):
+    """Call ``fn`` as part of a request counted elsewhere, e.g. inside an executor job.
+
+    ``trace`` (which may be None) becomes the current trace, and
+    ``request`` blocks inside ``fn`` only add spans to it.
+    """
+    trace_token = _current_trace.set(trace)
+    request_token = _in_request.set(True)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _in_request.reset(request_token)
+        _current_trace.reset(trace_token)
+
+
+@contextlib.contextmanager
+def request(name):
+    """Count, time and trace a synchronous request.
+
+    Inside another request (or ``run_in_trace``) this is just a span of
+    the outer request, which is the one counted. Async generators, which may
+    resume in another context, should use ``start_trace``/``finish_request``
+    and pass their trace explicitly.
+    """
+    if _in_request.get():
+        with span(name):
+            yield
+        return
+
+    trace = start_trace(name)
+    trace_token = _current_trace.set(trace)
+    request_token = _in_request.set(True)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _in_request.reset(request_token)
+        _current_trace.reset(trace_token)
+        finish_request(name, trace, start, error)